@@ -0,0 +1,84 @@
+"""
+Compares the psutil and native /proc collection backends.
+Before timing, checks that they agree on every process both can see (memory_info, name,
+exe, cmdline) and fails with the differences otherwise.
+
+Usage: python -m benchmarks.bench_collectors [--rounds N]
+"""
+import argparse
+import os
+import time
+from typing import List
+
+from src.core.collectors import COLLECTORS, ProcfsCollector, get_collector
+from src.core.engine import ProcessEngine
+
+
+def _close(a: int, b: int) -> bool:
+    """Memory read a few ms apart: equal up to allocations made in between."""
+    return abs(a - b) <= max(4 * 1024 * 1024, 0.1 * max(a, b))
+
+
+def check_agreement(backends: List[str]) -> None:
+    """Asserts that every backend reports the same processes as the first one."""
+    scans = {name: {p['pid']: p for p in ProcessEngine(get_collector(name)).scan_processes()} for name in backends}
+    reference, *others = backends
+    own_pid = os.getpid()
+    for name in others:
+        errors = []
+        common = [pid for pid in scans[reference] if pid in scans[name] and pid != own_pid]
+        for pid in common:
+            a, b = scans[reference][pid], scans[name][pid]
+            for field in ('name', 'exe', 'cmdline'):
+                if a.get(field) != b.get(field):
+                    errors.append(f"pid {pid} {field}: {reference}={a.get(field)!r} {name}={b.get(field)!r}")
+            mem_a, mem_b = a['memory_info'], b['memory_info']
+            for field in ('rss', 'vms'):
+                if not _close(getattr(mem_a, field), getattr(mem_b, field)):
+                    errors.append(f"pid {pid} memory_info.{field}: {reference}={getattr(mem_a, field)} "
+                                  f"{name}={getattr(mem_b, field)}")
+        assert not errors, f"{name} disagrees with {reference} on {len(errors)} value(s):\n" + "\n".join(errors[:20])
+        print(f"{name} agrees with {reference} on {len(common)} processes")
+
+
+def time_backend(name: str, rounds: int) -> dict:
+    """Times a cold scan (fresh engine) and warm incremental scans for one backend."""
+    cold = []
+    for _ in range(rounds):
+        engine = ProcessEngine(get_collector(name))
+        start = time.perf_counter()
+        results = engine.scan_processes()
+        cold.append(time.perf_counter() - start)
+
+    # Cold scan with the GUI list projection: cmdline/exe are deferred
+    cheap = []
+    for _ in range(rounds):
+        engine_cheap = ProcessEngine(get_collector(name))
+        start = time.perf_counter()
+        engine_cheap.scan_processes(fields=['pid', 'name', 'username', 'custom_type', 'memory_mb'])
+        cheap.append(time.perf_counter() - start)
+
+    warm = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        engine.scan_processes()
+        warm.append(time.perf_counter() - start)
+
+    return {'backend': name, 'processes': len(results), 'cold': min(cold), 'cheap': min(cheap), 'warm': min(warm)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process collection backends")
+    parser.add_argument('--rounds', type=int, default=5, help="Runs per backend (best time is kept)")
+    args = parser.parse_args()
+
+    backends = [name for name in COLLECTORS if name != 'procfs' or ProcfsCollector.is_supported()]
+    check_agreement(backends)
+    print(f"{'Backend':<10}{'Procs':>8}{'Cold (ms)':>12}{'Cheap (ms)':>12}{'Warm (ms)':>12}")
+    for name in backends:
+        r = time_backend(name, args.rounds)
+        print(f"{r['backend']:<10}{r['processes']:>8}{r['cold'] * 1000:>12.2f}{r['cheap'] * 1000:>12.2f}{r['warm'] * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
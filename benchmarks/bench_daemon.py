@@ -0,0 +1,93 @@
+"""
+Load test for the scan daemon: many concurrent local clients against one shared engine,
+compared with every client scanning on its own.
+
+Usage: python -m benchmarks.bench_daemon [--processes 5000] [--clients 1 8 32] [--requests 50]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.fake import FakeCollector
+from src.core.daemon import AVAILABLE, RemoteEngine, ScanDaemon
+from src.core.engine import ProcessEngine
+
+QUERIES = ["java", "node", "name:python3 mem>100MB", "svc-1", "type:service", "cmd~/-Xmx[5-9]g/", "user:root cpu>50"]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def remote_client(args):
+    """One client process: connects once, then sends 'requests' queries. Returns per-request latencies."""
+    path, requests = args
+    engine = RemoteEngine(path)
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        if i % 10 == 9:
+            engine.scan_processes() # The full snapshot, as the GUI refresh asks for it
+        else:
+            engine.find_processes(QUERIES[i % len(QUERIES)])
+        latencies.append(time.perf_counter() - started)
+    engine.close()
+    return latencies
+
+
+def local_client(args):
+    """Baseline: the client builds its own engine and scans before every query."""
+    count, requests = args
+    engine = ProcessEngine(FakeCollector(count, seed=os.getpid()))
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        engine.find_processes(QUERIES[i % len(QUERIES)])
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run(pool_size, worker, jobs):
+    started = time.perf_counter()
+    with multiprocessing.Pool(pool_size) as pool:
+        results = pool.map(worker, jobs)
+    wall = time.perf_counter() - started
+    latencies = [lat for res in results for lat in res]
+    return wall, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scan daemon with concurrent clients")
+    parser.add_argument('--processes', type=int, default=5000)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=50, help="Requests per client")
+    parser.add_argument('--local-requests', type=int, default=5, help="Requests per client for the in-process baseline")
+    args = parser.parse_args()
+
+    if not AVAILABLE:
+        print("Unix domain sockets are not available on this platform.")
+        return
+
+    path = os.path.join(tempfile.mkdtemp(), "daemon.sock")
+    daemon = ScanDaemon(ProcessEngine(FakeCollector(args.processes)), path=path, interval=1.0)
+    daemon.start()
+    print(f"Daemon: {args.processes} processes, refresh every {daemon.interval}s")
+    print(f"{'Mode':<8}{'Clients':>8}{'Requests':>10}{'Req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    try:
+        for clients in args.clients:
+            wall, lat = run(clients, remote_client, [(path, args.requests)] * clients)
+            print(f"{'daemon':<8}{clients:>8}{len(lat):>10}{len(lat) / wall:>10.0f}"
+                  f"{percentile(lat, 50) * 1000:>10.2f}{percentile(lat, 99) * 1000:>10.2f}")
+            wall, lat = run(clients, local_client, [(args.processes, args.local_requests)] * clients)
+            print(f"{'local':<8}{clients:>8}{len(lat):>10}{len(lat) / wall:>10.0f}"
+                  f"{percentile(lat, 50) * 1000:>10.2f}{percentile(lat, 99) * 1000:>10.2f}")
+    finally:
+        daemon.stop()
+    print(f"Daemon served {daemon.requests} requests with {daemon.engine.stats.scans} scans.")
+
+
+if __name__ == "__main__":
+    main()
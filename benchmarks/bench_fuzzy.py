@@ -0,0 +1,81 @@
+"""
+Per-keystroke cost of the fuzzy, ranked search (what GUIApp.search_logic runs on every debounced key).
+
+Queries are typed one character at a time against a synthetic host; each keystroke is a full
+find_ranked over the list plus reading the first page. Two hosts are measured: the usual
+synthetic mix (a handful of distinct names, long command lines) and a worst case where every
+process has its own name, so the fuzzy pass has to score 10k distinct terms.
+The run fails (exit 1) when the fuzzy p95 of a host is over --budget: the slowest keystrokes
+are the first letter of a query, which matches nearly every process.
+
+Usage: python -m benchmarks.bench_fuzzy [--processes 10000] [--rounds 10] [--budget 15]
+"""
+import argparse
+import statistics
+import sys
+import time
+from typing import List
+
+from benchmarks.fake import FakeCollector
+from src.core.engine import ProcessEngine
+
+QUERIES = ['jvaa', 'pyhton', 'gunicorn', 'postgers', 'svchost', 'cafe', 'gcc', '1042', 'xyzzy']
+PAGE = 60
+
+
+def keystrokes(queries: List[str]) -> List[str]:
+    return [query[:i] for query in queries for i in range(1, len(query) + 1)]
+
+
+def measure(engine: ProcessEngine, processes, rounds: int, fuzzy: bool) -> List[float]:
+    """Best time of each keystroke (ms). Rounds replay the whole sequence, so a noisy second hits one sample per keystroke."""
+    texts = keystrokes(QUERIES)
+    best = [float('inf')] * len(texts)
+    for _ in range(rounds):
+        for i, text in enumerate(texts):
+            start = time.perf_counter()
+            if fuzzy:
+                engine.find_ranked(text, processes).top(PAGE)
+            else:
+                engine.rank_processes(engine.find_processes(text, processes)).top(PAGE)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return [elapsed * 1000 for elapsed in best]
+
+
+def report(label: str, times: List[float]) -> float:
+    """Prints one row; returns the p95."""
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{label:<28}{statistics.mean(times):>10.2f}{statistics.median(times):>10.2f}{p95:>10.2f}{times[-1]:>10.2f}")
+    return p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy ranked search per keystroke")
+    parser.add_argument('--processes', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=10, help="Runs per keystroke (best time is kept)")
+    parser.add_argument('--budget', type=float, default=15.0, help="Maximum fuzzy p95 per keystroke (ms)")
+    args = parser.parse_args()
+
+    collector = FakeCollector(args.processes)
+    unique = FakeCollector(args.processes)
+    for p_info in unique.procs:
+        p_info['name'] = f"{p_info['name']}-worker-{p_info['pid']}"
+
+    print(f"{len(keystrokes(QUERIES))} keystrokes over {args.processes} processes (ms)")
+    print(f"{'':<28}{'mean':>10}{'median':>10}{'p95':>10}{'max':>10}")
+    over = []
+    for host, source in (("synthetic", collector), ("unique names", unique)):
+        engine = ProcessEngine(source)
+        processes = engine.scan_processes()
+        engine.build_index() # Before timing, as in the GUI after a scan
+        report(f"{host}: exact", measure(engine, processes, args.rounds, fuzzy=False))
+        if report(f"{host}: fuzzy ranked", measure(engine, processes, args.rounds, fuzzy=True)) > args.budget:
+            over.append(host)
+    if over:
+        print(f"\nFuzzy p95 over the {args.budget:g} ms budget: {', '.join(over)}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Snapshot history: cost of one append (what the recorder pays every second) and of the queries.
+
+Usage: python -m benchmarks.bench_history [--sizes 1000 5000] [--snapshots 300]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_processes
+from src.core.history import SnapshotHistory
+from src.core.table import ProcessTable
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the snapshot history ring buffer")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--snapshots', type=int, default=300)
+    parser.add_argument('--size-mb', type=float, default=64)
+    args = parser.parse_args()
+
+    print(f"{'Processes':>10}{'Record (KB)':>13}{'Append (ms)':>13}{'Kept':>7}{'Range (ms)':>12}{'PID hist (ms)':>15}")
+    for count in args.sizes:
+        processes = list(synthetic_processes(count))
+        table = ProcessTable.from_processes(processes)
+        path = os.path.join(tempfile.mkdtemp(), "history.bin")
+        with SnapshotHistory(path, size_mb=args.size_mb) as history:
+            started = time.perf_counter()
+            for i in range(args.snapshots):
+                history.append(processes, timestamp=1000.0 + i)
+            append_ms = (time.perf_counter() - started) / args.snapshots * 1000
+
+            entries = history.entries()
+            record_kb = entries[-1][3] / 1024
+            started = time.perf_counter()
+            loaded = history.load(entries[-10][0], entries[-1][0])
+            range_ms = (time.perf_counter() - started) * 1000
+            assert len(loaded) == 10 and len(loaded[-1][1]) == len(table)
+
+            started = time.perf_counter()
+            history.pid_history(processes[count // 2]['pid'])
+            pid_ms = (time.perf_counter() - started) * 1000
+            kept = len(history)
+        os.remove(path)
+        print(f"{count:>10}{record_kb:>13.1f}{append_ms:>13.2f}{kept:>7}{range_ms:>12.2f}{pid_ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compares serial kill_process calls with the batched kill_processes API and with
+concurrent AsyncProcessEngine.kill calls on one event loop.
+Spawns dummy child processes, some of which ignore SIGTERM and need escalation.
+
+Usage: python -m benchmarks.bench_kill [--children N] [--stubborn N] [--timeout S]
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+
+from src.core.aio import AsyncProcessEngine
+from src.core.engine import ProcessEngine
+
+POLITE = "import time\nwhile True: time.sleep(1)"
+STUBBORN = "import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\nwhile True: time.sleep(1)"
+
+
+def spawn(children: int, stubborn: int) -> list:
+    procs = [subprocess.Popen([sys.executable, "-c", STUBBORN if i < stubborn else POLITE])
+             for i in range(children)]
+    time.sleep(1)  # Let the children install their signal handlers
+    return procs
+
+
+def check(label: str, results: list, elapsed: float) -> None:
+    failed = [r for r in results if not r['success']]
+    print(f"{label:<10}{len(results):>6}{len(failed):>8}{elapsed:>12.2f}")
+    if failed:
+        for r in failed:
+            print(f"  {r['message']}")
+
+
+async def kill_async(pids: list, timeout: float) -> tuple:
+    """One kill() per PID, all in flight at once. Also returns the longest event-loop stall."""
+    stalls = [0.0]
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - last)
+            last = now
+
+    async with AsyncProcessEngine() as engine:
+        beat = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(*(engine.kill(pid, timeout=timeout) for pid in pids))
+        stop.set()
+        await beat
+    return list(results), stalls[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk process termination")
+    parser.add_argument('--children', type=int, default=40)
+    parser.add_argument('--stubborn', type=int, default=5, help="Children that ignore SIGTERM")
+    parser.add_argument('--timeout', type=float, default=1.0)
+    args = parser.parse_args()
+
+    engine = ProcessEngine()
+    print(f"{'Mode':<10}{'Procs':>6}{'Failed':>8}{'Time (s)':>12}")
+
+    procs = spawn(args.children, args.stubborn)
+    start = time.perf_counter()
+    results = engine.kill_processes([p.pid for p in procs], timeout=args.timeout)
+    check("batched", results, time.perf_counter() - start)
+    for p in procs:
+        p.wait()
+
+    procs = spawn(args.children, args.stubborn)
+    start = time.perf_counter()
+    results = []
+    for p in procs:
+        results.extend(engine.kill_processes([p.pid], timeout=args.timeout))
+    check("serial", results, time.perf_counter() - start)
+    for p in procs:
+        p.wait()
+
+    procs = spawn(args.children, args.stubborn)
+    start = time.perf_counter()
+    results, stall = asyncio.run(kill_async([p.pid for p in procs], args.timeout))
+    check("async", results, time.perf_counter() - start)
+    print(f"  longest event-loop stall: {stall * 1000:.1f} ms")
+    for p in procs:
+        p.wait()
+
+
+if __name__ == "__main__":
+    main()
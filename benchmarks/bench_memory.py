@@ -0,0 +1,76 @@
+"""
+USS/PSS sampling cost and how the budgeted MemorySampler spreads it.
+
+- Real host: cost per process of fetch_memory (smaps_rollup / memory_full_info) per backend.
+- Synthetic host: tick durations against the budget, and how many ticks it takes until the
+  largest processes all show PSS.
+
+Usage: python -m benchmarks.bench_memory [--processes 10000] [--budget 20] [--ticks 10]
+"""
+import argparse
+import heapq
+import time
+
+import psutil
+
+from benchmarks.fake import FakeCollector
+from src.core.collectors import COLLECTORS, ProcfsCollector, get_collector
+from src.core.engine import ProcessEngine
+from src.core.memory import MemorySampler
+
+
+def time_backend(name: str) -> dict:
+    """Measures every live process once with one backend."""
+    collector = get_collector(name)
+    pids = psutil.pids()
+    measured = denied = 0
+    start = time.perf_counter()
+    for pid in pids:
+        try:
+            collector.fetch_memory(pid)
+            measured += 1
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.Error:
+            denied += 1
+    elapsed = time.perf_counter() - start
+    return {'backend': name, 'processes': len(pids), 'measured': measured, 'denied': denied, 'seconds': elapsed}
+
+
+def simulate(count: int, budget_ms: float, ticks: int, top: int) -> None:
+    engine = ProcessEngine(FakeCollector(count))
+    sampler = MemorySampler(engine, budget_ms=budget_ms, top=top)
+    print(f"\nSynthetic host: {count} processes, budget {budget_ms:.0f} ms/tick")
+    print(f"{'Tick':>5}{'Scan (ms)':>12}{'Tick (ms)':>12}{'Sampled':>10}{'Cached':>10}{'Top with PSS':>15}")
+    for i in range(1, ticks + 1):
+        start = time.perf_counter()
+        processes = engine.scan_processes(sort=False, fields=['pid', 'name', 'username', 'custom_type', 'memory_mb'])
+        scan_ms = (time.perf_counter() - start) * 1000
+        sampler.tick()
+        largest = heapq.nlargest(top, processes, key=lambda p: p['memory_mb'])
+        covered = sum(1 for p in largest if p.get('pss') is not None)
+        print(f"{i:>5}{scan_ms:>12.1f}{sampler.last_tick_ms:>12.1f}{sampler.last_sampled:>10}{len(sampler):>10}"
+              f"{f'{covered}/{top}':>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark USS/PSS sampling")
+    parser.add_argument('--processes', type=int, default=10000, help="Synthetic host size")
+    parser.add_argument('--budget', type=float, default=20.0, help="Sampler budget per tick (ms)")
+    parser.add_argument('--ticks', type=int, default=10)
+    parser.add_argument('--top', type=int, default=200, help="Largest processes sampled first")
+    args = parser.parse_args()
+
+    backends = [name for name in COLLECTORS if name != 'procfs' or ProcfsCollector.is_supported()]
+    print(f"{'Backend':<10}{'Procs':>8}{'Measured':>10}{'Denied':>8}{'Total (ms)':>12}{'Per proc (us)':>15}")
+    for name in backends:
+        r = time_backend(name)
+        per_proc = r['seconds'] / max(1, r['processes']) * 1e6
+        print(f"{r['backend']:<10}{r['processes']:>8}{r['measured']:>10}{r['denied']:>8}"
+              f"{r['seconds'] * 1000:>12.2f}{per_proc:>15.1f}")
+
+    simulate(args.processes, args.budget, args.ticks, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Startup cost of each main.py mode: interpreter start plus everything the mode imports.
+
+Scripts run main.py many times per minute, so the imports done before any work starts are
+paid on every call. Each mode runs the same imports as its branch in main.py in a fresh
+interpreter:
+- wall: median time of the whole process (interpreter included)
+- imports: median of the cumulative time reported by `python -X importtime`
+- heaviest: the imports that cost the most
+A mode that loads a module it must not need fails the run (e.g. Rich for headless output,
+psutil for reading a recorded history).
+
+Usage:
+  python -m benchmarks.bench_startup [--runs 10] [--save FILE]
+  python -m benchmarks.bench_startup --root ../base --save base.json   # measure another checkout
+  python -m benchmarks.bench_startup --compare base.json               # exit 1 on a regression
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Mode -> (code run with 'python -c' from the repo root, modules it must never import)
+MODES = {
+    'bare': ("pass", ()),
+    'help': ("import main", ('psutil', 'rich', 'customtkinter', 'src.core.engine')),
+    'headless': ("import main; from src.cli.headless import HeadlessCLI; HeadlessCLI()",
+                 ('psutil', 'rich', 'customtkinter', 'tkinter')),
+    'history': ("import main; from src.cli.headless import HeadlessCLI; from src.core.history import SnapshotHistory",
+                ('psutil', 'rich', 'customtkinter', 'src.core.engine')),
+    'query': ("import main; from src.cli.headless import HeadlessCLI; HeadlessCLI().engine",
+              ('rich', 'customtkinter', 'tkinter')),
+    'cli': ("import main; from src.cli.interface import CLIInterface", ('customtkinter', 'tkinter', 'rich.live')),
+    'gui': ("import main; from src.gui.app import GUIApp", ('rich',)),
+}
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+SLACK_MS = 2.0 # Absolute noise allowance on top of --tolerance
+
+
+def run_once(code: str, root: str, importtime: bool) -> Tuple[float, str]:
+    """Runs the code in a fresh interpreter. Returns (wall seconds, stderr)."""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    start = time.perf_counter()
+    proc = subprocess.run(command, cwd=root, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    return elapsed, proc.stderr
+
+
+def parse_importtime(output: str) -> List[Tuple[int, int, str]]:
+    """(depth, cumulative us, module) per import, in the order -X importtime prints them."""
+    rows = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            rows.append((len(match.group(3)) // 2, int(match.group(2)), match.group(4)))
+    return rows
+
+
+def measure(mode: str, root: str, runs: int) -> Dict[str, Any]:
+    code, forbidden = MODES[mode]
+    run_once(code, root, False) # Warm-up: writes the .pyc files
+    walls = [run_once(code, root, False)[0] * 1000 for _ in range(runs)]
+    totals = []
+    rows: List[Tuple[int, int, str]] = []
+    for _ in range(runs):
+        rows = parse_importtime(run_once(code, root, True)[1])
+        totals.append(sum(cumulative for depth, cumulative, _ in rows if depth == 0) / 1000)
+    modules = {name for _, _, name in rows}
+    heaviest = sorted(((cumulative, name) for depth, cumulative, name in rows if depth <= 1), reverse=True)
+    return {
+        'mode': mode,
+        'wall_ms': statistics.median(walls),
+        'import_ms': statistics.median(totals),
+        'modules': len(modules),
+        'heaviest': [[name, cumulative / 1000] for cumulative, name in heaviest[:4]],
+        'forbidden': sorted(name for name in forbidden if name in modules),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """Prints old -> new import times; returns the modes that regressed."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = {r['mode']: r for r in baseline['results']}
+    print(f"\nCompared with {baseline_path} ({baseline.get('python', '?')}):")
+    regressed = []
+    for r in results:
+        before = old.get(r['mode'])
+        if before is None or r['mode'] == 'bare':
+            continue
+        limit = before['import_ms'] * (1 + tolerance) + SLACK_MS
+        flag = "REGRESSION" if r['import_ms'] > limit else ""
+        if flag:
+            regressed.append(r['mode'])
+        print(f"{r['mode']:<10}{before['import_ms']:>10.1f} -> {r['import_ms']:>8.1f} ms imports"
+              f"   ({before['modules']} -> {r['modules']} modules)  {flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interpreter + import time of each main.py mode")
+    parser.add_argument('--runs', type=int, default=10, help="Fresh interpreters per mode (median is kept)")
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--root', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help="Checkout to measure (default: this one)")
+    parser.add_argument('--save', help="Write the results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON from --save: exit 1 if a mode got slower")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative import time increase")
+    args = parser.parse_args()
+
+    print(f"{'Mode':<10}{'Wall (ms)':>10}{'Imports (ms)':>14}{'Modules':>9}  Heaviest imports (ms)")
+    results = []
+    failed: List[str] = []
+    for mode in args.modes:
+        try:
+            r = measure(mode, args.root, max(1, args.runs))
+        except RuntimeError as e:
+            print(f"{mode:<10}  failed: {e}")
+            failed.append(mode)
+            continue
+        results.append(r)
+        heaviest = ", ".join(f"{name} {ms:.1f}" for name, ms in r['heaviest'] if not name.startswith(('site', 'encodings')))
+        print(f"{mode:<10}{r['wall_ms']:>10.1f}{r['import_ms']:>14.1f}{r['modules']:>9}  {heaviest}")
+        if r['forbidden']:
+            print(f"{'':<10}  must not import: {', '.join(r['forbidden'])}")
+            failed.append(mode)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({'python': sys.version.split()[0], 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       'results': results}, f, indent=2)
+        print(f"\nResults written to {args.save}")
+    if args.compare:
+        failed += compare(results, args.compare, args.tolerance)
+    if failed:
+        print(f"\nFailed: {', '.join(failed)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
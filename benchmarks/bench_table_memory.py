@@ -0,0 +1,40 @@
+"""
+Memory footprint of a snapshot: list of dicts (scan_processes) vs columnar ProcessTable.
+
+Usage: python -m benchmarks.bench_table_memory [--sizes 10000 50000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.synthetic import synthetic_processes
+from src.core.table import ProcessTable
+
+
+def measure(build) -> int:
+    """Bytes still allocated by the object returned from build()."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot memory footprint")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'Processes':>10}{'Dicts (MB)':>14}{'Table (MB)':>14}{'Ratio':>8}")
+    for count in args.sizes:
+        dicts = measure(lambda: list(synthetic_processes(count)))
+        # Rows are generated one by one so the table pays for its own strings
+        table = measure(lambda: ProcessTable.from_processes(synthetic_processes(count)))
+        print(f"{count:>10}{dicts / 2**20:>14.1f}{table / 2**20:>14.1f}{dicts / table:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
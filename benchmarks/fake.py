@@ -0,0 +1,77 @@
+"""
+Fake process provider standing in for psutil.process_iter in benchmarks.
+Plugs into ProcessEngine as a collector, so the real scan code path is measured.
+"""
+import random
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+import psutil
+
+from benchmarks.synthetic import synthetic_process
+
+
+class FakeCollector:
+    """
+    Serves 'count' synthetic processes.
+    - denied_ratio: share of processes whose username/exe come back as AccessDenied (None)
+    - vanish_ratio: share of processes that disappear between listing and detail fetch (NoSuchProcess)
+    - churn: share of processes replaced by new ones on every scan
+    - memory_cost_ms: simulated cost of one fetch_memory call (a smaps_rollup read)
+    """
+    name = "fake"
+
+    def __init__(self, count: int, seed: int = 42, denied_ratio: float = 0.1,
+                 vanish_ratio: float = 0.01, churn: float = 0.02, memory_cost_ms: float = 0.2):
+        self.rng = random.Random(seed)
+        self.now = time.time()
+        self.denied_ratio = denied_ratio
+        self.vanish_ratio = vanish_ratio
+        self.churn = churn
+        self.memory_cost = memory_cost_ms / 1000
+        self.next_index = count
+        self.procs = [self._spawn(i) for i in range(count)]
+        self.by_pid = {p_info['pid']: p_info for p_info in self.procs}
+
+    def _spawn(self, i: int) -> Dict[str, Any]:
+        p_info = synthetic_process(i, self.rng, self.now)
+        if self.rng.random() < self.denied_ratio:
+            p_info['username'] = None
+            p_info['exe'] = None
+        p_info['_vanished'] = self.rng.random() < self.vanish_ratio
+        return p_info
+
+    def _tick(self) -> None:
+        """Simulates activity: memory/CPU move and some processes are replaced."""
+        rng = self.rng
+        for i, p_info in enumerate(self.procs):
+            if rng.random() < self.churn:
+                del self.by_pid[p_info['pid']]
+                self.procs[i] = self._spawn(self.next_index)
+                self.by_pid[self.procs[i]['pid']] = self.procs[i]
+                self.next_index += 1
+            elif rng.random() < 0.3:
+                mem = p_info['memory_info']
+                p_info['memory_info'] = mem._replace(rss=mem.rss + 4096 * rng.randint(1, 64))
+                cpu = p_info['cpu_times']
+                p_info['cpu_times'] = cpu._replace(user=cpu.user + rng.random())
+
+    def iter_volatile(self, attrs: List[str]) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        self._tick()
+        for p_info in self.procs:
+            yield p_info, {attr: p_info[attr] for attr in attrs}
+
+    def fetch_static(self, handle: Any, attrs: List[str]) -> Dict[str, Any]:
+        if handle['_vanished']:
+            raise psutil.NoSuchProcess(handle['pid'])
+        return {attr: handle[attr] for attr in attrs}
+
+    def fetch_memory(self, pid: int) -> Dict[str, Any]:
+        p_info = self.by_pid.get(pid)
+        if p_info is None or p_info['_vanished']:
+            raise psutil.NoSuchProcess(pid)
+        deadline = time.perf_counter() + self.memory_cost
+        while time.perf_counter() < deadline:
+            pass
+        rss = p_info['memory_info'].rss
+        return {'uss': rss * 2 // 5, 'pss': rss * 3 // 5}
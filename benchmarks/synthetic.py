@@ -0,0 +1,65 @@
+"""
+Synthetic process data shared by the benchmarks.
+Generates realistic-looking process dicts (long Java/Node/Python command lines, a mix of users).
+"""
+import random
+import time
+from typing import Any, Dict, Iterator
+
+from src.core.collectors import pcputimes, pmem
+from src.core.engine import ProcessEngine
+
+USERS = ['root', 'www-data', 'postgres', 'ci-runner', 'alice', 'bob', 'NT AUTHORITY\\SYSTEM', None]
+
+TEMPLATES = [
+    ('java', '/usr/lib/jvm/java-17/bin/java',
+     '/usr/lib/jvm/java-17/bin/java -Xms512m -Xmx{mem}g -XX:+UseG1GC -Dservice.name=svc-{n} '
+     '-Dlog.dir=/var/log/svc-{n} -cp /opt/app/lib/*:/opt/app/conf com.example.service{n}.Main --port {port}'),
+    ('node', '/usr/bin/node',
+     '/usr/bin/node --max-old-space-size={mem}096 /srv/app-{n}/node_modules/.bin/next start -p {port} '
+     '--hostname 0.0.0.0 --keepAliveTimeout 65000'),
+    ('python3', '/usr/bin/python3.11',
+     '/usr/bin/python3.11 -m gunicorn app{n}.wsgi:application --workers {mem} --bind 127.0.0.1:{port} '
+     '--access-logfile - --timeout 120'),
+    ('postgres', '/usr/lib/postgresql/15/bin/postgres',
+     'postgres: worker {n} app_db 10.0.0.{mem}({port}) idle'),
+    ('bash', '/usr/bin/bash', '/bin/bash -c make -j{mem} -C /build/tree-{n} all'),
+    ('cc1plus', '/usr/lib/gcc/x86_64-linux-gnu/12/cc1plus',
+     '/usr/lib/gcc/x86_64-linux-gnu/12/cc1plus -quiet -I/build/tree-{n}/include src/module_{port}.cpp -O2 -o /tmp/cc{n}.s'),
+    ('svchost.exe', 'C:\\Windows\\System32\\svchost.exe', 'C:\\Windows\\system32\\svchost.exe -k netsvcs -p -s Svc{n}'),
+    ('Café Überwachung', '/opt/café/bin/monitor', '/opt/café/bin/monitor --instância {n}'),
+]
+
+
+def synthetic_process(i: int, rng: random.Random, now: float) -> Dict[str, Any]:
+    """One process dict shaped exactly like a ProcessEngine.scan_processes entry."""
+    name, exe, cmd = TEMPLATES[i % len(TEMPLATES)]
+    cmdline = cmd.format(n=i, mem=rng.randint(1, 9), port=rng.randint(1024, 65000)).split(" ")
+    rss = rng.randint(1, 4096) * 1024 * 1024
+    create_time = now - rng.randint(1, 30 * 86400)
+    p_info = {
+        'pid': 1000 + i,
+        'ppid': 1 if i < 10 else 1000 + rng.randint(0, i - 1),
+        'name': name,
+        'username': rng.choice(USERS),
+        'exe': exe,
+        'cmdline': cmdline,
+        'cmdline_str': " ".join(cmdline),
+        'create_time': create_time,
+        'memory_info': pmem(rss, rss * 3, rss // 4, 4096 * 100, 0, rss // 2, 0),
+        'cpu_times': pcputimes(rng.random() * 100, rng.random() * 10, 0.0, 0.0, 0.0),
+        'cpu_percent': rng.random() * 100,
+        'memory_mb': rss / (1024 * 1024),
+        'memory_str': ProcessEngine.format_bytes(rss),
+        'uptime_str': ProcessEngine.get_uptime(create_time),
+    }
+    p_info['custom_type'] = ProcessEngine.classify(p_info)
+    return p_info
+
+
+def synthetic_processes(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yields 'count' synthetic process dicts (deterministic for a given seed)."""
+    rng = random.Random(seed)
+    now = time.time()
+    for i in range(count):
+        yield synthetic_process(i, rng, now)
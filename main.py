@@ -4,15 +4,108 @@ import argparse
 def main():
     parser = argparse.ArgumentParser(description="Process Manager Elite - GUI and CLI Process Killer")
     parser.add_argument('--cli', action='store_true', help="Run in Command Line Interface mode")
+    parser.add_argument('--watch', action='store_true', help="Live process table with CPU/memory (CLI)")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between scans for --watch, --record, --watchdog and --daemon (e.g. 0.5)")
+    parser.add_argument('--query', default="", help="Search (Name/Path/Cmdline/PID). Alone: non-interactive output; with --watch: filter")
+    parser.add_argument('--type', choices=['app', 'service'], help="Non-interactive: only User Apps or Services")
+    parser.add_argument('--kill', action='store_true', help="Non-interactive: terminate the matching processes (needs --query)")
+    parser.add_argument('--fields', help="Non-interactive output columns, comma-separated (e.g. pid,name,memory_mb); "
+                                         "cmdline/exe are only collected when listed or searched")
+    parser.add_argument('--format', choices=['ndjson', 'json', 'tsv'], help="Non-interactive output format (default: ndjson)")
+    parser.add_argument('--watchdog', metavar='RULES.json', help="Run the rule-based watchdog with the given rules file")
+    parser.add_argument('--dry-run', action='store_true', help="Watchdog: only report what would be terminated")
+    parser.add_argument('--audit-log', metavar='PATH', help="Watchdog: append every action as a JSON line to this file")
+    parser.add_argument('--record', metavar='PATH', help="Append a snapshot every --interval seconds to a ring-buffer history file")
+    parser.add_argument('--record-size', type=float, default=64, help="Size in MB of a new --record file (oldest snapshots are overwritten)")
+    parser.add_argument('--history', metavar='PATH', help="Print a recorded history (--pid for one process, --since/--until to limit)")
+    parser.add_argument('--pid', type=int, help="History: memory over time of this PID (the first process recorded with it)")
+    parser.add_argument('--create-time', type=float, help="History: with --pid, the process that started at this epoch time (recycled PIDs)")
+    parser.add_argument('--since', help="History: start time (epoch or ISO, e.g. 2024-05-01T03:00)")
+    parser.add_argument('--until', help="History: end time (epoch or ISO)")
+    parser.add_argument('--daemon', action='store_true', help="Serve shared snapshots to local clients over a Unix socket")
+    parser.add_argument('--socket', metavar='PATH', help="Unix socket of the scan daemon (default: per-user temp path)")
+    parser.add_argument('--memory-budget', type=float, default=20.0, metavar='MS',
+                        help="Time per refresh spent measuring USS/PSS in the background (0 disables; memory then shows RSS)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print a scan profiling report (alone: profiles a few scans; with --cli/--watch: on exit; "
+                             "non-interactive: on stderr)")
+    parser.add_argument('--profile-scans', type=int, default=5, help="Number of scans to profile with --profile alone")
     args = parser.parse_args()
 
-    if args.cli:
+    if args.kill and not args.query:
+        parser.error("--kill needs a --query")
+
+    # Each mode imports only its own modules: scripts pay this start-up on every call (benchmarks/bench_startup.py)
+    if args.daemon:
+        from src.core.daemon import ScanDaemon
+        from src.core.engine import ProcessEngine
+        engine = ProcessEngine(profile=args.profile)
+        try:
+            ScanDaemon(engine, path=args.socket, interval=max(0.1, args.interval), memory_budget_ms=args.memory_budget).run()
+        except OSError as e:
+            print(f"Cannot start the daemon: {e}", file=sys.stderr)
+            sys.exit(2)
+        if args.profile:
+            print(engine.stats.format_report())
+    elif args.record:
+        from src.core.engine import ProcessEngine
+        from src.core.history import MAX_CAPACITY, Recorder, SnapshotHistory
+        if not 0 < args.record_size * 1024 * 1024 <= MAX_CAPACITY:
+            parser.error(f"--record-size must be more than 0 and at most {MAX_CAPACITY // (1024 * 1024)} MB")
+        engine = ProcessEngine(profile=args.profile)
+        with SnapshotHistory(args.record, size_mb=args.record_size) as history:
+            Recorder(engine, history).run(interval=max(0.1, args.interval))
+        if args.profile:
+            print(engine.stats.format_report())
+    elif args.history:
+        from src.cli.headless import HeadlessCLI
+        app = HeadlessCLI(output_format=args.format or "tsv")
+        sys.exit(app.history(args.history, pid=args.pid, since=args.since, until=args.until, create_time=args.create_time))
+    elif args.watchdog:
+        import json
+        import re
+        from src.core.engine import ProcessEngine
+        from src.core.watchdog import Watchdog
+        try:
+            rules = Watchdog.load_rules(args.watchdog)
+        except (ValueError, re.error, json.JSONDecodeError, OSError) as e:
+            print(f"Cannot load watchdog rules from {args.watchdog}: {e}", file=sys.stderr)
+            sys.exit(2)
+        engine = ProcessEngine(profile=args.profile)
+        watchdog = Watchdog(engine, rules, dry_run=args.dry_run, audit_log=args.audit_log)
+        watchdog.run(interval=max(0.1, args.interval))
+        if args.profile:
+            print(engine.stats.format_report())
+    elif not (args.watch or args.cli) and (args.query or args.type or args.kill or args.format or args.fields):
+        from src.cli.headless import HeadlessCLI
+        app = HeadlessCLI(output_format=args.format or "ndjson", socket_path=args.socket, profile=args.profile)
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+        code = app.run(query=args.query, process_type=args.type, kill=args.kill, fields=fields)
+        if args.profile:
+            print(app.engine.stats.format_report(), file=sys.stderr) # stdout carries the records
+        sys.exit(code)
+    elif args.watch:
+        from src.cli.interface import CLIInterface
+        app = CLIInterface(profile=args.profile, socket_path=args.socket, memory_budget_ms=args.memory_budget)
+        app.watch(query=args.query, interval=max(0.1, args.interval))
+        if args.profile:
+            print(app.engine.stats.format_report())
+    elif args.cli:
         from src.cli.interface import CLIInterface
-        app = CLIInterface()
+        app = CLIInterface(profile=args.profile, socket_path=args.socket, memory_budget_ms=args.memory_budget)
         app.run()
+        if args.profile:
+            print(app.engine.stats.format_report())
+    elif args.profile:
+        from src.core.engine import ProcessEngine
+        engine = ProcessEngine(profile=True)
+        for _ in range(max(1, args.profile_scans)):
+            engine.scan_processes()
+        print(f"Collector: {engine.collector.name}")
+        print(engine.stats.format_report())
     else:
         from src.gui.app import GUIApp
-        app = GUIApp()
+        app = GUIApp(socket_path=args.socket, memory_budget_ms=args.memory_budget)
         app.mainloop()
 
 if __name__ == "__main__":
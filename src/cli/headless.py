@@ -0,0 +1,214 @@
+import datetime
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, TextIO
+
+from src.core.query import QueryError, parse_query
+
+# Output columns, in order (also the TSV header)
+COLUMNS = {
+    'pid': lambda p: p['pid'],
+    'ppid': lambda p: p.get('ppid'),
+    'name': lambda p: p.get('name'),
+    'type': lambda p: p.get('custom_type'),
+    'user': lambda p: p.get('username'),
+    'memory_mb': lambda p: round(p.get('memory_mb', 0.0), 1),
+    'cpu_percent': lambda p: round(p.get('cpu_percent', 0.0), 1),
+    'create_time': lambda p: p.get('create_time'),
+    'exe': lambda p: p.get('exe'),
+    'cmdline': lambda p: p.get('cmdline_str'),
+}
+FIELDS = list(COLUMNS)
+TYPES = {'app': "App", 'service': "Service"}
+# Output column -> process dict key (used to build the engine's field projection)
+SOURCES = {'type': 'custom_type', 'user': 'username', 'cmdline': 'cmdline_str'}
+
+
+class HeadlessCLI:
+    """
+    Non-interactive mode for scripts: no Rich, no screen clearing, no prompts.
+    Matching processes are streamed to stdout while the scan is still running.
+    Runs once per invocation, so the engine (and psutil behind it) is only loaded when needed.
+    """
+
+    def __init__(self, out: TextIO = sys.stdout, output_format: str = "ndjson", socket_path: Optional[str] = None,
+                 profile: bool = False):
+        self.socket_path = socket_path
+        self.profile = profile
+        self._engine = None
+        self.out = out
+        self.format = output_format
+        self.count = 0
+
+    @property
+    def engine(self):
+        """Shared scan daemon if one is running, otherwise a local engine (connected on first use; always local when profiling)."""
+        if self._engine is None:
+            from src.core.daemon import connect_engine
+            self._engine = connect_engine(profile=self.profile, path=self.socket_path)
+        return self._engine
+
+    @staticmethod
+    def to_record(p_info: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Output record; only the selected columns are read, so unused cmdline/exe are never fetched."""
+        return {field: COLUMNS[field](p_info) for field in fields or FIELDS}
+
+    @staticmethod
+    def _tsv_cell(value: Any) -> str:
+        if value is None:
+            return ""
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+    def begin(self, fields: List[str]) -> None:
+        if self.format == "json":
+            self.out.write("[")
+        elif self.format == "tsv":
+            self.out.write("\t".join(fields) + "\n")
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        """Writes one record immediately in the selected format."""
+        if self.format == "tsv":
+            self.out.write("\t".join(self._tsv_cell(v) for v in record.values()) + "\n")
+        else:
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            if self.format == "json":
+                line = ("\n" if self.count == 0 else ",\n") + line
+            else:
+                line += "\n"
+            self.out.write(line)
+        self.count += 1
+
+    def end(self) -> None:
+        if self.format == "json":
+            self.out.write("\n]\n" if self.count else "]\n")
+        self.out.flush()
+
+    def reader_gone(self) -> int:
+        """The reader closed the pipe (e.g. '| head'): stop quietly with exit code 0, like other Unix tools."""
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, self.out.fileno()) # Otherwise the interpreter's final flush fails again
+        os.close(devnull)
+        return 0
+
+    def matches(self, query: str, process_type: Optional[str], fields: Optional[List[str]] = None):
+        """
+        Yields matching processes as the scan collects them.
+        Only the attributes needed by the query and the output 'fields' are collected.
+        """
+        wanted_type = TYPES.get(process_type) if process_type else None
+        parsed = parse_query(query)
+        predicate = parsed.compile() # Compiled once, before the scan starts
+        projection = parsed.fields() | {SOURCES.get(field, field) for field in (fields or ['pid', 'name'])}
+        own_pid = os.getpid()  # Our own cmdline always contains the query
+        from src.core.daemon import RemoteEngine
+        if isinstance(self.engine, RemoteEngine):
+            # The daemon already has a fresh snapshot and index: no scan here at all
+            processes = self.engine.find_processes(query, category=wanted_type)
+        else:
+            processes = self.engine.iter_processes(projection)
+        for p_info in processes:
+            if p_info['pid'] == own_pid:
+                continue
+            if wanted_type and p_info.get('custom_type') != wanted_type:
+                continue
+            if predicate(p_info):
+                yield p_info
+
+    def run(self, query: str = "", process_type: Optional[str] = None, kill: bool = False,
+            timeout: float = 3, fields: Optional[List[str]] = None) -> int:
+        """
+        Lists (or kills) the matching processes. 'fields' selects the output columns (default: FIELDS).
+        Exit code: 0 = matches found / all killed, 1 = no match, 2 = some kills failed (or invalid query).
+        """
+        try:
+            parse_query(query).compile()
+        except QueryError as e:
+            print(f"Invalid query: {e}", file=sys.stderr)
+            return 2
+        unknown = [field for field in fields or [] if field not in FIELDS]
+        if unknown:
+            print(f"Unknown field(s): {', '.join(unknown)} (available: {', '.join(FIELDS)})", file=sys.stderr)
+            return 2
+
+        if not kill:
+            columns = fields or FIELDS
+            try:
+                self.begin(columns)
+                for p_info in self.matches(query, process_type, columns):
+                    self.emit(self.to_record(p_info, fields))
+                self.end()
+            except BrokenPipeError:
+                return self.reader_gone()
+            return 0 if self.count else 1
+
+        # Never kill the shell(s) that launched us: their cmdline contains the query too
+        import psutil
+        ancestors = {p.pid for p in psutil.Process().parents()}
+        targets = {p_info['pid']: p_info.get('name') for p_info in self.matches(query, process_type)
+                   if p_info['pid'] not in ancestors}
+        results = self.engine.kill_processes(list(targets), timeout=timeout)
+        failed = sum(not res['success'] for res in results)
+        try:
+            self.begin(['pid', 'name', 'success', 'message', 'elapsed'])
+            for res in results:
+                self.emit({'pid': res['pid'], 'name': targets[res['pid']], 'success': res['success'],
+                           'message': res['message'], 'elapsed': round(res['elapsed'], 3)})
+            self.end()
+        except BrokenPipeError:
+            return self.reader_gone()
+        if not targets:
+            return 1
+        return 2 if failed else 0
+
+    @staticmethod
+    def parse_time(value: Optional[str]) -> Optional[float]:
+        """Epoch seconds or an ISO date/time ("2024-05-01T03:00")."""
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.datetime.fromisoformat(value).timestamp()
+
+    def history(self, path: str, pid: Optional[int] = None, since: Optional[str] = None,
+                until: Optional[str] = None, create_time: Optional[float] = None) -> int:
+        """
+        Prints a recorded history: one line per snapshot (totals and biggest process),
+        or with 'pid' that process's memory over time ('create_time' picks one of the processes
+        that had this PID; by default the first one recorded).
+        Exit code 1 if nothing was recorded, 2 for an invalid --since/--until or history file.
+        """
+        from src.core.history import SnapshotHistory
+        try:
+            start, end = self.parse_time(since), self.parse_time(until)
+        except ValueError as e:
+            print(f"Invalid time: {e} (expected epoch seconds or an ISO date/time)", file=sys.stderr)
+            return 2
+        try:
+            history = SnapshotHistory(path, readonly=True)
+        except (OSError, ValueError) as e: # Missing, unreadable or not a history file
+            print(f"Cannot open history {path}: {e}", file=sys.stderr)
+            return 2
+        try:
+            with history:
+                if pid is not None:
+                    self.begin(['time', 'pid', 'memory_mb'])
+                    for timestamp, rss in history.pid_history(pid, start, end, create_time=create_time):
+                        self.emit({'time': timestamp, 'pid': pid, 'memory_mb': round(rss / (1024 * 1024), 1)})
+                else:
+                    self.begin(['time', 'processes', 'total_memory_mb', 'top_pid', 'top_name', 'top_memory_mb'])
+                    for timestamp, table in history.load(start, end):
+                        top = max(range(len(table)), key=table.rss.__getitem__, default=None)
+                        self.emit({
+                            'time': timestamp,
+                            'processes': len(table),
+                            'total_memory_mb': round(sum(table.rss) / (1024 * 1024), 1),
+                            'top_pid': table.pid[top] if top is not None else None,
+                            'top_name': table.name[top] if top is not None else None,
+                            'top_memory_mb': round(table.rss[top] / (1024 * 1024), 1) if top is not None else None,
+                        })
+            self.end()
+        except BrokenPipeError:
+            return self.reader_gone()
+        return 0 if self.count else 1
@@ -1,6 +1,7 @@
 import os
 import time
-from typing import List, Dict, Any
+import heapq
+from typing import List, Dict, Any, Callable, Optional
 
 from rich.console import Console
 from rich.table import Table
@@ -8,7 +9,10 @@ from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich import box
 
+from src.core.daemon import connect_engine
 from src.core.engine import ProcessEngine
+from src.core.memory import MemorySampler
+from src.core.query import QueryError, parse_query
 
 # Initialize Rich Console
 console = Console()
@@ -18,21 +22,33 @@ class CLIInterface:
     Command Line Interface for Process Manager.
     """
 
-    def __init__(self):
-        self.engine = ProcessEngine()
+    PREVIEW_ROWS = 20 # Rows shown while a search is still scanning
+    RESULTS_MEMORY_BUDGET_MS = 250 # PSS sampling of search results before they are listed
+    MEMORY_CAPTION = "Memory: PSS when sampled, [dim]RSS[/] otherwise"
+
+    def __init__(self, profile: bool = False, socket_path: Optional[str] = None, memory_budget_ms: float = 20.0):
+        # Shared scan daemon if one is running, otherwise scan in-process
+        self.engine = connect_engine(profile=profile, path=socket_path)
         self.os_name = os.name
+        # USS/PSS sampling (only for a local engine: the daemon samples on its side)
+        self.watch_top: List[Dict[str, Any]] = []
+        self.sampler = None
+        if memory_budget_ms > 0 and isinstance(self.engine, ProcessEngine):
+            self.sampler = MemorySampler(self.engine, budget_ms=memory_budget_ms, visible=lambda: self.watch_top)
+
+    @staticmethod
+    def memory_cell(p_info: Dict[str, Any]) -> str:
+        """memory_str (PSS once sampled), dimmed while it is still plain RSS."""
+        mem = p_info.get('memory_str', 'N/A')
+        return mem if p_info.get('pss') is not None else f"[dim]{mem}[/]"
 
     def clear_screen(self) -> None:
         """Clears the terminal screen."""
         os.system('cls' if self.os_name == 'nt' else 'clear')
 
-    def display_results(self, matches: List[Dict[str, Any]]) -> List[int]:
-        """Displays the search results in a beautiful table."""
-        if not matches:
-            console.print(Panel(f"[bold red]No processes found matching your query.[/]", title="Search Results", border_style="red"))
-            return []
-
-        table = Table(title=f"Found [bold cyan]{len(matches)}[/] Process(es)", box=box.ROUNDED, header_style="bold white on blue")
+    def build_results_table(self, matches: List[Dict[str, Any]], title: str) -> Table:
+        """Search results table (used for the live preview and the final listing)."""
+        table = Table(title=title, caption=self.MEMORY_CAPTION, box=box.ROUNDED, header_style="bold white on blue")
         
         table.add_column("PID", style="cyan", justify="right")
         table.add_column("Name", style="white")
@@ -42,8 +58,6 @@ class CLIInterface:
         table.add_column("Uptime", justify="right")
         table.add_column("Path", style="dim", no_wrap=True)
 
-        valid_pids = []
-        
         for p_info in matches:
             pid = str(p_info['pid'])
             name = p_info['name']
@@ -58,7 +72,7 @@ class CLIInterface:
             if "Access Denied" not in user and len(user) > 15:
                 user = user[:13] + "..."
             
-            mem = p_info.get('memory_str', 'N/A')
+            mem = self.memory_cell(p_info)
             uptime = p_info.get('uptime_str', 'N/A')
             
             exe = p_info.get('exe') or ""
@@ -66,10 +80,175 @@ class CLIInterface:
                 exe = "..." + exe[-37:]
             
             table.add_row(pid, name, p_type, user, mem, uptime, exe)
-            valid_pids.append(p_info['pid'])
+        return table
+
+    def display_results(self, matches: List[Dict[str, Any]]) -> List[int]:
+        """Displays the search results in a beautiful table."""
+        if not matches:
+            console.print(Panel(f"[bold red]No processes found matching your query.[/]", title="Search Results", border_style="red"))
+            return []
+
+        console.print(self.build_results_table(matches, f"Found [bold cyan]{len(matches)}[/] Process(es)"))
+        return [p_info['pid'] for p_info in matches]
+
+    def stream_search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Shows matches while the scan is still running (latest PREVIEW_ROWS rows),
+        then returns them in the final order once every process has been collected.
+        Free text is fuzzy (typos, subsequences of names): best matches come first.
+        """
+        from rich.live import Live # Only the live views need it
+        parsed = parse_query(query)
+        predicate = parsed.compile(fuzzy=True)
+        matches: List[Dict[str, Any]] = []
+        with Live(console=console, auto_refresh=False, transient=True) as live:
+            live.update(Panel(f"[bold cyan]Searching for '{query}'...[/]", border_style="cyan"), refresh=True)
+            for batch in self.engine.iter_batches(fields=parsed.fields() | {'exe'}):
+                found = [p_info for p_info in batch if predicate(p_info)]
+                if found:
+                    matches.extend(found)
+                    live.update(self.build_results_table(matches[-self.PREVIEW_ROWS:],
+                                                         f"Scanning... [bold cyan]{len(matches)}[/] found"), refresh=True)
+        return self.engine.sort_processes(matches, parsed.ranker())
+
+    def build_groups_table(self, groups: List[Dict[str, Any]], expanded: set) -> Table:
+        """One row per group; expanded groups are followed by their processes."""
+        by = groups[0]['by'] if groups else "name"
+        table = Table(title=f"[bold cyan]{len(groups)}[/] Group(s) by {by}", box=box.ROUNDED, header_style="bold white on blue")
+        table.add_column("#", style="cyan", justify="right")
+        table.add_column("Group / PID", style="white")
+        table.add_column("Procs", justify="right")
+        table.add_column("Type", justify="center")
+        table.add_column("Memory", justify="right", style="green")
+        table.add_column("Oldest", justify="right")
+
+        for i, group in enumerate(groups, 1):
+            is_open = group['group'] in expanded
+            name = group['group']
+            if len(name) > 50:
+                name = "..." + name[-47:]
+            p_type = "[yellow]Service/Bg[/]" if group['custom_type'] == "Service" else "[green]User App[/]"
+            oldest = ProcessEngine.get_uptime(group['create_time']) if group['create_time'] else "N/A"
+            table.add_row(str(i), f"[bold]{'▾' if is_open else '▸'} {name}[/]", str(group['count']), p_type,
+                          ProcessEngine.format_bytes(group['rss']), oldest)
+            if is_open:
+                for p_info in self.engine.sort_processes(group['processes']):
+                    table.add_row("", f"[dim]  {p_info['pid']}[/] {p_info['name']}", "", "",
+                                  self.memory_cell(p_info), p_info.get('uptime_str', 'N/A'))
+        return table
+
+    def group_menu(self, matches: List[Dict[str, Any]], exact: Callable[[Dict[str, Any]], bool]) -> None:
+        """
+        Groups the results by name/exe/user: expand or collapse groups, kill a whole group.
+        'exact' is the query without fuzzy matching: only those members of a group are killed.
+        """
+        by = Prompt.ask("[bold]Group by[/]", choices=["name", "exe", "user"], default="name")
+        groups = self.engine.group_processes(by, matches)
+        expanded: set = set()
+        while groups:
+            console.print(self.build_groups_table(groups, expanded))
+            action = Prompt.ask("\n[bold]Group #[/] to expand/collapse, [bold red]k #[/] to kill a group, Enter to go back",
+                                default="").strip().lower()
+            if not action:
+                return
+            kill = action.startswith("k")
+            number = action[1:].strip() if kill else action
+            if not number.isdigit() or not 1 <= int(number) <= len(groups):
+                console.print("[bold red]Invalid group number.[/]")
+                continue
+            group = groups[int(number) - 1]
+
+            if not kill:
+                expanded ^= {group['group']}
+                continue
+            pids = [p_info['pid'] for p_info in group['processes'] if exact(p_info)]
+            if not pids:
+                console.print("[bold red]Only fuzzy matches in this group: kill them one by one.[/]")
+                continue
+            warning = f" ({group['services']} services!)" if group['services'] else ""
+            skipped = f", skipping {group['count'] - len(pids)} fuzzy match(es)" if len(pids) < group['count'] else ""
+            if not Confirm.ask(f"[bold red]⚠ Kill {len(pids)} processes of '{group['group']}'{warning}{skipped}?[/]", default=False):
+                continue
+            with console.status(f"[bold red]Terminating {len(pids)} processes...", spinner="dots"):
+                results = self.engine.kill_processes(pids)
+            for res in results:
+                if res['success']:
+                     console.print(f"[green]✔ {res['message']}[/] [dim]({res['elapsed']:.2f}s)[/]")
+                else:
+                     console.print(f"[red]✘ {res['message']}[/]")
+            killed = {res['pid'] for res in results if res['success']}
+            matches = [p_info for p_info in matches if p_info['pid'] not in killed]
+            groups = self.engine.group_processes(by, matches)
 
-        console.print(table)
-        return valid_pids
+    def kill_tree(self, pid: int) -> None:
+        """Shows the subtree of a process and terminates it after confirmation."""
+        tree = self.engine.get_process_tree(pid)
+        for p_info in tree:
+            console.print(f"{'  ' * p_info['depth']}[cyan]{p_info['pid']}[/] {p_info['name']}")
+
+        if not Confirm.ask(f"[bold red]⚠ Kill this tree of {len(tree)} processes?[/]", default=False):
+            return
+        order = Prompt.ask("[bold]Order[/]", choices=["bottom-up", "top-down"], default="bottom-up")
+        with console.status(f"[bold red]Terminating {len(tree)} processes...", spinner="dots"):
+            results = self.engine.kill_tree(pid, order=order)
+        for res in results:
+            if res['success']:
+                 console.print(f"[green]✔ {res['message']}[/] [dim]({res['elapsed']:.2f}s)[/]")
+            else:
+                 console.print(f"[red]✘ {res['message']}[/]")
+
+    def build_watch_table(self, processes: List[Dict[str, Any]], limit: int) -> Table:
+        """Builds the live table: top processes by CPU, then memory."""
+        top = heapq.nlargest(limit, processes, key=lambda p: (p.get('cpu_percent', 0.0), p['memory_mb']))
+
+        self.watch_top = top # Sampled first by the memory sampler
+        table = Table(title=f"Watching [bold cyan]{len(processes)}[/] Process(es)", caption=self.MEMORY_CAPTION,
+                      box=box.ROUNDED, header_style="bold white on blue")
+        table.add_column("PID", style="cyan", justify="right")
+        table.add_column("Name", style="white")
+        table.add_column("CPU %", justify="right", style="yellow")
+        table.add_column("Memory", justify="right", style="green")
+        table.add_column("User", style="magenta")
+        table.add_column("Uptime", justify="right")
+
+        for p_info in top:
+            user = p_info.get('username') or "-"
+            if len(user) > 15:
+                user = user[:13] + "..."
+            table.add_row(str(p_info['pid']), p_info['name'], f"{p_info.get('cpu_percent', 0.0):.1f}",
+                          self.memory_cell(p_info), user, p_info.get('uptime_str', 'N/A'))
+        return table
+
+    def watch(self, query: str = "", interval: float = 1.0, limit: int = 25) -> None:
+        """
+        Live-updating table (Ctrl+C to stop).
+        Every tick is one incremental scan; CPU% comes from the engine's snapshot deltas.
+        """
+        from rich.live import Live # Only the live views need it
+        try:
+            parse_query(query)
+        except QueryError as e:
+            console.print(f"[bold red]Invalid query: {e}[/]")
+            return
+
+        with console.status("[bold cyan]Sampling processes...", spinner="dots"):
+            self.engine.scan_processes()
+            time.sleep(min(interval, 1.0)) # First CPU delta needs two samples
+
+        if self.sampler is not None:
+            self.sampler.start()
+        try:
+            with Live(console=console, auto_refresh=False, screen=False) as live:
+                while True:
+                    started = time.monotonic()
+                    matches = self.engine.find_processes(query)
+                    live.update(self.build_watch_table(matches, limit), refresh=True)
+                    time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            console.print("[bold cyan]Stopped watching.[/]")
+        finally:
+            if self.sampler is not None:
+                self.sampler.stop()
 
     def run(self):
         """Main CLI loop."""
@@ -81,7 +260,7 @@ class CLIInterface:
                 padding=(1, 4)
             ))
             
-            query = Prompt.ask("\n[bold yellow]Search[/] (Name/Path/ID) or [bold red]'exit'[/]").strip()
+            query = Prompt.ask("\n[bold yellow]Search[/] (Name/Path/ID or filters like mem>500MB) or [bold red]'exit'[/]").strip()
             
             if query.lower() in ['exit', 'quit', 'q']:
                 console.print("[bold cyan]Goodbye![/]")
@@ -90,9 +269,16 @@ class CLIInterface:
             if not query:
                 continue
 
-            with console.status(f"[bold cyan]Searching for '{query}'...", spinner="dots"):
-                matches = self.engine.find_processes(query)
-            
+            try:
+                matches = self.stream_search(query)
+            except QueryError as e:
+                console.print(f"[bold red]Invalid query: {e}[/]")
+                Prompt.ask("\n[dim]Press Enter to continue...[/]")
+                continue
+
+            if self.sampler is not None:
+                # In display order, so the rows at the top of the table are measured first
+                self.sampler.sample(matches, budget_ms=self.RESULTS_MEMORY_BUDGET_MS)
             valid_pids = self.display_results(matches)
 
             if not valid_pids:
@@ -102,16 +288,28 @@ class CLIInterface:
             console.print("\n[bold]Options:[/]")
             console.print(" [bold cyan]1.[/] Kill [bold red]ALL[/] listed")
             console.print(" [bold cyan]2.[/] Kill [bold yellow]ONE[/] by PID")
-            console.print(" [bold cyan]3.[/] Try New Search")
+            console.print(" [bold cyan]3.[/] Kill process [bold magenta]TREE[/] by PID")
+            console.print(" [bold cyan]4.[/] [bold green]GROUP[/] by name / exe / user")
+            console.print(" [bold cyan]5.[/] Try New Search")
             
-            choice = Prompt.ask("\n[bold]Select[/]", choices=["1", "2", "3"], default="3")
+            choice = Prompt.ask("\n[bold]Select[/]", choices=["1", "2", "3", "4", "5"], default="5")
+
+            # Bulk kills never act on a fuzzy guess ("node" also lists "code"): only exact matches
+            exact = parse_query(query).compile()
 
             if choice == "1":
-                if Confirm.ask(f"[bold red]⚠ Are you SURE you want to kill {len(valid_pids)} processes?[/]", default=False):
-                    for pid in valid_pids:
-                        res = self.engine.kill_process(pid)
+                targets = [p_info['pid'] for p_info in matches if exact(p_info)]
+                skipped = len(valid_pids) - len(targets)
+                note = f" ({skipped} fuzzy match(es) are not killed)" if skipped else ""
+                if not targets:
+                    console.print("[bold red]Only fuzzy matches listed: kill them one by one.[/]")
+                    time.sleep(1.5)
+                elif Confirm.ask(f"[bold red]⚠ Are you SURE you want to kill {len(targets)} processes{note}?[/]", default=False):
+                    with console.status(f"[bold red]Terminating {len(targets)} processes...", spinner="dots"):
+                        results = self.engine.kill_processes(targets)
+                    for res in results:
                         if res['success']:
-                             console.print(f"[green]✔ {res['message']}[/]")
+                             console.print(f"[green]✔ {res['message']}[/] [dim]({res['elapsed']:.2f}s)[/]")
                         else:
                              console.print(f"[red]✘ {res['message']}[/]")
                     Prompt.ask("\n[dim]Press Enter to continue...[/]")
@@ -128,3 +326,15 @@ class CLIInterface:
                 else:
                     console.print("[bold red]Invalid PID from the displayed list.[/]")
                     time.sleep(1.5)
+
+            elif choice == "3":
+                pid_str = Prompt.ask("[bold yellow]Enter root PID[/]")
+                if pid_str.isdigit() and int(pid_str) in valid_pids:
+                    self.kill_tree(int(pid_str))
+                    Prompt.ask("\n[dim]Press Enter to continue...[/]")
+                else:
+                    console.print("[bold red]Invalid PID from the displayed list.[/]")
+                    time.sleep(1.5)
+
+            elif choice == "4":
+                self.group_menu(matches, exact)
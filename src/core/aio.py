@@ -0,0 +1,177 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import psutil
+
+from src.core.engine import ProcessEngine
+
+
+class AsyncProcessEngine:
+    """
+    asyncio facade over ProcessEngine.
+
+    Scans run in a small bounded executor and are coalesced: concurrent scan() calls share
+    the scan already in flight instead of queueing new ones. Kills never block the loop:
+    signals are sent inline and termination is detected by polling with a short backoff,
+    so any number of kill()/kill_many() calls can be pending at once.
+    """
+    POLL_MIN = 0.005 # seconds
+    POLL_MAX = 0.1
+
+    def __init__(self, engine: Optional[ProcessEngine] = None, max_workers: int = 4):
+        self.engine = engine or ProcessEngine()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="engine")
+        self._scan_lock: Optional[asyncio.Lock] = None # Created lazily, inside the running loop
+        self._pending_scan: Optional[asyncio.Future] = None
+
+    def _lock(self) -> asyncio.Lock:
+        if self._scan_lock is None:
+            self._scan_lock = asyncio.Lock()
+        return self._scan_lock
+
+    async def _run(self, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _scan(self) -> List[Dict[str, Any]]:
+        async with self._lock(): # The engine's snapshot supports one scan at a time
+            return await self._run(self.engine.scan_processes, False)
+
+    # --- Scanning -------------------------------------------------------------
+
+    async def scan(self, sort: bool = True) -> List[Dict[str, Any]]:
+        """Same result as ProcessEngine.scan_processes; callers arriving mid-scan share its result."""
+        if self._pending_scan is None:
+            self._pending_scan = asyncio.ensure_future(self._scan())
+            self._pending_scan.add_done_callback(lambda _: setattr(self, '_pending_scan', None))
+        processes = await asyncio.shield(self._pending_scan)
+        if sort:
+            return await self._run(self.engine.sort_processes, processes)
+        return list(processes)
+
+    async def iter_processes(self, batch: int = 64) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields processes while the scan is still collecting them (unordered).
+        Rows cross from the worker thread in batches to keep the loop overhead low.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def produce() -> None:
+            items: List[Any] = []
+            try:
+                for p_info in self.engine.iter_processes():
+                    items.append(p_info)
+                    if len(items) >= batch:
+                        loop.call_soon_threadsafe(queue.put_nowait, items)
+                        items = []
+                if items:
+                    loop.call_soon_threadsafe(queue.put_nowait, items)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        async with self._lock():
+            producer = loop.run_in_executor(self._executor, produce)
+            try:
+                while True:
+                    items = await queue.get()
+                    if items is done:
+                        break
+                    if isinstance(items, Exception):
+                        raise items
+                    for p_info in items:
+                        yield p_info
+            finally:
+                await producer # Even if the consumer stopped early: the scan must finish before the next one
+
+    async def find(self, query: str = "", category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fresh scan + ProcessEngine.find_processes (query syntax of src.core.query)."""
+        processes = await self.scan()
+        return await self._run(lambda: self.engine.find_processes(query, processes, category=category))
+
+    async def get_process_tree(self, pid: int) -> List[Dict[str, Any]]:
+        """Process and descendants from the last scan (see ProcessEngine.get_process_tree)."""
+        return await self._run(self.engine.get_process_tree, pid)
+
+    # --- Termination ----------------------------------------------------------
+
+    async def _wait(self, procs: List[psutil.Process], timeout: float,
+                    callback: Callable[[psutil.Process], None]) -> List[psutil.Process]:
+        """Non-blocking psutil.wait_procs: polls with exponential backoff. Returns the survivors."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = self.POLL_MIN
+        alive = procs
+        while alive:
+            still = []
+            for proc in alive:
+                try:
+                    proc.wait(timeout=0) # Returns at once; also reaps our own children
+                except psutil.TimeoutExpired:
+                    still.append(proc)
+                    continue
+                except psutil.Error:
+                    pass
+                callback(proc)
+            alive = still
+            remaining = deadline - loop.time()
+            if not alive or remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.POLL_MAX)
+        return alive
+
+    async def kill_many(self, pids: List[int], timeout: float = 3) -> List[Dict[str, Any]]:
+        """
+        Async version of ProcessEngine.kill_processes (same results and messages):
+        SIGTERM to all, wait together, SIGKILL only the survivors.
+        """
+        start = time.perf_counter()
+        results: Dict[int, Dict[str, Any]] = {}
+        names: Dict[int, str] = {}
+
+        def done(pid: int, success: bool, message: str) -> None:
+            results[pid] = {'pid': pid, 'success': success, 'message': message,
+                            'elapsed': time.perf_counter() - start}
+
+        pending = ProcessEngine._send_terminate(pids, names, done)
+        alive = await self._wait(
+            pending, timeout,
+            lambda p: done(p.pid, True, f"Process '{names[p.pid]}' (PID: {p.pid}) terminated."))
+        killed = ProcessEngine._send_kill(alive, names, done)
+
+        still_alive = await self._wait(
+            killed, timeout,
+            lambda p: done(p.pid, True, f"Process '{names[p.pid]}' (PID: {p.pid}) killed forcibly."))
+        for proc in still_alive:
+            done(proc.pid, False, f"Failed to force kill (PID: {proc.pid}): still running.")
+
+        return [results[pid] for pid in dict.fromkeys(pids)]
+
+    async def kill(self, pid: int, timeout: float = 3) -> Dict[str, Any]:
+        """Terminates one process without blocking the loop."""
+        return (await self.kill_many([pid], timeout=timeout))[0]
+
+    async def kill_tree(self, pid: int, order: str = "bottom-up", timeout: float = 3) -> List[Dict[str, Any]]:
+        """Async version of ProcessEngine.kill_tree."""
+        tree = await self.get_process_tree(pid)
+        if not tree:
+            return await self.kill_many([pid], timeout=timeout)
+        pids = [p['pid'] for p in tree]
+        if order == "bottom-up":
+            pids.reverse()
+        return await self.kill_many(pids, timeout=timeout)
+
+    # --- Lifecycle ------------------------------------------------------------
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> 'AsyncProcessEngine':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
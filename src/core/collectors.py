@@ -0,0 +1,259 @@
+import os
+import sys
+import threading
+from collections import namedtuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psutil
+
+# Same fields as psutil's Linux memory_info() so consumers can't tell the backends apart
+pmem = namedtuple('pmem', ['rss', 'vms', 'shared', 'text', 'lib', 'data', 'dirty'])
+pcputimes = namedtuple('pcputimes', ['user', 'system', 'children_user', 'children_system', 'iowait'])
+
+
+class PsutilCollector:
+    """
+    Portable collector built on psutil.process_iter (works on every platform).
+    """
+    name = "psutil"
+
+    def __init__(self):
+        self._users: Dict[int, str] = {}
+
+    def _username(self, handle: psutil.Process) -> Optional[str]:
+        """psutil resolves the uid through pwd on every call; the uid -> name mapping is cached here."""
+        if not hasattr(handle, 'uids'):
+            return handle.username() # Windows: no uids
+        uid = handle.uids().real
+        user = self._users.get(uid)
+        if user is None:
+            user = self._users[uid] = handle.username()
+        return user
+
+    def iter_volatile(self, attrs: List[str]) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """Yields (handle, info) for every process with the volatile attributes filled in."""
+        for p in psutil.process_iter(attrs):
+            yield p, p.info
+
+    def fetch_static(self, handle: Any, attrs: List[str]) -> Dict[str, Any]:
+        """Fetches the static attributes of a single process (AccessDenied -> None)."""
+        if 'username' not in attrs:
+            return handle.as_dict(attrs, ad_value=None)
+        result = handle.as_dict([a for a in attrs if a != 'username'], ad_value=None)
+        try:
+            result['username'] = self._username(handle)
+        except (psutil.AccessDenied, psutil.ZombieProcess):
+            result['username'] = None
+        return result
+
+    @staticmethod
+    def fetch_memory(pid: int) -> Dict[str, Optional[int]]:
+        """USS and PSS in bytes (PSS only exists on Linux). Expensive: walks the memory maps."""
+        info = psutil.Process(pid).memory_full_info()
+        return {'uss': info.uss, 'pss': getattr(info, 'pss', None)}
+
+
+class ProcfsCollector:
+    """
+    Native Linux collector reading /proc directly.
+    Avoids building a psutil.Process per PID and reuses one read buffer per thread
+    (deferred attributes are loaded from UI threads while a scan is running).
+    Raises the same psutil exceptions so callers keep a single error path.
+    """
+    name = "procfs"
+
+    def __init__(self, procfs_path: str = "/proc"):
+        self.procfs_path = procfs_path
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.boot_time = self._read_boot_time()
+        self._local = threading.local()
+        self._users: Dict[int, str] = {}
+
+    @staticmethod
+    def is_supported(procfs_path: str = "/proc") -> bool:
+        return sys.platform.startswith('linux') and os.path.exists(os.path.join(procfs_path, 'self', 'stat'))
+
+    def _read_boot_time(self) -> float:
+        with open(os.path.join(self.procfs_path, 'stat'), 'rb') as f:
+            for line in f:
+                if line.startswith(b'btime'):
+                    return float(line.split()[1])
+        raise RuntimeError("btime not found in /proc/stat")
+
+    def _read(self, pid: int, name: str) -> bytes:
+        """Reads a whole /proc/<pid>/<name> file into this thread's buffer."""
+        path = f"{self.procfs_path}/{pid}/{name}"
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            raise psutil.NoSuchProcess(pid)
+        except PermissionError:
+            raise psutil.AccessDenied(pid)
+        try:
+            buf = getattr(self._local, 'buf', None)
+            if buf is None:
+                buf = self._local.buf = bytearray(64 * 1024)
+            view = memoryview(buf)
+            size = 0
+            while True:
+                n = os.readv(fd, [view[size:]])
+                if n == 0:
+                    break
+                size += n
+                if size == len(buf):
+                    # Long cmdline: grow the buffer and keep reading
+                    view.release()
+                    buf.extend(bytes(len(buf)))
+                    view = memoryview(buf)
+            view.release()
+            return bytes(buf[:size])
+        except ProcessLookupError:
+            raise psutil.NoSuchProcess(pid)
+        except PermissionError:
+            raise psutil.AccessDenied(pid)
+        finally:
+            os.close(fd)
+
+    def _username(self, uid: int) -> str:
+        user = self._users.get(uid)
+        if user is None:
+            try:
+                import pwd
+                user = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                user = str(uid)
+            self._users[uid] = user
+        return user
+
+    def iter_volatile(self, attrs: List[str]) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        Yields (pid, info) for every process listed in /proc.
+        A process that can't be read is yielded as (pid, psutil error) so the scan counts it:
+        NoSuchProcess when it exited meanwhile, AccessDenied, ZombieProcess for 'Z' (zombie) state.
+        """
+        with os.scandir(self.procfs_path) as it:
+            pids = [int(entry.name) for entry in it if entry.name.isdigit()]
+
+        for pid in pids:
+            try:
+                stat = self._read(pid, 'stat')
+                # comm may contain spaces and parentheses: split on the last ')'
+                rpar = stat.rindex(b')')
+                fields = stat[rpar + 2:].split()
+                if fields[0] == b'Z':
+                    raise psutil.ZombieProcess(pid, ppid=int(fields[1]))
+                info = {
+                    'pid': pid,
+                    'ppid': int(fields[1]),
+                    'create_time': self.boot_time + int(fields[19]) / self.clock_ticks,
+                }
+                if 'cpu_times' in attrs:
+                    ticks = self.clock_ticks
+                    info['cpu_times'] = pcputimes(int(fields[11]) / ticks, int(fields[12]) / ticks,
+                                                  int(fields[13]) / ticks, int(fields[14]) / ticks,
+                                                  int(fields[39]) / ticks)
+                if 'memory_info' in attrs:
+                    # statm order: size resident shared text lib data dt (pages)
+                    size, resident, shared, text, lib, data, dirty = (int(x) * self.page_size
+                                                                      for x in self._read(pid, 'statm').split()[:7])
+                    info['memory_info'] = pmem(rss=resident, vms=size, shared=shared, text=text, lib=lib,
+                                               data=data, dirty=dirty)
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                yield pid, e
+                continue
+            yield pid, info
+
+    def _cmdline(self, pid: int) -> Optional[List[str]]:
+        try:
+            data = self._read(pid, 'cmdline').decode('utf-8', 'replace')
+        except psutil.AccessDenied:
+            return None
+        sep = '\x00' if data.endswith('\x00') else ' '
+        if data.endswith(sep):
+            data = data[:-1]
+        return data.split(sep) if data else []
+
+    def fetch_static(self, handle: Any, attrs: List[str]) -> Dict[str, Any]:
+        """Reads status, cmdline and exe for one process (AccessDenied -> None)."""
+        pid = handle
+        result: Dict[str, Any] = {}
+
+        if 'cmdline' in attrs:
+            result['cmdline'] = self._cmdline(pid)
+
+        if 'name' in attrs:
+            stat = self._read(pid, 'stat')
+            name = stat[stat.index(b'(') + 1:stat.rindex(b')')].decode('utf-8', 'replace')
+            # comm is truncated to 15 chars, recover the full name from cmdline like psutil does
+            # (the cmdline is only read for those, so a name-only projection stays cheap)
+            cmdline = result['cmdline'] if 'cmdline' in result else (self._cmdline(pid) if len(name) >= 15 else None)
+            if len(name) >= 15 and cmdline:
+                base = os.path.basename(cmdline[0])
+                if base.startswith(name):
+                    name = base
+            result['name'] = name
+
+        if 'username' in attrs:
+            try:
+                status = self._read(pid, 'status')
+                start = status.index(b'\nUid:') + 5
+                uid = int(status[start:status.index(b'\n', start)].split()[0])
+                result['username'] = self._username(uid)
+            except psutil.AccessDenied:
+                result['username'] = None
+
+        if 'exe' in attrs:
+            try:
+                result['exe'] = os.readlink(f"{self.procfs_path}/{pid}/exe")
+            except FileNotFoundError:
+                if not os.path.exists(f"{self.procfs_path}/{pid}"):
+                    raise psutil.NoSuchProcess(pid)
+                result['exe'] = ""  # Kernel threads have no executable
+            except PermissionError:
+                result['exe'] = None
+
+        return result
+
+    def fetch_memory(self, pid: int) -> Dict[str, Optional[int]]:
+        """USS and PSS in bytes from smaps_rollup (one summed record instead of every mapping)."""
+        try:
+            with open(f"{self.procfs_path}/{pid}/smaps_rollup", 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            if not os.path.exists(f"{self.procfs_path}/{pid}"):
+                raise psutil.NoSuchProcess(pid)
+            return PsutilCollector.fetch_memory(pid) # Kernel < 4.14: psutil parses the full smaps
+        except ProcessLookupError:
+            if not os.path.exists(f"{self.procfs_path}/{pid}"):
+                raise psutil.NoSuchProcess(pid)
+            return {'uss': 0, 'pss': 0} # Kernel thread: no user memory (psutil reports 0 too)
+        except PermissionError:
+            raise psutil.AccessDenied(pid)
+        values = {}
+        for line in data.splitlines():
+            key, _, rest = line.partition(b':')
+            if key in (b'Pss', b'Private_Clean', b'Private_Dirty'):
+                values[key] = int(rest.split()[0]) * 1024 # kB
+        return {'uss': values.get(b'Private_Clean', 0) + values.get(b'Private_Dirty', 0),
+                'pss': values.get(b'Pss')}
+
+
+COLLECTORS = {
+    'psutil': PsutilCollector,
+    'procfs': ProcfsCollector,
+}
+
+
+def get_collector(name: Optional[str] = None):
+    """
+    Returns a collector instance by name ('psutil', 'procfs') or the best one for this platform.
+    """
+    if name:
+        return COLLECTORS[name]()
+    if ProcfsCollector.is_supported():
+        try:
+            return ProcfsCollector()
+        except Exception:
+            pass
+    return PsutilCollector()
@@ -0,0 +1,460 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.core.collectors import pmem
+from src.core.engine import ProcessEngine, ProcessInfo
+from src.core.groups import GroupIndex
+from src.core.memory import MemorySampler
+from src.core.query import QueryError, parse_query
+from src.core.ranking import RankedResults
+
+# Frame: payload length (big-endian uint32) + UTF-8 JSON payload
+FRAME = struct.Struct('>I')
+MAX_FRAME = 64 * 1024 * 1024
+# Process fields sent over the wire, as columns (keys are not repeated per row)
+WIRE_FIELDS = ('pid', 'ppid', 'name', 'username', 'exe', 'cmdline_str', 'create_time', 'rss', 'cpu_percent', 'custom_type',
+               'uss', 'pss')
+
+AVAILABLE = hasattr(socket, 'AF_UNIX') # Not available on Windows builds of Python
+
+
+def _fallback_dir() -> str:
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f"process_killer-{uid}")
+
+
+def default_socket_path() -> str:
+    """
+    Per-user socket path (overridable with PROCESS_KILLER_SOCKET): in $XDG_RUNTIME_DIR,
+    otherwise in a 0700 directory of the shared temp dir that the daemon creates.
+    """
+    path = os.environ.get('PROCESS_KILLER_SOCKET')
+    if path:
+        return path
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, "process_killer.sock")
+    return os.path.join(_fallback_dir(), "daemon.sock")
+
+
+def _private_dir(path: str) -> None:
+    """Creates the directory 0700, or checks that an existing one belongs to this user and is private."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise OSError(f"{path} is not a private directory owned by this user")
+
+
+def owned_by_user(path: str) -> bool:
+    """Whether the socket belongs to this user (another user's socket could impersonate the daemon)."""
+    return not hasattr(os, 'getuid') or os.stat(path).st_uid == os.getuid()
+
+
+def send_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    sock.sendall(FRAME.pack(len(payload)) + payload)
+
+
+def send_raw(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(FRAME.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Reads one message; None when the peer closed the connection."""
+    header = _recv_exact(sock, FRAME.size)
+    if header is None:
+        return None
+    (size,) = FRAME.unpack(header)
+    if size > MAX_FRAME:
+        raise ConnectionError(f"Frame too large ({size} bytes)")
+    payload = _recv_exact(sock, size)
+    if payload is None:
+        return None
+    return json.loads(payload)
+
+
+def encode_processes(processes: List[Dict[str, Any]]) -> List[List[Any]]:
+    """Process dicts -> rows of WIRE_FIELDS values."""
+    rows = []
+    for p in processes:
+        memory_info = p.get('memory_info')
+        rows.append([p['pid'], p.get('ppid'), p.get('name'), p.get('username'), p.get('exe'),
+                     p.get('cmdline_str') or "", p.get('create_time'),
+                     memory_info.rss if memory_info is not None else 0,
+                     round(p.get('cpu_percent', 0.0), 2), p.get('custom_type', "App"),
+                     p.get('uss'), p.get('pss')]) # None until the daemon's MemorySampler got to it
+    return rows
+
+
+def decode_processes(rows: List[List[Any]]) -> List[ProcessInfo]:
+    """Rows -> ProcessInfo dicts shaped like ProcessEngine.scan_processes entries."""
+    processes = []
+    for row in rows:
+        p = ProcessInfo(zip(WIRE_FIELDS, row))
+        rss = p.pop('rss')
+        p['memory_info'] = pmem(rss, 0, 0, 0, 0, 0, 0) # Only RSS travels
+        p['memory_mb'] = rss / (1024 * 1024)
+        processes.append(p)
+    return processes
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128 # Many clients connecting at once (the default backlog is 5)
+
+
+class ScanDaemon:
+    """
+    One shared engine for every local client.
+    A background thread keeps the snapshot (and its search index) fresh; clients send
+    requests over a Unix domain socket: scan, find, tree, kill, kill_tree, stats, ping.
+    The full snapshot is encoded once per refresh, not once per client.
+    With a memory budget, USS/PSS are sampled in the background and shipped with the rows.
+    """
+
+    def __init__(self, engine: Optional[ProcessEngine] = None, path: Optional[str] = None, interval: float = 1.0,
+                 memory_budget_ms: float = 0.0):
+        if not AVAILABLE:
+            raise OSError("Unix domain sockets are not available on this platform")
+        self.engine = engine or ProcessEngine()
+        self.path = path or default_socket_path()
+        self.interval = interval
+        self.processes: List[Dict[str, Any]] = []
+        self.updated = 0.0
+        self.requests = 0
+        self._encoded_scan: Optional[bytes] = None
+        self._stop = threading.Event()
+        self._server: Optional[_Server] = None
+        self.sampler = MemorySampler(self.engine, budget_ms=memory_budget_ms, interval=interval) if memory_budget_ms > 0 else None
+
+    def refresh(self) -> None:
+        processes = self.engine.scan_processes()
+        self.updated = time.time()
+        encoded = json.dumps({'ok': True, 'updated': self.updated, 'fields': WIRE_FIELDS,
+                              'rows': encode_processes(processes)},
+                             ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # Swapped together so a request never sees a list and an encoding from different scans
+        self.processes, self._encoded_scan = processes, encoded
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.refresh()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Executes one request against the shared engine."""
+        op = request.get('op')
+        engine = self.engine
+        if op == 'find':
+            if request.get('fuzzy'):
+                # Relevance is sent as a column: the client ranks (and pages) the rows itself
+                matches, score = engine.find_scored(request.get('query', ""), self.processes,
+                                                    category=request.get('category'))
+                return {'ok': True, 'updated': self.updated, 'fields': WIRE_FIELDS, 'rows': encode_processes(matches),
+                        'scores': [score(p) for p in matches] if score is not None else None}
+            matches = engine.find_processes(request.get('query', ""), self.processes,
+                                            category=request.get('category'))
+            return {'ok': True, 'updated': self.updated, 'fields': WIRE_FIELDS, 'rows': encode_processes(matches)}
+        if op == 'tree':
+            tree = engine.get_process_tree(int(request['pid']))
+            return {'ok': True, 'fields': WIRE_FIELDS, 'rows': encode_processes(tree),
+                    'depths': [p['depth'] for p in tree]}
+        if op == 'kill':
+            return {'ok': True, 'results': engine.kill_processes([int(pid) for pid in request['pids']],
+                                                                 timeout=float(request.get('timeout', 3)))}
+        if op == 'kill_tree':
+            return {'ok': True, 'results': engine.kill_tree(int(request['pid']), order=request.get('order', "bottom-up"),
+                                                            timeout=float(request.get('timeout', 3)))}
+        if op == 'stats':
+            return {'ok': True, 'stats': engine.get_stats()}
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'updated': self.updated, 'processes': len(self.processes),
+                    'collector': engine.collector.name}
+        return {'ok': False, 'error': f"Unknown op: {op}"}
+
+    def _make_handler(self):
+        daemon = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                sock = self.request
+                while True:
+                    try:
+                        request = recv_frame(sock)
+                    except (OSError, ValueError):
+                        return
+                    if request is None:
+                        return
+                    daemon.requests += 1
+                    try:
+                        if request.get('op') == 'scan':
+                            send_raw(sock, daemon._encoded_scan)
+                            continue
+                        response = daemon.handle(request)
+                    except QueryError as e:
+                        response = {'ok': False, 'error': str(e), 'type': 'QueryError'}
+                    except Exception as e:
+                        response = {'ok': False, 'error': str(e)}
+                    try:
+                        send_frame(sock, response)
+                    except OSError:
+                        return
+        return Handler
+
+    def _remove_stale_socket(self) -> None:
+        """Removes a socket left behind by a dead daemon; anything else at the path is left alone."""
+        try:
+            st = os.lstat(self.path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(st.st_mode):
+            raise OSError(f"{self.path} exists and is not a socket")
+        if st.st_uid != os.getuid():
+            raise OSError(f"{self.path} is a socket owned by another user")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path) # Left behind by a daemon that died
+        else:
+            raise OSError(f"A daemon is already listening on {self.path}")
+        finally:
+            probe.close()
+
+    def start(self) -> None:
+        """Takes the first snapshot, then serves in background threads."""
+        if os.path.dirname(self.path) == _fallback_dir():
+            _private_dir(os.path.dirname(self.path)) # The temp dir is shared: others could pre-create it
+        self._remove_stale_socket()
+        self.refresh()
+        self.engine.build_index() # Every 'find' goes through it
+        umask = os.umask(0o177) # Kill requests: only the owner may connect, from the moment of bind
+        try:
+            self._server = _Server(self.path, self._make_handler())
+        finally:
+            os.umask(umask)
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        if self.sampler is not None:
+            self.sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.sampler is not None:
+            self.sampler.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def run(self) -> None:
+        """Serves until Ctrl+C."""
+        self.start()
+        print(f"[daemon] Serving {len(self.processes)} processes on {self.path} (refresh every {self.interval}s)")
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            print(f"[daemon] Stopped after {self.requests} requests.")
+        finally:
+            self.stop()
+
+
+class RemoteEngine:
+    """
+    Drop-in replacement for ProcessEngine (the parts the frontends use) backed by a ScanDaemon.
+    If the daemon goes away, it falls back to a local engine for the rest of the session.
+    """
+    rank_processes = staticmethod(ProcessEngine.rank_processes)
+    sort_processes = staticmethod(ProcessEngine.sort_processes)
+    process_key = staticmethod(ProcessEngine.process_key)
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 30.0):
+        self.path = path or default_socket_path()
+        self.local: Optional[ProcessEngine] = None
+        if not owned_by_user(self.path):
+            raise OSError(f"{self.path} is not owned by this user")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.path)
+        self._lock = threading.Lock() # One request in flight per connection
+
+    def _call(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Sends a request; returns None (and switches to a local engine) if the daemon is gone."""
+        if self.local is None:
+            try:
+                with self._lock:
+                    send_frame(self._sock, request)
+                    response = recv_frame(self._sock)
+                if response is not None:
+                    if not response.get('ok'):
+                        if response.get('type') == 'QueryError':
+                            raise QueryError(response['error'])
+                        raise RuntimeError(response.get('error'))
+                    return response
+            except OSError:
+                pass
+            print("Scan daemon unavailable, falling back to local scanning.", file=sys.stderr) # Keep stdout for data
+            self.close()
+            self.local = ProcessEngine()
+        return None
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        return self._call({'op': 'ping'})
+
+    def scan_processes(self, sort: bool = True, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """The daemon's latest snapshot (already sorted, all fields); no scan is triggered."""
+        response = self._call({'op': 'scan'})
+        if response is None:
+            return self.local.scan_processes(sort=sort, fields=fields)
+        return decode_processes(response['rows'])
+
+    def iter_batches(self, batch_size: int = 512, fields: Optional[List[str]] = None,
+                     first_batch: int = 32) -> Iterator[List[Dict[str, Any]]]:
+        """The daemon's snapshot is already complete: it arrives as a single batch."""
+        response = self._call({'op': 'scan'})
+        if response is None:
+            yield from self.local.iter_batches(batch_size, fields, first_batch)
+        else:
+            yield decode_processes(response['rows'])
+
+    def load_deferred(self, processes: List[Dict[str, Any]], cancel: Optional[threading.Event] = None) -> None:
+        """Rows from the daemon are always complete."""
+        if self.local is not None:
+            self.local.load_deferred(processes, cancel)
+
+    def find_processes(self, query: str, processes: Optional[List[Dict[str, Any]]] = None,
+                       category: Optional[str] = None, cancel: Optional[threading.Event] = None,
+                       fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """Without 'processes' the daemon searches its own index; otherwise the given list is filtered here."""
+        if self.local is not None:
+            return self.local.find_processes(query, processes, category=category, cancel=cancel, fuzzy=fuzzy)
+        if processes is None:
+            response = self._call({'op': 'find', 'query': query, 'category': category, 'fuzzy': fuzzy})
+            if response is None:
+                return self.local.find_processes(query, category=category, cancel=cancel, fuzzy=fuzzy)
+            return decode_processes(response['rows'])
+
+        predicate = parse_query(query).compile(fuzzy=fuzzy) if query else None
+        matching = []
+        for i, p in enumerate(processes):
+            if cancel is not None and i % 512 == 0 and cancel.is_set():
+                break
+            if category and p.get('custom_type', 'App') != category:
+                continue
+            if predicate is not None and not predicate(p):
+                continue
+            matching.append(p)
+        return matching
+
+    def find_ranked(self, query: str, processes: Optional[List[Dict[str, Any]]] = None,
+                    category: Optional[str] = None, cancel: Optional[threading.Event] = None) -> RankedResults:
+        """See ProcessEngine.find_ranked: the daemon scores its own snapshot, a given list is scored here."""
+        if self.local is not None:
+            return self.local.find_ranked(query, processes, category=category, cancel=cancel)
+        if processes is None:
+            response = self._call({'op': 'find', 'query': query, 'category': category, 'fuzzy': True})
+            if response is None:
+                return self.local.find_ranked(query, category=category, cancel=cancel)
+            matching = decode_processes(response['rows'])
+            if response.get('scores') is None:
+                return self.rank_processes(matching)
+            scores = dict(zip(map(self.process_key, matching), response['scores']))
+            return self.rank_processes(matching, lambda p: scores.get(self.process_key(p), 0))
+
+        matching = self.find_processes(query, processes, category=category, cancel=cancel, fuzzy=True)
+        parsed = parse_query(query)
+        if not any(term.field is None for term in parsed.terms):
+            return self.rank_processes(matching)
+        return self.rank_processes(matching, parsed.ranker())
+
+    def group_processes(self, by: str = "name", processes: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Groups the given rows, or the daemon's latest snapshot, here (see ProcessEngine.group_processes)."""
+        if self.local is not None:
+            return self.local.group_processes(by, processes)
+        if processes is None:
+            processes = self.scan_processes(sort=False)
+        index = GroupIndex(by)
+        for p in processes:
+            index.add(self.process_key(p), p)
+        return index.summaries()
+
+    def get_process_tree(self, pid: int) -> List[Dict[str, Any]]:
+        response = self._call({'op': 'tree', 'pid': pid})
+        if response is None:
+            return self.local.get_process_tree(pid)
+        tree = decode_processes(response['rows'])
+        for p, depth in zip(tree, response['depths']):
+            p['depth'] = depth
+        return tree
+
+    def kill_processes(self, pids: List[int], timeout: float = 3) -> List[Dict[str, Any]]:
+        response = self._call({'op': 'kill', 'pids': list(pids), 'timeout': timeout})
+        if response is None:
+            return self.local.kill_processes(pids, timeout=timeout)
+        return response['results']
+
+    def kill_process(self, pid: int) -> Dict[str, Any]:
+        return self.kill_processes([pid])[0]
+
+    def kill_tree(self, pid: int, order: str = "bottom-up", timeout: float = 3) -> List[Dict[str, Any]]:
+        response = self._call({'op': 'kill_tree', 'pid': pid, 'order': order, 'timeout': timeout})
+        if response is None:
+            return self.local.kill_tree(pid, order=order, timeout=timeout)
+        return response['results']
+
+    def get_stats(self) -> Dict[str, Any]:
+        response = self._call({'op': 'stats'})
+        if response is None:
+            return self.local.get_stats()
+        return response['stats']
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def connect_engine(profile: bool = False, path: Optional[str] = None):
+    """
+    Returns a RemoteEngine when a scan daemon is listening, otherwise a local ProcessEngine.
+    Profiling always uses a local engine (it measures this process's own scans).
+    """
+    if AVAILABLE and not profile:
+        path = path or default_socket_path()
+        if os.path.exists(path):
+            if not owned_by_user(path):
+                print(f"Ignoring {path}: the socket is not owned by this user.", file=sys.stderr)
+                return ProcessEngine(profile=profile)
+            try:
+                return RemoteEngine(path)
+            except OSError:
+                pass # Stale socket: no daemon behind it
+    return ProcessEngine(profile=profile)
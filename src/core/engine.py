@@ -1,8 +1,79 @@
 import psutil
+import operator
 import os
 import time
 import datetime
-from typing import List, Dict, Any, Optional
+import threading
+from itertools import compress
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from src.core.collectors import get_collector
+from src.core.groups import GroupIndex
+from src.core.query import Query, Ranker, parse_query
+from src.core.search import SearchIndex
+from src.core.stats import ScanStats
+from src.core.ranking import RankedResults
+
+class ProcessInfo(dict):
+    """
+    Process dict whose presentation fields (memory_str, uptime_str) are formatted on first access
+    and cached until the next scan invalidates them, so rows that are never displayed cost nothing.
+    Expensive attributes left out of a scan's projection (cmdline, exe) are fetched on first access
+    through '_loader' and then kept for the lifetime of the process.
+    memory_str shows PSS once a MemorySampler has measured it ('pss' key), RSS until then.
+    """
+    LAZY_FIELDS = ('memory_str', 'uptime_str')
+    DEFERRED_FIELDS = ('cmdline', 'cmdline_str', 'exe')
+    _loader = None
+
+    def __missing__(self, key: str) -> Any:
+        if key == 'memory_str':
+            pss = self.get('pss')
+            if pss is not None:
+                value = ProcessEngine.format_bytes(pss)
+            else:
+                memory_info = self.get('memory_info')
+                value = ProcessEngine.format_bytes(memory_info.rss if memory_info is not None else 0)
+        elif key == 'uptime_str':
+            value = ProcessEngine.get_uptime(self['create_time'])
+        elif key in self.DEFERRED_FIELDS and self._loader is not None:
+            self._loader(self)
+            return dict.__getitem__(self, key)
+        else:
+            raise KeyError(key)
+        self[key] = value
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return dict.__getitem__(self, key)
+        if key in self.LAZY_FIELDS or (key in self.DEFERRED_FIELDS and self._loader is not None):
+            return self[key]
+        return default
+
+    @property
+    def deferred(self) -> bool:
+        """True while the expensive attributes have not been fetched yet."""
+        return self._loader is not None
+
+    def invalidate(self, *keys: str) -> None:
+        """Drops cached presentation fields so they get re-formatted on next access."""
+        for key in keys:
+            if key in self:
+                del self[key]
+
+    def copy(self, **extra: Any) -> 'ProcessInfo':
+        """Shallow copy plus extra keys; deferred attributes are still fetched on access, through this row."""
+        clone = ProcessInfo(self, **extra)
+        if self._loader is not None:
+            clone._loader = self._load_into
+        return clone
+
+    def _load_into(self, clone: 'ProcessInfo') -> None:
+        # Loads this row once (shared by every copy) and keeps it in the snapshot and index
+        dict.update(clone, {key: self[key] for key in self.DEFERRED_FIELDS})
+        clone._loader = None
+
 
 class ProcessEngine:
     """
@@ -56,105 +127,563 @@ class ProcessEngine:
         except Exception:
             return "N/A"
 
-    def scan_processes(self) -> List[Dict[str, Any]]:
+    # Attributes that never change during a process's lifetime (fetched once per PID).
+    # Cheap ones are always collected; expensive ones only when the projection asks for them
+    CHEAP_ATTRS = ['name', 'username']
+    EXPENSIVE_ATTRS = ['cmdline', 'exe']
+    STATIC_ATTRS = CHEAP_ATTRS + EXPENSIVE_ATTRS
+    # Process dict keys that need an expensive attribute
+    EXPENSIVE_FIELDS = {'cmdline': 'cmdline', 'cmdline_str': 'cmdline', 'exe': 'exe'}
+    # Attributes refreshed on every scan for every process
+    VOLATILE_ATTRS = ['pid', 'create_time', 'memory_info', 'ppid', 'cpu_times']
+    SYSTEM_PROCS = ['svchost.exe', 'csrss.exe', 'winlogon.exe', 'services.exe', 'lsass.exe', 'smss.exe', 'system', 'registry', 'wininit.exe']
+
+    def __init__(self, collector: Any = None, profile: bool = False):
+        # Pluggable data source: native /proc reader on Linux, psutil everywhere else
+        self.collector = collector if collector is not None else get_collector()
+        # Scan instrumentation; per-phase/per-PID timers only run when profiling
+        self.stats = ScanStats(enabled=profile)
+        # Snapshot of the last scan keyed by (pid, create_time) so recycled PIDs are never confused
+        self._snapshot: Dict[Tuple[int, float], Dict[str, Any]] = {}
+        self.last_delta: Dict[str, List[Dict[str, Any]]] = {'added': [], 'removed': [], 'changed': []}
+        # Search index kept in sync with the snapshot; the lock lets UI threads query during a scan.
+        # Built on the first search: one-shot scans (headless queries, watchdog, recorder) never pay for it
+        self.index: Optional[SearchIndex] = None
+        self._children: Dict[int, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        # Wall clock of the previous refresh: CPU% is the cpu_times delta over this interval
+        self._last_refresh: Optional[float] = None
+        # Processes whose deferred attributes were loaded since the last index update
+        self._reindex: List[Dict[str, Any]] = []
+        # Group-by aggregates (by exe/name/user), created on first use and then updated from each delta
+        self._groups: Dict[str, GroupIndex] = {}
+
+    # Identity of a process across scans (PIDs alone get recycled): (pid, create_time).
+    # An itemgetter rather than a method since it runs per row in every filter and ranking pass.
+    process_key = staticmethod(operator.itemgetter('pid', 'create_time'))
+
+    @classmethod
+    def classify(cls, p_info: Dict[str, Any]) -> str:
+        """Determines process type from already collected info (no re-query)."""
+        name_lower = (p_info.get('name') or "").lower()
+        user = (p_info.get('username') or "")
+
+        if name_lower in cls.SYSTEM_PROCS:
+            return "Service"
+        elif 'nt authority' in user.lower():
+            return "Service"
+        elif p_info['pid'] in (0, 4):
+            return "Service"
+        return "App"
+
+    @classmethod
+    def static_attrs(cls, fields: Optional[Iterable[str]] = None) -> List[str]:
+        """Static attributes to collect eagerly for a field projection (None = everything)."""
+        if fields is None:
+            return cls.STATIC_ATTRS
+        expensive = {cls.EXPENSIVE_FIELDS[f] for f in fields if f in cls.EXPENSIVE_FIELDS}
+        return cls.CHEAP_ATTRS + [attr for attr in cls.EXPENSIVE_ATTRS if attr in expensive]
+
+    @staticmethod
+    def _set_expensive(p_info: Dict[str, Any], data: Dict[str, Any]) -> None:
+        cmd_list = data.get('cmdline') or []
+        dict.update(p_info, cmdline=data.get('cmdline'), exe=data.get('exe'),
+                    # Store joined cmdline for easier searching
+                    cmdline_str=" ".join(cmd_list) if cmd_list else "")
+
+    def _deferred_loader(self, handle: Any):
+        """Loader for a row collected without its expensive attributes."""
+        def load(p_info: ProcessInfo) -> None:
+            try:
+                data = self.collector.fetch_static(handle, self.EXPENSIVE_ATTRS)
+            except psutil.Error:
+                data = {} # Exited or protected since the scan
+            self._set_expensive(p_info, data)
+            p_info._loader = None
+            self._reindex.append(p_info) # Re-indexed with cmdline/exe on the next search / scan
+        return load
+
+    def load_deferred(self, processes: Iterable[Dict[str, Any]], cancel: Optional[threading.Event] = None) -> None:
+        """Fetches the expensive attributes of the given rows now (e.g. the visible page, or before a text search)."""
+        for i, p_info in enumerate(processes):
+            if cancel is not None and i % 64 == 0 and cancel.is_set():
+                return
+            loader = getattr(p_info, '_loader', None)
+            if loader is not None:
+                loader(p_info)
+
+    def _search_index(self) -> SearchIndex:
+        """The search index, built from the snapshot on first use. Caller holds the lock."""
+        if self.index is None:
+            self.index = SearchIndex()
+            for key, p_info in self._snapshot.items():
+                self.index.add(key, p_info) # Deferred rows on name/PID, re-indexed once loaded
+            self._reindex.clear()
+        self._drain_reindex()
+        return self.index
+
+    def build_index(self) -> None:
+        """Builds the search index now, so the first search of a long-running frontend doesn't pay for it."""
+        with self._lock:
+            self._search_index()
+
+    def _drain_reindex(self) -> None:
+        """Indexes the rows loaded since the last call. Caller holds the lock."""
+        if self.index is None:
+            self._reindex.clear() # Picked up when the index gets built
+            return
+        while self._reindex:
+            p_info = self._reindex.pop()
+            key = self.process_key(p_info)
+            if key in self._snapshot:
+                self.index.add(key, p_info)
+
+    @staticmethod
+    def _cpu_total(cpu_times: Any) -> float:
+        return cpu_times.user + cpu_times.system if cpu_times is not None else 0.0
+
+    def _update_volatile(self, p_info: Dict[str, Any], v_info: Dict[str, Any], interval: Optional[float] = None) -> None:
         """
-        Scans all running processes and returns a list of dictionaries with details.
-        Optimized for performance.
+        Refreshes the volatile attributes and the fields derived from them.
+        CPU% comes from the cpu_times delta since the previous snapshot (never blocks);
+        without a previous sample it is the average over the process lifetime.
         """
-        results = []
+        cpu_times = v_info['cpu_times']
+        if interval and 'cpu_times' in p_info:
+            cpu_delta = self._cpu_total(cpu_times) - self._cpu_total(p_info['cpu_times'])
+            p_info['cpu_percent'] = max(0.0, cpu_delta / interval * 100)
+        else:
+            lifetime = time.time() - p_info['create_time']
+            p_info['cpu_percent'] = self._cpu_total(cpu_times) / lifetime * 100 if lifetime > 0 else 0.0
+        p_info['cpu_times'] = cpu_times
+
+        memory_info = v_info['memory_info']
+        rss = memory_info.rss if memory_info is not None else 0
+        if p_info.get('memory_info') != memory_info:
+            p_info.invalidate('memory_str')
+        p_info['memory_info'] = memory_info
+        p_info['ppid'] = v_info['ppid'] # Changes when an orphan gets reparented
+        p_info['memory_mb'] = rss / (1024 * 1024)
+        # memory_str / uptime_str are formatted lazily (see ProcessInfo), only for displayed rows
+        p_info.invalidate('uptime_str')
+
+    def refresh(self, fields: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Incrementally updates the process snapshot.
+        Static attributes (cmdline, exe, username...) are only fetched for new processes,
+        survivors just get their volatile attributes refreshed.
+        'fields' is an optional projection: expensive attributes outside it are fetched on first access.
+        Returns the delta: {'added': [...], 'removed': [...], 'changed': [...]}
+        """
+        for _ in self.iter_processes(fields):
+            pass
+        return self.last_delta
+
+    def iter_processes(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Same scan as refresh(), but yields every process as soon as it is collected (unordered).
+        The snapshot, index and delta are only committed once the iteration completes.
+        """
+        static_attrs = self.static_attrs(fields)
+        eager = len(static_attrs) == len(self.STATIC_ATTRS)
+        stats = self.stats
+        profile = stats.enabled
+        scan_started = stats.begin_scan()
+        static_time = format_time = 0.0
+
+        previous = self._snapshot
+        current: Dict[Tuple[int, float], Dict[str, Any]] = {}
+        added, changed = [], []
+        now = time.monotonic()
+        interval = now - self._last_refresh if self._last_refresh is not None else None
+
         try:
-            # Iterate using process_iter with needed attributes to minimize overhead
-            attrs = ['pid', 'name', 'username', 'memory_info', 'create_time', 'cmdline', 'exe']
-            for p in psutil.process_iter(attrs):
+            t_prev = time.perf_counter() if profile else 0.0
+            for handle, v_info in self.collector.iter_volatile(self.VOLATILE_ATTRS):
                 try:
-                    p_info = p.info # Use the cached info from process_iter
-                    
-                    # Store joined cmdline for easier searching
-                    cmd_list = p_info.get('cmdline', [])
-                    p_info['cmdline_str'] = " ".join(cmd_list) if cmd_list else ""
-                    
-                    # Determine type
-                    # Note: We pass the process object itself for the type check methods if needed,
-                    # but here we might need to rely on what we have.
-                    # Let's improve get_process_type to use the info dict if possible or just use the PID/Name checks.
-                    
-                    # Re-implementing simplified type check to avoid re-querying process
-                    p_type = "App"
-                    name_lower = (p_info['name'] or "").lower()
-                    user = (p_info['username'] or "")
-                    
-                    system_procs = ['svchost.exe', 'csrss.exe', 'winlogon.exe', 'services.exe', 'lsass.exe', 'smss.exe', 'system', 'registry', 'wininit.exe']
-                    if name_lower in system_procs:
-                        p_type = "Service"
-                    elif 'nt authority' in user.lower():
-                        p_type = "Service"
-                    elif p_info['pid'] in (0, 4):
-                        p_type = "Service"
-                        
-                    p_info['custom_type'] = p_type
-                    p_info['memory_mb'] = p_info['memory_info'].rss / (1024 * 1024)
-                    p_info['memory_str'] = self.format_bytes(p_info['memory_info'].rss)
-                    p_info['uptime_str'] = self.get_uptime(p_info['create_time'])
-                    
-                    results.append(p_info)
-                    
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+                    if isinstance(v_info, psutil.Error):
+                        raise v_info # Collector could not read this process: counted below
+                    key = (v_info['pid'], v_info['create_time'])
+                    p_info = previous.get(key)
+
+                    if p_info is None:
+                        # New process: fetch the expensive static attributes once
+                        if profile: t0 = time.perf_counter()
+                        data = self.collector.fetch_static(handle, static_attrs)
+                        p_info = ProcessInfo(name=data.get('name'), username=data.get('username'))
+                        if profile:
+                            static_time += time.perf_counter() - t0
+                        if data.get('username') is None or (eager and data.get('exe') is None):
+                            stats.count('denied')
+                        p_info['pid'] = v_info['pid']
+                        p_info['create_time'] = v_info['create_time']
+
+                        if eager:
+                            self._set_expensive(p_info, data)
+                        else:
+                            p_info._loader = self._deferred_loader(handle)
+                        p_info['custom_type'] = self.classify(p_info)
+                        if profile: t0 = time.perf_counter()
+                        self._update_volatile(p_info, v_info)
+                        added.append(p_info)
+                    else:
+                        if eager and p_info._loader is not None:
+                            p_info._loader(p_info) # Collected lazily before, needed now
+                        if (p_info['memory_info'] != v_info['memory_info'] or p_info['ppid'] != v_info['ppid'] or
+                                p_info['cpu_times'] != v_info['cpu_times']):
+                            changed.append(p_info)
+                        if profile: t0 = time.perf_counter()
+                        self._update_volatile(p_info, v_info, interval)
+
+                    current[key] = p_info
+
+                    if profile:
+                        t = time.perf_counter()
+                        format_time += t - t0
+                        stats.record_process(t - t_prev, p_info['pid'], p_info.get('name'))
+
+                    yield p_info
+                    if profile: t_prev = time.perf_counter()
+
+                except psutil.ZombieProcess:
+                    stats.count('zombie')
+                except psutil.NoSuchProcess:
+                    stats.count('vanished')
+                except psutil.AccessDenied:
+                    stats.count('denied')
         except Exception as e:
             print(f"Scan Error: {e}")
+            stats.record_error(e)
+            stats.end_scan(scan_started)
+            # Keep the previous snapshot rather than reporting every process as removed
+            self.last_delta = {'added': [], 'removed': [], 'changed': []}
+            return
+
+        if profile:
+            t0 = time.perf_counter()
+            stats.add_phase('collect', t0 - scan_started - static_time - format_time)
+            stats.add_phase('static', static_time)
+            stats.add_phase('format', format_time)
+
+        removed = [p_info for key, p_info in previous.items() if key not in current]
 
-        # Sort: Services at bottom, High memory at top within apps
-        results.sort(key=lambda x: (x['custom_type'] == "Service", -x['memory_mb']))
+        # Parent -> children index (ppid comes for free with the volatile attributes)
+        children: Dict[int, List[Dict[str, Any]]] = {}
+        for p_info in current.values():
+            children.setdefault(p_info['ppid'], []).append(p_info)
+
+        if 'exe' in self._groups:
+            self.load_deferred(added) # Group key needed below: fetch it before taking the lock
+
+        with self._lock:
+            self._snapshot = current
+            self._children = children
+            self._last_refresh = now
+            if self.index is not None:
+                for p_info in removed:
+                    self.index.remove(self.process_key(p_info))
+                for p_info in added:
+                    self.index.add(self.process_key(p_info), p_info) # Deferred rows on name/PID, re-indexed once loaded
+            self._drain_reindex()
+            for groups in self._groups.values():
+                for p_info in removed:
+                    groups.remove(self.process_key(p_info))
+                for p_info in added:
+                    groups.add(self.process_key(p_info), p_info)
+                for p_info in changed:
+                    groups.update(self.process_key(p_info), p_info)
+        self.last_delta = {'added': added, 'removed': removed, 'changed': changed}
+
+        if profile:
+            stats.add_phase('index', time.perf_counter() - t0)
+        stats.count('processes', len(current))
+        stats.count('new', len(added))
+        stats.end_scan(scan_started)
+
+    def iter_batches(self, batch_size: int = 512, fields: Optional[Iterable[str]] = None,
+                     first_batch: int = 32) -> Iterator[List[Dict[str, Any]]]:
+        """
+        iter_processes grouped into lists, for consumers that pay per hand-off (UI callbacks, redraws).
+        The first batch is small so something can be shown right away; later ones double up to batch_size.
+        """
+        batch: List[Dict[str, Any]] = []
+        size = first_batch
+        for p_info in self.iter_processes(fields):
+            batch.append(p_info)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+                size = min(size * 2, batch_size)
+        if batch:
+            yield batch
+
+    @staticmethod
+    def sort_processes(processes: List[Dict[str, Any]], score: Optional[Ranker] = None) -> List[Dict[str, Any]]:
+        """Sort: Services at bottom, High memory at top within apps (most relevant first when a 'score' is given)."""
+        if score is not None:
+            return sorted(processes, key=lambda x: (-score(x), x['custom_type'] == "Service", -x['memory_mb']))
+        return sorted(processes, key=lambda x: (x['custom_type'] == "Service", -x['memory_mb']))
+
+    def scan_processes(self, sort: bool = True, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Scans all running processes and returns a list of dictionaries with details.
+        Optimized for performance: only the delta since the previous scan is collected.
+        With sort=False the list is unordered (rank it with rank_processes when only a page is shown).
+        With a 'fields' projection (e.g. ['pid', 'name', 'memory_mb']) cmdline/exe are only
+        collected if listed, otherwise fetched per row on first access.
+        """
+        self.refresh(fields)
+        if not sort:
+            return list(self._snapshot.values())
+        if not self.stats.enabled:
+            return self.sort_processes(list(self._snapshot.values()))
+
+        t0 = time.perf_counter()
+        results = self.sort_processes(list(self._snapshot.values()))
+        self.stats.add_phase('sort', time.perf_counter() - t0)
         return results
 
-    def find_processes(self, query: str, processes: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    @staticmethod
+    def rank_processes(processes: List[Dict[str, Any]], score: Optional[Ranker] = None) -> 'RankedResults':
+        """Display order (same as sort_processes) computed lazily: only the pages actually read get sorted."""
+        if score is not None:
+            return RankedResults([(-score(p), p['custom_type'] == "Service", -p['memory_mb'], i, p)
+                                  for i, p in enumerate(processes)])
+        return RankedResults([(p['custom_type'] == "Service", -p['memory_mb'], i, p) for i, p in enumerate(processes)])
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Processes of the last scan, unordered, without scanning again."""
+        with self._lock:
+            return list(self._snapshot.values())
+
+    def group_processes(self, by: str = "name", processes: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregates per exe, name or user (count, total RSS, oldest start), largest first.
+        Without 'processes' the snapshot's groups are used: they are built on the first call and
+        then kept up to date by every scan. A given list (e.g. search results) is grouped on the spot.
+        """
+        if processes is not None:
+            index = GroupIndex(by)
+            for p_info in processes:
+                index.add(self.process_key(p_info), p_info)
+            return index.summaries()
+
+        if by not in self._groups:
+            index = GroupIndex(by)
+            if by == 'exe':
+                self.load_deferred(list(self._snapshot.values()))
+            with self._lock:
+                for key, p_info in self._snapshot.items():
+                    index.add(key, p_info)
+                self._groups.setdefault(by, index)
+        with self._lock:
+            return self._groups[by].summaries()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scan statistics: durations, histogram, error counters (+ phases and slowest PIDs when profiling)."""
+        return self.stats.snapshot()
+
+    def scan_table(self):
+        """
+        Same as scan_processes but returns a compact columnar ProcessTable.
+        Meant for snapshots that are kept around (history, recording).
+        """
+        from src.core.table import ProcessTable
+        return ProcessTable.from_processes(self.scan_processes())
+
+    def search(self, query: str) -> set:
+        """Returns the keys of the snapshot processes matching the query (uses the search index)."""
+        with self._lock:
+            return self._search_index().search(query)
+
+    def fuzzy_search(self, query: str) -> Dict[Tuple[int, float], int]:
+        """Keys of the snapshot processes matching the query fuzzily, with their relevance score."""
+        with self._lock:
+            return self._search_index().fuzzy(query)
+
+    def _searcher(self, fuzzy: bool):
         """
-        Filters processes based on a query. 
-        If 'processes' list is provided, filters that list. Otherwise scans new.
+        Index lookup for Query.candidates / compile / ranker (with key=id), memoized per query.
+        Hits are keyed by snapshot row identity: a row is the same object for the whole life of its
+        process, and id() costs far less per row than building and hashing a (pid, create_time) tuple.
         """
+        cache: Dict[str, Any] = {}
+
+        def search(needle: str) -> Any:
+            if needle not in cache:
+                found = self.fuzzy_search(needle) if fuzzy else self.search(needle)
+                snapshot = self._snapshot
+                if fuzzy:
+                    cache[needle] = {id(snapshot[key]): score for key, score in found.items() if key in snapshot}
+                else:
+                    cache[needle] = {id(snapshot[key]) for key in found if key in snapshot}
+            return cache[needle]
+        return search
+
+    def find_processes(self, query: str, processes: Optional[List[Dict[str, Any]]] = None,
+                       category: Optional[str] = None, cancel: Optional[threading.Event] = None,
+                       fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """
+        Filters processes based on a query and optional category ("App"/"Service").
+        The query is either plain text (Name, Cmdline, Path or PID prefix) or the field syntax
+        of src.core.query (e.g. "name:java mem>500MB"); it is compiled once and applied in one pass.
+        With 'fuzzy', plain text also matches typos and subsequences of names (interactive search
+        only: never for unattended kills).
+        If 'processes' list is provided (rows of this engine's last scan), filters that list. Otherwise scans new.
+        A set 'cancel' event stops filtering early (the partial result must be discarded).
+        Raises QueryError for malformed queries.
+        """
+        parsed = parse_query(query)
+        return self._filter(parsed, processes, category, cancel, self._searcher(fuzzy), fuzzy)
+
+    def find_scored(self, query: str, processes: Optional[List[Dict[str, Any]]] = None,
+                    category: Optional[str] = None,
+                    cancel: Optional[threading.Event] = None) -> Tuple[List[Dict[str, Any]], Optional[Ranker]]:
+        """Fuzzy find_processes plus the relevance of each match (None when the query has no free text)."""
+        parsed = parse_query(query)
+        search = self._searcher(True)
+        matching = self._filter(parsed, processes, category, cancel, search, True)
+        if not any(term.field is None for term in parsed.terms):
+            return matching, None # Nothing to score
+        return matching, parsed.ranker(search, id)
+
+    def find_ranked(self, query: str, processes: Optional[List[Dict[str, Any]]] = None,
+                    category: Optional[str] = None, cancel: Optional[threading.Event] = None) -> RankedResults:
+        """Fuzzy find_processes, ranked by relevance first, then in the usual display order."""
+        return self.rank_processes(*self.find_scored(query, processes, category, cancel))
+
+    def _filter(self, parsed: Query, processes: Optional[List[Dict[str, Any]]], category: Optional[str],
+                cancel: Optional[threading.Event], search, fuzzy: bool) -> List[Dict[str, Any]]:
         if processes is None:
-            processes = self.scan_processes()
+            processes = self.scan_processes(fields=parsed.fields())
             
-        if not query:
+        if not parsed and not category:
             return processes
 
-        query = query.lower()
+        if any(field in self.EXPENSIVE_FIELDS for field in parsed.fields()):
+            # Text search needs cmdline/exe: complete the rows collected without them
+            self.load_deferred(processes, cancel)
+
+        rows = parsed.candidates(search)
+        if rows is not None:
+            # Rows outside the index hits can't match: dropped in one C-level pass, not one predicate call each
+            processes = list(compress(processes, map(rows.__contains__, map(id, processes))))
+            if len(parsed.terms) == 1 and parsed.terms[0].field is None:
+                # Plain search: the index hits are the answer, no term left to check per row
+                return [p for p in processes if p.get('custom_type', 'App') == category] if category else processes
+        predicate = parsed.compile(search=search, key=id, fuzzy=fuzzy) if parsed else None
         matching = []
-        
-        for p in processes:
-            p_name = (p['name'] or "").lower()
-            p_cmd = (p['cmdline_str'] or "").lower()
-            p_pid = str(p['pid'])
-            p_exe = (p['exe'] or "").lower()
-            
-            if (query in p_name or 
-                query in p_cmd or 
-                query in p_exe or
-                p_pid.startswith(query)):
-                matching.append(p)
-                
+        for i, p in enumerate(processes):
+            if cancel is not None and i % 512 == 0 and cancel.is_set():
+                break
+            if category and p.get('custom_type', 'App') != category:
+                continue
+            if predicate is not None and not predicate(p):
+                continue
+            matching.append(p)
         return matching
 
+    def get_process_tree(self, pid: int) -> List[Dict[str, Any]]:
+        """
+        Returns the process and all its descendants from the last scan, parents before children.
+        Each entry is a copy of the process row plus a 'depth' key (0 for the root).
+        """
+        with self._lock:
+            roots = [p for p in self._snapshot.values() if p['pid'] == pid]
+            if not roots:
+                return []
+            tree = [roots[0].copy(depth=0)]
+            i = 0
+            while i < len(tree):
+                parent = tree[i]
+                for child in self._children.get(parent['pid'], ()):
+                    # A child can't be older than its parent: guards against recycled PIDs
+                    if child['pid'] != parent['pid'] and child['create_time'] >= parent['create_time']:
+                        tree.append(child.copy(depth=parent['depth'] + 1))
+                i += 1
+        return tree
+
+    def kill_tree(self, pid: int, order: str = "bottom-up", timeout: float = 3) -> List[Dict[str, Any]]:
+        """
+        Terminates a process and its whole subtree in one batched pass.
+        order='bottom-up' signals leaves first, 'top-down' signals the root first (stops it from respawning children).
+        """
+        tree = self.get_process_tree(pid)
+        if not tree:
+            return self.kill_processes([pid], timeout=timeout)
+        pids = [p['pid'] for p in tree]
+        if order == "bottom-up":
+            pids.reverse()
+        return self.kill_processes(pids, timeout=timeout)
+
     def kill_process(self, pid: int) -> Dict[str, Any]:
         """
         Terminates a process by PID.
         Returns: {'success': bool, 'message': str}
         """
-        try:
-            proc = psutil.Process(pid)
-            name = proc.name()
-            proc.terminate()
-            proc.wait(timeout=3)
-            return {'success': True, 'message': f"Process '{name}' (PID: {pid}) terminated."}
-        except psutil.NoSuchProcess:
-            return {'success': False, 'message': f"Process (PID: {pid}) no longer exists."}
-        except psutil.AccessDenied:
-            return {'success': False, 'message': f"Access denied (PID: {pid}). Run as Admin."}
-        except psutil.TimeoutExpired:
+        return self.kill_processes([pid])[0]
+
+    @staticmethod
+    def _send_terminate(pids: List[int], names: Dict[int, str], done) -> List[psutil.Process]:
+        """Kill phase 1: SIGTERM every PID. Returns the processes to wait for; failures go to done()."""
+        pending = []
+        for pid in dict.fromkeys(pids):
+            try:
+                proc = psutil.Process(pid)
+                names[pid] = proc.name()
+                proc.terminate()
+                pending.append(proc)
+            except psutil.NoSuchProcess:
+                done(pid, False, f"Process (PID: {pid}) no longer exists.")
+            except psutil.AccessDenied:
+                done(pid, False, f"Access denied (PID: {pid}). Run as Admin.")
+            except Exception as e:
+                done(pid, False, f"Error (PID: {pid}): {e}")
+        return pending
+
+    @staticmethod
+    def _send_kill(alive: List[psutil.Process], names: Dict[int, str], done) -> List[psutil.Process]:
+        """Kill phase 3: SIGKILL the survivors. Returns the processes to wait for."""
+        killed = []
+        for proc in alive:
             try:
                 proc.kill()
-                return {'success': True, 'message': f"Process '{name}' (PID: {pid}) killed forcibly."}
+                killed.append(proc)
+            except psutil.NoSuchProcess:
+                done(proc.pid, True, f"Process '{names[proc.pid]}' (PID: {proc.pid}) terminated.")
             except Exception as e:
-                 return {'success': False, 'message': f"Failed to force kill (PID: {pid}): {e}"}
-        except Exception as e:
-            return {'success': False, 'message': f"Error (PID: {pid}): {e}"}
+                done(proc.pid, False, f"Failed to force kill (PID: {proc.pid}): {e}")
+        return killed
+
+    def kill_processes(self, pids: List[int], timeout: float = 3) -> List[Dict[str, Any]]:
+        """
+        Terminates many processes at once: SIGTERM goes to the whole set, then all of them
+        are awaited together and only the survivors are escalated to SIGKILL.
+        Returns one result per PID (input order): {'pid', 'success', 'message', 'elapsed'}
+        """
+        start = time.perf_counter()
+        results: Dict[int, Dict[str, Any]] = {}
+        names: Dict[int, str] = {}
+
+        def done(pid: int, success: bool, message: str) -> None:
+            results[pid] = {'pid': pid, 'success': success, 'message': message,
+                            'elapsed': time.perf_counter() - start}
+
+        # Phase 1: SIGTERM everything
+        pending = self._send_terminate(pids, names, done)
+
+        # Phase 2: wait for all of them together
+        _, alive = psutil.wait_procs(
+            pending, timeout=timeout,
+            callback=lambda p: done(p.pid, True, f"Process '{names[p.pid]}' (PID: {p.pid}) terminated."))
+
+        # Phase 3: escalate the survivors only
+        killed = self._send_kill(alive, names, done)
+
+        _, still_alive = psutil.wait_procs(
+            killed, timeout=timeout,
+            callback=lambda p: done(p.pid, True, f"Process '{names[p.pid]}' (PID: {p.pid}) killed forcibly."))
+        for proc in still_alive:
+            done(proc.pid, False, f"Failed to force kill (PID: {proc.pid}): still running.")
+
+        return [results[pid] for pid in dict.fromkeys(pids)]
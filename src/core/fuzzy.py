@@ -0,0 +1,152 @@
+import re
+from typing import Dict, List, Optional
+
+# Score scale (higher = more relevant); 0 means no match
+SCORE_EXACT = 1000      # Name / exe basename equals the query
+SCORE_PID = 950         # PID prefix
+SCORE_PREFIX = 800      # Name starts with the query
+SCORE_WORD = 700        # Query starts a word of the name ("chrome" in "google-chrome")
+SCORE_INFIX = 600       # Anywhere else in the name
+SCORE_HAYSTACK = 400    # Only in the command line / full path
+SCORE_SUBSEQUENCE = 300 # Query letters in order ("gchr" -> "google-chrome")
+SCORE_TYPO = 250        # One or two edits away from a word ("jvaa" -> "java")
+
+_WORD_SPLIT = re.compile(r'[^a-z0-9]+')
+_BOUNDARY = frozenset(" -_./\\:@=")
+
+
+def char_mask(text: str) -> int:
+    """Bit per letter/digit present (bit 36 for anything else): the cheap pruning pass."""
+    mask = 0
+    for c in set(text):
+        if 'a' <= c <= 'z':
+            mask |= 1 << (ord(c) - 97)
+        elif '0' <= c <= '9':
+            mask |= 1 << (ord(c) - 22)
+        else:
+            mask |= 1 << 36
+    return mask
+
+
+def max_typos(query: str) -> int:
+    """Edits tolerated for a query of this length (short queries and numbers must be exact)."""
+    if len(query) < 4 or query.isdigit():
+        return 0
+    return 1 if len(query) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (transpositions count as one edit), or limit + 1 once exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev2[j - 2] + 1)
+            cur[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _subsequence(query: str, term: str) -> int:
+    """Greedy subsequence score: bonus for letters on word starts and consecutive runs, penalty for gaps."""
+    pos = -1
+    score = SCORE_SUBSEQUENCE
+    for c in query:
+        found = term.find(c, pos + 1)
+        if found < 0:
+            return 0
+        if found == 0 or term[found - 1] in _BOUNDARY:
+            score += 10
+        elif found == pos + 1:
+            score += 5
+        else:
+            score -= min(10, found - pos - 1)
+        pos = found
+    return min(max(score, SCORE_SUBSEQUENCE - 100), SCORE_HAYSTACK - 1)
+
+
+def match_term(query: str, term: str) -> int:
+    """Substring or subsequence score of a term containing every letter of the query (0 if neither)."""
+    if term == query:
+        return SCORE_EXACT
+    at = term.find(query)
+    if at >= 0:
+        coverage = len(query) * 50 // len(term) # Up to +50 when the query covers most of the name
+        if at == 0:
+            return SCORE_PREFIX + coverage
+        while at >= 0 and term[at - 1] not in _BOUNDARY:
+            at = term.find(query, at + 1)
+        return (SCORE_WORD if at > 0 else SCORE_INFIX) + coverage
+    if len(query) >= 3:
+        return _subsequence(query, term)
+    return 0
+
+
+def term_words(term: str) -> List[str]:
+    """Words of a term that typos are matched against."""
+    # Shorter words can't tell a typo apart; numbers (PID, version) are one edit from thousands
+    return [word for word in _WORD_SPLIT.split(term) if len(word) >= 3 and not word.isdigit()]
+
+
+def typo_distance(query: str, word: str, limit: int) -> int:
+    """Edits from the query to the whole word, or to its start when the query is only a prefix of it."""
+    distance = edit_distance(query, word, limit)
+    if len(word) > len(query):
+        distance = min(distance, edit_distance(query, word[:len(query)], limit))
+    return distance
+
+
+def typo_score(distance: int) -> int:
+    return SCORE_TYPO - 50 * distance
+
+
+def score_term(query: str, term: str, query_mask: int, term_mask: int,
+               distances: Optional[Dict[str, int]] = None) -> int:
+    """
+    Relevance of a short pre-normalized term (process name or exe basename) for a normalized query.
+    Substring hits beat subsequences, which beat typo matches; shorter terms win ties.
+    'distances' memoizes typo checks per word across the terms scored for one query
+    (names like "java-worker-17" and "java-worker-18" share most of their words).
+    """
+    limit = max_typos(query)
+    missing = (query_mask & ~term_mask).bit_count()
+    if missing > limit:
+        return 0 # Pruned: letters of the query that even a typo can't explain
+
+    if missing == 0:
+        score = match_term(query, term)
+        if score:
+            return score
+
+    if limit:
+        best = limit + 1
+        for word in term_words(term):
+            distance = distances.get(word) if distances is not None else None
+            if distance is None:
+                distance = typo_distance(query, word, limit)
+                if distances is not None:
+                    distances[word] = distance
+            best = min(best, distance)
+            if best == 1:
+                break
+        if best <= limit:
+            return typo_score(best)
+    return 0
+
+
+def exe_basename(exe: Optional[str]) -> str:
+    """Last path component of an exe path ('' if none)."""
+    if not exe:
+        return ""
+    return exe.replace("\\", "/").rsplit("/", 1)[-1]
@@ -0,0 +1,122 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Group key of a process for each grouping; processes without an exe (access denied) fall back to their name
+GROUP_KEYS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'exe': lambda p: p.get('exe') or p.get('name') or "?",
+    'name': lambda p: p.get('name') or "?",
+    'user': lambda p: p.get('username') or "?",
+}
+
+
+def _rss(p_info: Dict[str, Any]) -> int:
+    memory_info = p_info.get('memory_info')
+    return memory_info.rss if memory_info is not None else 0
+
+
+class Group:
+    """Members and running totals of one group."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.processes: Dict[Hashable, Dict[str, Any]] = {}
+        self.rss = 0
+        self.services = 0
+        self._oldest: Optional[float] = None # None while unknown (empty, or the oldest member left)
+
+    @property
+    def oldest(self) -> Optional[float]:
+        """create_time of the oldest member (only rescanned after that member exits)."""
+        if self._oldest is None and self.processes:
+            self._oldest = min(p['create_time'] for p in self.processes.values())
+        return self._oldest
+
+    def add(self, key: Hashable, p_info: Dict[str, Any], rss: int) -> None:
+        if not self.processes:
+            self._oldest = p_info['create_time']
+        elif self._oldest is not None:
+            self._oldest = min(self._oldest, p_info['create_time'])
+        self.processes[key] = p_info
+        self.rss += rss
+        if p_info.get('custom_type') == "Service":
+            self.services += 1
+
+    def remove(self, key: Hashable, rss: int) -> None:
+        p_info = self.processes.pop(key)
+        self.rss -= rss
+        if p_info.get('custom_type') == "Service":
+            self.services -= 1
+        if p_info['create_time'] == self._oldest:
+            self._oldest = None
+
+    def summary(self, by: str) -> Dict[str, Any]:
+        """Plain-data view of the group (same sort keys as a process: custom_type, memory_mb)."""
+        count = len(self.processes)
+        return {
+            'group': self.key,
+            'by': by,
+            'count': count,
+            'rss': self.rss,
+            'memory_mb': self.rss / (1024 * 1024),
+            'create_time': self.oldest,
+            'services': self.services,
+            'custom_type': "Service" if self.services == count else "App",
+            'processes': list(self.processes.values()),
+        }
+
+
+class GroupIndex:
+    """
+    Process count, total RSS and oldest start time per exe, name or user.
+    Maintained incrementally like SearchIndex: the engine feeds it the scan delta, so a refresh
+    costs O(changed processes) instead of re-aggregating the whole snapshot.
+    """
+
+    def __init__(self, by: str = "name"):
+        if by not in GROUP_KEYS:
+            raise ValueError(f"Unknown grouping '{by}' (expected one of: {', '.join(GROUP_KEYS)})")
+        self.by = by
+        self._group_of = GROUP_KEYS[by]
+        self._groups: Dict[str, Group] = {}
+        # Process key -> (its group, the RSS counted for it)
+        self._members: Dict[Hashable, Tuple[Group, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def add(self, key: Hashable, p_info: Dict[str, Any]) -> None:
+        """Counts one process under the given key."""
+        if key in self._members:
+            self.remove(key)
+        name = self._group_of(p_info)
+        group = self._groups.get(name)
+        if group is None:
+            group = self._groups[name] = Group(name)
+        rss = _rss(p_info)
+        group.add(key, p_info, rss)
+        self._members[key] = (group, rss)
+
+    def update(self, key: Hashable, p_info: Dict[str, Any]) -> None:
+        """Applies a survivor's new RSS (the group key itself never changes for a process)."""
+        entry = self._members.get(key)
+        if entry is None:
+            self.add(key, p_info)
+            return
+        group, rss = entry
+        new_rss = _rss(p_info)
+        if new_rss != rss:
+            group.rss += new_rss - rss
+            self._members[key] = (group, new_rss)
+
+    def remove(self, key: Hashable) -> None:
+        """Drops one process (no-op if unknown); empty groups disappear."""
+        entry = self._members.pop(key, None)
+        if entry is None:
+            return
+        group, rss = entry
+        group.remove(key, rss)
+        if not group.processes:
+            del self._groups[group.key]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """All groups, largest total memory first."""
+        return sorted((group.summary(self.by) for group in self._groups.values()), key=lambda g: -g['rss'])
@@ -0,0 +1,306 @@
+import errno
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.core.table import ProcessTable
+
+# File header: magic, version, slot count, data capacity, next sequence, oldest live sequence, write offset
+HEADER = struct.Struct('<8sIIQQQQ')
+HEADER_SIZE = 64
+MAGIC = b"PKHIST01"
+VERSION = 1
+# Index slot (one per record): timestamp, sequence, data offset, record length
+SLOT = struct.Struct('<dQII')
+MAX_CAPACITY = 2 ** 32 - 1 # Data offsets in the slots are uint32
+# Record header: timestamp, process count, string table length
+RECORD = struct.Struct('<dII')
+
+# Numeric columns in record order (same typecodes as ProcessTable)
+NUMERIC_COLUMNS = (('pid', 'q'), ('ppid', 'q'), ('rss', 'Q'), ('create_time', 'd'), ('cpu_percent', 'f'))
+STRING_COLUMNS = ('name', 'username', 'exe', 'cmdline_str')
+TYPE_CODES = {"App": 0, "Service": 1}
+TYPE_NAMES = ("App", "Service")
+MAX_CMDLINE = 512 # Longer command lines are truncated in the history
+
+
+class SnapshotHistory:
+    """
+    Fixed-size, memory-mapped ring buffer of process snapshots.
+
+    Layout: header | index slots | data ring. Each record is a compact binary snapshot
+    (numeric columns + per-record string table). When the data ring is full the oldest
+    records are overwritten, so the file never grows past its initial size.
+    Readers only touch the index and the columns they need (e.g. pid_history reads two
+    columns per record, never the strings).
+    """
+
+    def __init__(self, path: str, size_mb: float = 64, slots: int = 8192, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if not exists and readonly:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        capacity = int(size_mb * 1024 * 1024)
+        if not exists and not 0 < capacity <= MAX_CAPACITY:
+            raise ValueError(f"History size must be between 1 byte and {MAX_CAPACITY // (1024 * 1024)} MB, got {size_mb} MB")
+
+        self._file = open(path, "rb" if readonly else ("r+b" if exists else "w+b"))
+        if not exists:
+            self._file.truncate(HEADER_SIZE + slots * SLOT.size + capacity)
+        access = mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+
+        if not exists:
+            self.slots, self.capacity = slots, capacity
+            self.next_seq = self.oldest_seq = self.write_pos = 0
+            self._write_header()
+        else:
+            self._read_header()
+        self._data_start = HEADER_SIZE + self.slots * SLOT.size
+
+    # --- Header / index -------------------------------------------------------
+
+    def _read_header(self) -> None:
+        if len(self._mm) < HEADER_SIZE:
+            raise ValueError(f"{self.path} is not a snapshot history file")
+        magic, version, self.slots, self.capacity, self.next_seq, self.oldest_seq, self.write_pos = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a snapshot history file")
+
+    def _write_header(self) -> None:
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.slots, self.capacity,
+                         self.next_seq, self.oldest_seq, self.write_pos)
+
+    def _slot(self, seq: int) -> Tuple[float, int, int, int]:
+        return SLOT.unpack_from(self._mm, HEADER_SIZE + (seq % self.slots) * SLOT.size)
+
+    def __len__(self) -> int:
+        return self.next_seq - self.oldest_seq
+
+    def entries(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[float, int, int, int]]:
+        """Index entries (timestamp, seq, offset, length) of the live records in [start, end], oldest first."""
+        if self.readonly:
+            self._read_header() # The recorder may have appended since
+        result = []
+        for seq in range(self.oldest_seq, self.next_seq):
+            entry = self._slot(seq)
+            if entry[1] != seq:
+                continue # Torn write
+            if (start is None or entry[0] >= start) and (end is None or entry[0] <= end):
+                result.append(entry)
+        return result
+
+    def _alive(self, seq: int) -> bool:
+        """False if the record was overwritten while it was being read."""
+        if self.readonly:
+            oldest = HEADER.unpack_from(self._mm, 0)[5]
+            return seq >= oldest
+        return seq >= self.oldest_seq
+
+    def _read(self, seq: int, offset: int) -> Optional[Tuple[float, ProcessTable]]:
+        """Decodes a live record; None if the recorder overwrote it before or during the read (torn read)."""
+        if not self._alive(seq):
+            return None
+        try:
+            snapshot = self.decode(offset)
+        except (struct.error, IndexError, ValueError):
+            if self._alive(seq):
+                raise # Still live: the file itself is corrupt
+            return None
+        return snapshot if self._alive(seq) else None
+
+    # --- Writing --------------------------------------------------------------
+
+    @staticmethod
+    def encode(table: ProcessTable, timestamp: float) -> bytes:
+        """Serializes a snapshot: record header, numeric columns, string indexes, type codes, strings."""
+        strings: Dict[str, int] = {"": 0}
+        indexes = []
+        for column in STRING_COLUMNS:
+            idx = array('I')
+            for value in getattr(table, column):
+                if column == 'cmdline_str' and value and len(value) > MAX_CMDLINE:
+                    value = value[:MAX_CMDLINE]
+                i = strings.get(value or "")
+                if i is None:
+                    i = strings[value] = len(strings)
+                idx.append(i)
+            indexes.append(idx)
+
+        # Strings never contain NUL (cmdlines are NUL-split by the OS), so it is a safe separator
+        blob = "\0".join(strings).encode("utf-8", "replace")
+        parts = [RECORD.pack(timestamp, len(table), len(blob))]
+        parts.extend(getattr(table, column).tobytes() for column, _ in NUMERIC_COLUMNS)
+        parts.extend(idx.tobytes() for idx in indexes)
+        parts.append(bytes(TYPE_CODES.get(t, 0) for t in table.custom_type))
+        parts.append(blob)
+        return b"".join(parts)
+
+    def _evict(self, start: int, end: int) -> None:
+        """Drops the oldest records while they overlap the data range [start, end)."""
+        while self.oldest_seq < self.next_seq:
+            _, _, offset, length = self._slot(self.oldest_seq)
+            if offset < end and start < offset + length:
+                self.oldest_seq += 1
+            else:
+                break
+
+    def append(self, processes: Union[ProcessTable, Iterable[Dict[str, Any]]], timestamp: Optional[float] = None) -> int:
+        """Appends one snapshot (process dicts or a ProcessTable). Returns its sequence number."""
+        if self.readonly:
+            raise PermissionError("History opened read-only")
+        table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_processes(processes)
+        timestamp = time.time() if timestamp is None else timestamp
+        record = self.encode(table, timestamp)
+        if len(record) > self.capacity:
+            raise ValueError(f"Snapshot ({len(record)} bytes) is larger than the history ({self.capacity} bytes)")
+
+        pos = self.write_pos
+        if pos + len(record) > self.capacity:
+            self._evict(pos, self.capacity) # The tail is skipped, so whatever lives there is gone too
+            pos = 0
+        self._evict(pos, pos + len(record))
+        if self.next_seq - self.oldest_seq >= self.slots:
+            self.oldest_seq = self.next_seq - self.slots + 1 # Index full: reuse the oldest slot
+
+        seq = self.next_seq
+        # Invalidate first, then write data, slot and finally the header (readers trust the header)
+        self.write_pos = pos + len(record)
+        self._write_header()
+        self._mm[self._data_start + pos:self._data_start + pos + len(record)] = record
+        SLOT.pack_into(self._mm, HEADER_SIZE + (seq % self.slots) * SLOT.size, timestamp, seq, pos, len(record))
+        self.next_seq = seq + 1
+        self._write_header()
+        return seq
+
+    # --- Reading --------------------------------------------------------------
+
+    def decode(self, offset: int) -> Tuple[float, ProcessTable]:
+        """Loads the record at a data offset into a ProcessTable."""
+        mm = self._mm
+        at = self._data_start + offset
+        timestamp, n, blob_len = RECORD.unpack_from(mm, at)
+        at += RECORD.size
+        table = ProcessTable()
+        for column, code in NUMERIC_COLUMNS:
+            col = array(code)
+            col.frombytes(mm[at:at + n * col.itemsize])
+            setattr(table, column, col)
+            at += n * col.itemsize
+        indexes = []
+        for _ in STRING_COLUMNS:
+            idx = array('I')
+            idx.frombytes(mm[at:at + n * 4])
+            indexes.append(idx)
+            at += n * 4
+        types = mm[at:at + n]
+        at += n
+        strings = mm[at:at + blob_len].decode("utf-8", "replace").split("\0")
+        for column, idx in zip(STRING_COLUMNS, indexes):
+            if column == 'cmdline_str':
+                setattr(table, column, [strings[i] for i in idx])
+            else:
+                setattr(table, column, [strings[i] or None for i in idx])
+        table.custom_type = [TYPE_NAMES[t] for t in types]
+        return timestamp, table
+
+    def load(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[float, ProcessTable]]:
+        """All snapshots recorded between start and end (epoch seconds), oldest first."""
+        snapshots = []
+        for timestamp, seq, offset, _ in self.entries(start, end):
+            snapshot = self._read(seq, offset)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def load_at(self, timestamp: float) -> Optional[Tuple[float, ProcessTable]]:
+        """The last snapshot taken at or before 'timestamp'."""
+        entries = self.entries(end=timestamp)
+        for ts, seq, offset, _ in reversed(entries):
+            snapshot = self._read(seq, offset)
+            if snapshot is not None:
+                return snapshot
+        return None
+
+    def pid_history(self, pid: int, start: Optional[float] = None, end: Optional[float] = None,
+                    create_time: Optional[float] = None) -> List[Tuple[float, int]]:
+        """
+        (timestamp, rss bytes) of one process across the snapshots in [start, end].
+        Recycled PIDs are told apart by create_time: without one, the first process recorded
+        with that PID in the range is followed. Only the pid column and one create_time are read per record.
+        """
+        mm = self._mm
+        history = []
+        for timestamp, seq, offset, _ in self.entries(start, end):
+            if not self._alive(seq):
+                continue
+            at = self._data_start + offset
+            try:
+                n = RECORD.unpack_from(mm, at)[1]
+                columns = at + RECORD.size # pid, ppid, rss, create_time: n * 8 bytes each
+                pids = array('q')
+                pids.frombytes(mm[columns:columns + n * 8])
+                try:
+                    i = pids.index(pid)
+                except ValueError:
+                    continue
+                started = struct.unpack_from('<d', mm, columns + 3 * n * 8 + i * 8)[0]
+                if create_time is None:
+                    create_time = started
+                elif abs(started - create_time) > 0.01:
+                    continue
+                rss = struct.unpack_from('<Q', mm, columns + 2 * n * 8 + i * 8)[0]
+            except (struct.error, ValueError):
+                if self._alive(seq):
+                    raise
+                continue # Overwritten while reading
+            if self._alive(seq):
+                history.append((timestamp, rss))
+        return history
+
+    def close(self) -> None:
+        if not self.readonly:
+            self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> 'SnapshotHistory':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Recorder:
+    """Appends one engine snapshot to a SnapshotHistory every 'interval' seconds."""
+
+    def __init__(self, engine, history: SnapshotHistory):
+        self.engine = engine
+        self.history = history
+        self.last_write_ms = 0.0
+
+    def tick(self) -> int:
+        processes = self.engine.scan_processes(sort=False)
+        started = time.perf_counter()
+        seq = self.history.append(processes)
+        self.last_write_ms = (time.perf_counter() - started) * 1000
+        return seq
+
+    def run(self, interval: float = 1.0, stop: Optional[threading.Event] = None) -> None:
+        """Records until Ctrl+C or until 'stop' is set."""
+        stop = stop or threading.Event()
+        mb = self.history.capacity / (1024 * 1024)
+        print(f"[recorder] {self.history.path}: {mb:.0f} MB ring, interval {interval}s")
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                self.tick()
+                stop.wait(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print(f"[recorder] Stopped. {len(self.history)} snapshots kept.")
@@ -0,0 +1,125 @@
+import heapq
+import threading
+import time
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+
+class MemorySampler:
+    """
+    Background USS/PSS sampling for a local ProcessEngine.
+
+    memory_mb is RSS, which counts shared pages (libraries, copy-on-write memory of forked
+    workers) once per process. USS (private memory) and PSS (shared pages split between their
+    users) are accurate but cost a smaps read per process, so they are never part of a scan:
+    each tick samples the visible rows first, then the largest RSS, then the rest, and stops
+    once 'budget_ms' is spent. Results are cached per (pid, create_time) and re-sampled after
+    'max_age' seconds. Sampled rows get 'uss', 'pss' (bytes, None if denied) and
+    'memory_sampled' (epoch seconds) keys; their memory_str then shows PSS.
+    """
+
+    def __init__(self, engine, budget_ms: float = 20.0, interval: float = 1.0, max_age: float = 30.0,
+                 top: int = 200, visible: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+                 on_sample: Optional[Callable[[], None]] = None):
+        self.engine = engine
+        self.budget_ms = budget_ms
+        self.interval = interval
+        self.max_age = max_age
+        self.top = top
+        self.visible = visible # Rows on screen (sampled first); called from the sampler thread
+        self.on_sample = on_sample # Called after a tick that sampled something
+        # (pid, create_time) -> (uss, pss, sampled at)
+        self._cache: Dict[Tuple[int, float], Tuple[Optional[int], Optional[int], float]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_sampled = 0
+        self.last_tick_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _apply(p_info: Dict[str, Any], entry: Tuple[Optional[int], Optional[int], float]) -> None:
+        uss, pss, sampled = entry
+        dict.update(p_info, uss=uss, pss=pss, memory_sampled=sampled)
+        p_info.pop('memory_str', None) # Re-formatted from PSS on next access
+
+    def age(self, p_info: Dict[str, Any]) -> Optional[float]:
+        """Seconds since the process was sampled (None if it never was)."""
+        entry = self._cache.get(self.engine.process_key(p_info))
+        return time.time() - entry[2] if entry is not None else None
+
+    def sample(self, processes: Iterable[Dict[str, Any]], budget_ms: Optional[float] = None) -> int:
+        """
+        Samples the given rows in order until the budget is spent; rows with a fresh cache entry
+        only get the cached values. Returns the number of processes actually measured.
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        fetch = self.engine.collector.fetch_memory
+        started = time.perf_counter()
+        now = time.time()
+        count = 0
+        for p_info in processes:
+            key = self.engine.process_key(p_info)
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[2] < self.max_age:
+                if p_info.get('memory_sampled') != entry[2]:
+                    self._apply(p_info, entry)
+                continue
+            if time.perf_counter() - started >= budget:
+                break
+            try:
+                data = fetch(p_info['pid'])
+                entry = (data.get('uss'), data.get('pss'), time.time())
+            except psutil.NoSuchProcess:
+                continue
+            except psutil.Error:
+                entry = (None, None, time.time()) # Denied: not retried before max_age
+            self._cache[key] = entry
+            self._apply(p_info, entry)
+            count += 1
+        return count
+
+    def tick(self) -> int:
+        """One budgeted pass over the engine's last snapshot. Returns the number of processes sampled."""
+        started = time.perf_counter()
+        processes = self.engine.snapshot()
+
+        # Forget processes that exited
+        live = {self.engine.process_key(p_info) for p_info in processes}
+        for key in [key for key in self._cache if key not in live]:
+            del self._cache[key]
+
+        # Priority: rows on screen, then the largest RSS (where shared pages distort the most)
+        # Group summaries (grouped GUI list) have a create_time but no pid: only processes are sampled
+        visible = [p_info for p_info in (self.visible() if self.visible else []) if 'pid' in p_info and 'create_time' in p_info]
+        largest = heapq.nlargest(self.top, processes, key=lambda p: p.get('memory_mb', 0.0))
+        # The bookkeeping above counts against the budget too
+        remaining = self.budget_ms - (time.perf_counter() - started) * 1000
+        self.last_sampled = self.sample(chain(visible, largest, processes), budget_ms=max(0.0, remaining))
+        self.last_tick_ms = (time.perf_counter() - started) * 1000
+        if self.last_sampled and self.on_sample is not None:
+            self.on_sample()
+        return self.last_sampled
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Memory sampler error: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self) -> 'MemorySampler':
+        """Runs tick() every 'interval' seconds in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, daemon=True, name="memory-sampler")
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
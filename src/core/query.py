@@ -0,0 +1,282 @@
+import re
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from src.core.search import FuzzyScorer, match_process, normalize_text
+
+Predicate = Callable[[Dict[str, Any]], bool]
+Ranker = Callable[[Dict[str, Any]], int]
+
+
+class QueryError(ValueError):
+    """Raised when a query can't be parsed (bad field value, invalid regex...)."""
+
+
+# Query field -> canonical field
+FIELDS = {
+    'name': 'name', 'user': 'user', 'username': 'user', 'exe': 'exe', 'path': 'exe',
+    'cmd': 'cmd', 'cmdline': 'cmd', 'type': 'type', 'pid': 'pid', 'ppid': 'ppid',
+    'mem': 'mem', 'memory': 'mem', 'cpu': 'cpu', 'uptime': 'uptime',
+}
+TEXT_FIELDS = {'name': 'name', 'user': 'username', 'exe': 'exe', 'cmd': 'cmdline_str'}
+NUMERIC_FIELDS = ('pid', 'ppid', 'mem', 'cpu', 'uptime')
+FIELD_KEYS = {'type': 'custom_type', 'pid': 'pid', 'ppid': 'ppid', 'mem': 'memory_mb',
+              'cpu': 'cpu_percent', 'uptime': 'create_time'}
+TYPES = {'app': "App", 'service': "Service"}
+
+MEMORY_UNITS = {'b': 1 / (1024 * 1024), 'k': 1 / 1024, 'kb': 1 / 1024, 'm': 1, 'mb': 1,
+                'g': 1024, 'gb': 1024, 't': 1024 * 1024, 'tb': 1024 * 1024}
+TIME_UNITS = {'': 1, 's': 1, 'm': 60, 'min': 60, 'h': 3600, 'd': 86400}
+
+# Evaluation order: cheapest filters first
+COST_TYPE, COST_NUMERIC, COST_TEXT, COST_REGEX = 0, 1, 2, 3
+
+_TOKEN_RE = re.compile(r'^([!-])?([a-z]+)(>=|<=|:|~|>|<|=)(.*)$', re.IGNORECASE | re.DOTALL)
+_SPLIT_RE = re.compile(r'(?:"[^"]*"|\'[^\']*\'|\S)+')
+_AMOUNT_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([a-z%]*)\s*$', re.IGNORECASE)
+
+
+class Term:
+    """One parsed filter: field, operator, raw value and negation."""
+
+    def __init__(self, field: Optional[str], op: str, value: str, negate: bool = False):
+        self.field = field # None = free text (name/cmdline/exe/PID prefix, like a plain search)
+        self.op = op
+        self.value = value
+        self.negate = negate
+
+    def __repr__(self) -> str:
+        return f"Term({'!' if self.negate else ''}{self.field or '*'}{self.op}{self.value!r})"
+
+
+class Query:
+    """
+    Parsed query. Syntax (whitespace-separated terms, all must match):
+      java                 free text in name / cmdline / exe, or PID prefix (fuzzy in interactive search)
+      name:java            substring of one field (name, user, exe/path, cmd/cmdline)
+      cmd~/-Xmx\\d+g/      regular expression (case-insensitive, slashes optional)
+      mem>500MB  cpu>=10   comparisons on mem (B/KB/MB/GB, default MB), cpu (%), pid, ppid
+      uptime>1h            process age (s/m/h/d, default seconds)
+      type:service         App or Service
+      -name:chrome         '-' or '!' negates a term
+    Quotes group values with spaces: cmd:"-jar app.jar".
+    A query without any field term is one plain search, so "java -jar" keeps working as before.
+    """
+
+    def __init__(self, terms: List[Term], text: str = ""):
+        self.terms = terms
+        self.text = text
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def __repr__(self) -> str:
+        return f"Query({self.terms!r})"
+
+    def fields(self) -> Set[str]:
+        """Process dict keys the query reads (lets the engine skip collecting the others)."""
+        needed = set()
+        for term in self.terms:
+            if term.field is None:
+                needed.update(('pid', 'name', 'cmdline_str', 'exe'))
+            elif term.field in TEXT_FIELDS:
+                needed.add(TEXT_FIELDS[term.field])
+            else:
+                needed.add(FIELD_KEYS[term.field])
+        return needed
+
+    def compile(self, search: Optional[Callable[[str], Set[Hashable]]] = None,
+                key: Optional[Callable[[Dict[str, Any]], Hashable]] = None, fuzzy: bool = False) -> Predicate:
+        """
+        Builds a single predicate for all the terms, cheapest checks first.
+        With 'search' (an index lookup returning process keys) and 'key', free-text terms are
+        resolved once through the index instead of being matched process by process.
+        With 'fuzzy', free text also matches subsequences and typos of names ('search' must then
+        be a fuzzy lookup, e.g. SearchIndex.fuzzy).
+        """
+        now = time.time() # Uptime thresholds are fixed when the query is compiled
+        checks = sorted((_compile_term(term, now, search, key, fuzzy) for term in self.terms), key=lambda c: c[0])
+        funcs = [func for _, func in checks]
+
+        if not funcs:
+            return lambda p: True
+        if len(funcs) == 1:
+            return funcs[0]
+
+        def predicate(p: Dict[str, Any]) -> bool:
+            for func in funcs:
+                if not func(p):
+                    return False
+            return True
+        return predicate
+
+
+    def candidates(self, search: Callable[[str], Set[Hashable]]) -> Optional[Set[Hashable]]:
+        """
+        Keys of the only processes that can match, from the index lookups of the positive text
+        terms (None: any process may). Same lookups as compile(), so a memoized 'search' is hit once.
+        """
+        keys = None
+        for term in self.terms:
+            if term.negate or term.op not in (":", "=") or term.field not in (None, 'name', 'exe', 'cmd'):
+                continue
+            needle = normalize_text(term.value)
+            if not needle:
+                continue
+            found = search(needle)
+            keys = found if keys is None else {k for k in keys if k in found}
+        return keys
+
+    def ranker(self, search: Optional[Callable[[str], Dict[Hashable, int]]] = None,
+               key: Optional[Callable[[Dict[str, Any]], Hashable]] = None) -> Ranker:
+        """
+        Relevance of a process for the free-text terms (higher first; always 0 without free text).
+        'search' is the same fuzzy lookup given to compile(), so each term is only looked up once.
+        """
+        needles = [normalize_text(term.value) for term in self.terms if term.field is None and term.op != "~"]
+        if not needles:
+            return lambda p: 0
+        if search is not None and key is not None:
+            tables = [search(needle) for needle in needles]
+            if len(tables) == 1:
+                table = tables[0]
+                return lambda p: table.get(key(p), 0)
+            return lambda p: sum(table.get(key(p), 0) for table in tables)
+        scorers = [FuzzyScorer(needle) for needle in needles]
+        return lambda p: sum(scorer.score(p) for scorer in scorers)
+
+
+def parse_query(text: Optional[str]) -> Query:
+    """Parses a query string. Raises QueryError on malformed field terms."""
+    text = (text or "").strip()
+    if not text:
+        return Query([], text)
+
+    # Quotes group words but, unlike shlex, backslashes are kept for regexes
+    tokens = [re.sub(r'"([^"]*)"|\'([^\']*)\'', lambda m: m.group(1) or m.group(2) or "", token)
+              for token in _SPLIT_RE.findall(text)]
+
+    terms: List[Optional[Term]] = []
+    structured = False
+    for token in tokens:
+        m = _TOKEN_RE.match(token)
+        field = FIELDS.get(m.group(2).lower()) if m else None
+        if field is None:
+            terms.append(None)
+            continue
+        negate, _, op, value = m.groups()
+        if not value:
+            raise QueryError(f"Missing value for '{m.group(2)}'")
+        terms.append(Term(field, op, value, bool(negate)))
+        structured = True
+
+    if not structured:
+        # Plain search: keep the whole string as one term, spaces included
+        return Query([Term(None, ":", text)], text)
+
+    free = [token for token, term in zip(tokens, terms) if term is None]
+    parsed = [term for term in terms if term is not None]
+    if free:
+        parsed.append(Term(None, ":", " ".join(free)))
+    return Query(parsed, text)
+
+
+def _parse_amount(term: Term, units: Dict[str, float], default_unit: str) -> float:
+    m = _AMOUNT_RE.match(term.value)
+    unit = (m.group(2).lower() if m else "") or default_unit
+    if not m or unit not in units:
+        raise QueryError(f"Invalid value for {term.field}: '{term.value}'")
+    return float(m.group(1)) * units[unit]
+
+
+def _compare(op: str, threshold: float, negate: bool, getter: Callable[[Dict[str, Any]], float]) -> Predicate:
+    if op == ">":
+        test = lambda p: getter(p) > threshold
+    elif op == "<":
+        test = lambda p: getter(p) < threshold
+    elif op == ">=":
+        test = lambda p: getter(p) >= threshold
+    elif op == "<=":
+        test = lambda p: getter(p) <= threshold
+    else: # ':' and '=' mean equality for numbers
+        test = lambda p: getter(p) == threshold
+    return (lambda p: not test(p)) if negate else test
+
+
+def _compile_term(term: Term, now: float, search: Optional[Callable[[str], Set[Hashable]]],
+                  key: Optional[Callable[[Dict[str, Any]], Hashable]], fuzzy: bool = False) -> Tuple[int, Predicate]:
+    """Returns (cost, predicate) for one term."""
+    field, op, negate = term.field, term.op, term.negate
+
+    if field == 'type':
+        wanted = TYPES.get(term.value.lower())
+        if wanted is None or op not in (":", "="):
+            raise QueryError(f"type must be 'app' or 'service', got '{term.value}'")
+        if negate:
+            return COST_TYPE, lambda p: p.get('custom_type', "App") != wanted
+        return COST_TYPE, lambda p: p.get('custom_type', "App") == wanted
+
+    if field in NUMERIC_FIELDS:
+        if op == "~":
+            raise QueryError(f"'~' only applies to text fields, not {field}")
+        if field == 'mem':
+            return COST_NUMERIC, _compare(op, _parse_amount(term, MEMORY_UNITS, "mb"), negate,
+                                          lambda p: p.get('memory_mb', 0.0))
+        if field == 'cpu':
+            return COST_NUMERIC, _compare(op, _parse_amount(term, {'': 1, '%': 1}, "%"), negate,
+                                          lambda p: p.get('cpu_percent', 0.0))
+        if field == 'uptime':
+            age = _parse_amount(term, TIME_UNITS, "")
+            return COST_NUMERIC, _compare(op, age, negate, lambda p: now - (p.get('create_time') or now))
+        try:
+            number = int(term.value)
+        except ValueError:
+            raise QueryError(f"{field} must be an integer, got '{term.value}'")
+        column = 'pid' if field == 'pid' else 'ppid'
+        return COST_NUMERIC, _compare(op, number, negate, lambda p: p.get(column) or 0)
+
+    if op == "~":
+        pattern = term.value
+        if len(pattern) >= 2 and pattern.startswith("/") and pattern.endswith("/"):
+            pattern = pattern[1:-1]
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise QueryError(f"Invalid regex '{pattern}': {e}")
+        if field is None:
+            test = lambda p: any(regex.search(p.get(f) or "") for f in ('name', 'cmdline_str', 'exe'))
+        else:
+            column = TEXT_FIELDS[field]
+            test = lambda p: regex.search(p.get(column) or "") is not None
+        return COST_REGEX, (lambda p: not test(p)) if negate else test
+
+    if op not in (":", "="):
+        raise QueryError(f"'{op}' only applies to numeric fields, not {field or 'text'}")
+    needle = normalize_text(term.value)
+    if field is None:
+        if search is not None and key is not None:
+            # Resolved once through the index: per-process cost is a set lookup
+            keys = search(needle)
+            test = lambda p: key(p) in keys
+            cost = COST_NUMERIC
+        elif fuzzy:
+            scorer = FuzzyScorer(needle)
+            test = lambda p: scorer.score(p) > 0
+            cost = COST_TEXT
+        else:
+            test = lambda p: match_process(needle, p)
+            cost = COST_TEXT
+    else:
+        column = TEXT_FIELDS[field]
+        if op == "=":
+            check = lambda p: normalize_text(p.get(column)) == needle
+        else:
+            check = lambda p: needle in normalize_text(p.get(column))
+        if search is not None and key is not None and field != 'user' and needle:
+            # The index finds the processes containing the text in any field; only those are checked
+            keys = search(needle)
+            test = lambda p: key(p) in keys and check(p)
+        else:
+            test = check
+        cost = COST_TEXT
+    return cost, (lambda p: not test(p)) if negate else test
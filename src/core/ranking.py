@@ -0,0 +1,58 @@
+import heapq
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+
+class RankedResults:
+    """
+    Read-only sequence of processes in ranked order, produced lazily with a heap.
+    Building it is O(n) (heapify); reading the first k items costs O(k log n),
+    so showing one page of thousands of processes never pays for a full sort.
+    Further pages continue from the same heap without re-sorting.
+    """
+
+    def __init__(self, entries: List[Tuple[Any, ...]]):
+        """
+        'entries' are decorated tuples (sort keys..., tie-breaker index, process): flat tuples
+        compare faster than nested key tuples. The unique index means processes are never compared.
+        """
+        self._heap = entries
+        heapq.heapify(self._heap)
+        self._ranked: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._ranked) + len(self._heap)
+
+    def _fill(self, count: int) -> None:
+        heap = self._heap
+        ranked = self._ranked
+        while len(ranked) < count and heap:
+            ranked.append(heapq.heappop(heap)[-1])
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        """First k processes in ranked order."""
+        self._fill(k)
+        return self._ranked[:k]
+
+    def page(self, number: int, size: int) -> List[Dict[str, Any]]:
+        """Page 'number' (0-based) of 'size' items."""
+        self._fill((number + 1) * size)
+        return self._ranked[number * size:(number + 1) * size]
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            self._fill(stop)
+            return self._ranked[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        self._fill(index + 1)
+        return self._ranked[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        i = 0
+        while i < len(self):
+            self._fill(i + 1)
+            yield self._ranked[i]
+            i += 1
@@ -0,0 +1,237 @@
+import unicodedata
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+
+from src.core.fuzzy import (SCORE_HAYSTACK, SCORE_PID, char_mask, exe_basename, match_term, max_typos, score_term,
+                            term_words, typo_distance, typo_score)
+
+
+def normalize_text(text: Any) -> str:
+    """Removes accents and converts to lowercase (search haystacks and fuzzy terms)."""
+    if not text: return ""
+    text = str(text)
+    if text.isascii():  # Fast path: nothing to decompose
+        return text.lower()
+    return ''.join(c for c in unicodedata.normalize('NFD', text)
+                   if unicodedata.category(c) != 'Mn').lower()
+
+
+def match_process(query: str, p_info: Dict[str, Any]) -> bool:
+    """
+    Single-process version of SearchIndex.search (for streaming, before any index exists).
+    'query' must already be normalized.
+    """
+    if not query:
+        return True
+    if query.isdigit() and str(p_info['pid']).startswith(query):
+        return True
+    return (query in normalize_text(p_info.get('name')) or
+            query in normalize_text(p_info.get('cmdline_str')) or
+            query in normalize_text(p_info.get('exe')))
+
+
+class FuzzyScorer:
+    """
+    Single-process version of SearchIndex.fuzzy (streaming, rows from a daemon).
+    Term scores are cached, so the many processes sharing a name cost one dict lookup each.
+    """
+
+    def __init__(self, query: str):
+        self.query = normalize_text(query)
+        self.mask = char_mask(self.query)
+        self._cache: Dict[str, int] = {}
+
+    def score_term(self, term: str) -> int:
+        score = self._cache.get(term)
+        if score is None:
+            score = self._cache[term] = score_term(self.query, term, self.mask, char_mask(term))
+        return score
+
+    def score(self, p_info: Dict[str, Any]) -> int:
+        """0 if the process doesn't match at all."""
+        query = self.query
+        if not query:
+            return 1
+        if query.isdigit() and str(p_info['pid']).startswith(query):
+            return SCORE_PID
+        exe = normalize_text(p_info.get('exe'))
+        best = max(self.score_term(normalize_text(p_info.get('name'))), self.score_term(exe_basename(exe)))
+        if best < SCORE_HAYSTACK and (query in normalize_text(p_info.get('cmdline_str')) or query in exe):
+            best = SCORE_HAYSTACK
+        return best
+
+
+class SearchIndex:
+    """
+    Trigram index over pre-normalized process haystacks (name, cmdline, exe).
+    Maintained incrementally: processes are added/removed as the engine snapshot changes,
+    so normalization only ever runs once per process.
+    Also keeps the distinct short terms (names, exe basenames) with their character masks
+    for fuzzy ranking: thousands of processes usually share a few hundred of them.
+    """
+    GRAM = 3
+
+    def __init__(self):
+        self._haystacks: Dict[Hashable, str] = {}
+        self._pids: Dict[Hashable, str] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        # Fuzzy terms: term -> keys having it as name or exe basename, grouped by character mask
+        # (far fewer masks than terms, so the pruning pass is one check per mask)
+        self._terms: Dict[str, Set[Hashable]] = {}
+        self._masks: Dict[int, Set[str]] = {}
+        # Words of the terms (typos are matched per distinct word), also grouped by character mask
+        self._words: Dict[str, Set[str]] = {}
+        self._word_masks: Dict[int, Set[str]] = {}
+        self._key_terms: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._haystacks)
+
+    def _grams(self, text: str) -> Set[str]:
+        n = self.GRAM
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def add(self, key: Hashable, p_info: Dict[str, Any]) -> None:
+        """
+        Indexes one process under the given key (again after its deferred cmdline/exe are loaded).
+        Only values already collected are read: a deferred row is indexed on its name and PID.
+        """
+        if key in self._haystacks:
+            self.remove(key)
+        name = normalize_text(dict.get(p_info, 'name'))
+        exe = normalize_text(dict.get(p_info, 'exe'))
+        # Newline never appears in a query, so matches can't span two fields
+        haystack = "\n".join((name, normalize_text(dict.get(p_info, 'cmdline_str')), exe))
+        self._haystacks[key] = haystack
+        self._pids[key] = str(p_info['pid'])
+        postings = self._postings
+        for gram in self._grams(haystack):
+            bucket = postings.get(gram)
+            if bucket is None:
+                postings[gram] = {key}
+            else:
+                bucket.add(key)
+
+        terms = tuple({term for term in (name, exe_basename(exe)) if term})
+        self._key_terms[key] = terms
+        for term in terms:
+            keys = self._terms.get(term)
+            if keys is None:
+                self._terms[term] = {key}
+                self._masks.setdefault(char_mask(term), set()).add(term)
+                for word in term_words(term):
+                    terms_of_word = self._words.get(word)
+                    if terms_of_word is None:
+                        self._words[word] = {term}
+                        self._word_masks.setdefault(char_mask(word), set()).add(word)
+                    else:
+                        terms_of_word.add(term)
+            else:
+                keys.add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Drops one process from the index (no-op if unknown)."""
+        haystack = self._haystacks.pop(key, None)
+        if haystack is None:
+            return
+        del self._pids[key]
+        for term in self._key_terms.pop(key, ()):
+            keys = self._terms[term]
+            keys.discard(key)
+            if not keys:
+                del self._terms[term]
+                mask = char_mask(term)
+                self._masks[mask].discard(term)
+                if not self._masks[mask]:
+                    del self._masks[mask]
+                for word in term_words(term):
+                    terms_of_word = self._words[word]
+                    terms_of_word.discard(term)
+                    if not terms_of_word:
+                        del self._words[word]
+                        mask = char_mask(word)
+                        self._word_masks[mask].discard(word)
+                        if not self._word_masks[mask]:
+                            del self._word_masks[mask]
+        postings = self._postings
+        for gram in self._grams(haystack):
+            bucket = postings.get(gram)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del postings[gram]
+
+    def search(self, query: str) -> Set[Hashable]:
+        """
+        Returns the keys whose name/cmdline/exe contain the query or whose PID starts with it.
+        Only candidates sharing every trigram of the query are checked.
+        """
+        query = normalize_text(query)
+        if not query:
+            return set(self._haystacks)
+        matches = self._containing(query)
+        if query.isdigit():
+            matches.update(self._pid_prefixed(query))
+        return matches
+
+    def _containing(self, query: str) -> Set[Hashable]:
+        """Keys whose haystack contains the (normalized, non-empty) query."""
+        if len(query) < self.GRAM:
+            candidates: Iterable[Hashable] = self._haystacks
+        else:
+            buckets = []
+            for gram in self._grams(query):
+                bucket = self._postings.get(gram)
+                if not bucket:
+                    buckets = []
+                    break
+                buckets.append(bucket)
+            buckets.sort(key=len)
+            candidates = set(buckets[0]).intersection(*buckets[1:]) if buckets else ()
+
+        haystacks = self._haystacks
+        return {key for key in candidates if query in haystacks[key]}
+
+    def _pid_prefixed(self, query: str) -> List[Hashable]:
+        return [key for key, pid in self._pids.items() if pid.startswith(query)]
+
+    def fuzzy(self, query: str) -> Dict[Hashable, int]:
+        """
+        Keys matching the query fuzzily, with their relevance (see src.core.fuzzy).
+        Distinct terms are pruned by character mask before scoring; exact substrings of the
+        command line / path come from the trigram index.
+        """
+        query = normalize_text(query)
+        if not query:
+            return dict.fromkeys(self._haystacks, 1)
+
+        scores: Dict[Hashable, int] = dict.fromkeys(self._containing(query), SCORE_HAYSTACK)
+        if query.isdigit():
+            scores.update(dict.fromkeys(self._pid_prefixed(query), SCORE_PID))
+
+        query_mask = char_mask(query)
+        best: Dict[str, int] = {} # Term -> score
+        for mask, terms in self._masks.items():
+            if query_mask & ~mask:
+                continue # Cheap pass: substrings and subsequences need every letter of the query
+            for term in terms:
+                score = match_term(query, term)
+                if score:
+                    best[term] = score
+        limit = max_typos(query)
+        if limit:
+            # Typos are checked once per distinct word, not once per term sharing it
+            for mask, words in self._word_masks.items():
+                if (query_mask & ~mask).bit_count() > limit:
+                    continue # Each letter missing from the word costs at least one edit
+                for word in words:
+                    distance = typo_distance(query, word, limit)
+                    if distance <= limit:
+                        score = typo_score(distance)
+                        for term in self._words[word]:
+                            if best.get(term, 0) < score:
+                                best[term] = score
+        for term, score in best.items():
+            for key in self._terms[term]:
+                if scores.get(key, 0) < score:
+                    scores[key] = score
+        return scores
@@ -0,0 +1,103 @@
+import heapq
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ScanStats:
+    """
+    Lightweight instrumentation for ProcessEngine scans.
+    Scan durations and error counters are always kept (a few operations per scan);
+    per-phase timers and the slowest-PID list are only collected when enabled.
+    """
+    # Upper bounds (ms) of the scan duration histogram buckets; the last bucket is open-ended
+    HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, enabled: bool = False, slowest: int = 10):
+        self.enabled = enabled
+        self.slowest_n = slowest
+        self.scans = 0
+        self.total_seconds = 0.0
+        self.last_seconds = 0.0
+        self.histogram = [0] * (len(self.HISTOGRAM_BOUNDS_MS) + 1)
+        self.last_error: Optional[str] = None
+        self._reset_scan()
+
+    def _reset_scan(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {'processes': 0, 'new': 0, 'denied': 0, 'vanished': 0, 'zombie': 0, 'errors': 0}
+        self._slowest: List[Tuple[float, int, str]] = []
+
+    def begin_scan(self) -> float:
+        self._reset_scan()
+        return time.perf_counter()
+
+    def end_scan(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.scans += 1
+        self.total_seconds += elapsed
+        self.last_seconds = elapsed
+
+        elapsed_ms = elapsed * 1000
+        for i, bound in enumerate(self.HISTOGRAM_BOUNDS_MS):
+            if elapsed_ms <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_error(self, error: Exception) -> None:
+        self.counters['errors'] += 1
+        self.last_error = str(error)
+
+    def record_process(self, seconds: float, pid: int, name: str) -> None:
+        """Keeps the N processes that were slowest to collect (min-heap)."""
+        item = (seconds, pid, name or "")
+        if len(self._slowest) < self.slowest_n:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns all statistics as plain data."""
+        labels = [f"<={b}ms" for b in self.HISTOGRAM_BOUNDS_MS] + [f">{self.HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            'enabled': self.enabled,
+            'scans': self.scans,
+            'last_ms': self.last_seconds * 1000,
+            'avg_ms': self.total_seconds / self.scans * 1000 if self.scans else 0.0,
+            'phases_ms': {name: seconds * 1000 for name, seconds in self.phases.items()},
+            'counters': dict(self.counters),
+            'slowest': [{'pid': pid, 'name': name, 'ms': seconds * 1000}
+                        for seconds, pid, name in sorted(self._slowest, reverse=True)],
+            'histogram': dict(zip(labels, self.histogram)),
+            'last_error': self.last_error,
+        }
+
+    def format_report(self) -> str:
+        """Plain-text report (used by --profile)."""
+        data = self.snapshot()
+        lines = [f"Scans: {data['scans']}   last: {data['last_ms']:.1f} ms   avg: {data['avg_ms']:.1f} ms"]
+        c = data['counters']
+        lines.append(f"Last scan: {c['processes']} processes, {c['new']} new, {c['denied']} denied, "
+                     f"{c['vanished']} vanished, {c['zombie']} zombie, {c['errors']} errors")
+        if data['phases_ms']:
+            lines.append("Phases (last scan):")
+            for name, ms in data['phases_ms'].items():
+                lines.append(f"  {name:<10}{ms:>10.2f} ms")
+        if data['slowest']:
+            lines.append("Slowest to collect (last scan):")
+            for entry in data['slowest']:
+                lines.append(f"  {entry['pid']:>8}  {entry['name']:<25}{entry['ms']:>8.2f} ms")
+        lines.append("Scan duration histogram:")
+        for label, n in data['histogram'].items():
+            if n:
+                lines.append(f"  {label:>10}  {n}")
+        if data['last_error']:
+            lines.append(f"Last error: {data['last_error']}")
+        return "\n".join(lines)
@@ -0,0 +1,125 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class ProcessView:
+    """
+    Lightweight row of a ProcessTable.
+    Behaves like the dicts returned by ProcessEngine.scan_processes (p['name'], p.get('username')...)
+    but only stores a reference to the table and a row index.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'ProcessTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        table = self._table
+        i = self._index
+        column = table.COLUMNS.get(key)
+        if column is not None:
+            return getattr(table, column)[i]
+
+        # Derived fields, computed on access instead of being stored per row
+        if key == 'memory_mb':
+            return table.rss[i] / (1024 * 1024)
+        # The engine (and psutil) is only imported here: reading a recorded history doesn't need it
+        if key == 'memory_str':
+            from src.core.engine import ProcessEngine
+            return ProcessEngine.format_bytes(table.rss[i])
+        if key == 'uptime_str':
+            from src.core.engine import ProcessEngine
+            return ProcessEngine.get_uptime(table.create_time[i])
+        if key == 'memory_info':
+            from src.core.collectors import pmem
+            return pmem(table.rss[i], 0, 0, 0, 0, 0, 0) # Only RSS is kept
+        if key == 'cmdline':
+            cmd = table.cmdline_str[i]
+            return cmd.split(" ") if cmd else []
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._table.COLUMNS or key in ProcessTable.DERIVED
+
+    def keys(self) -> List[str]:
+        return list(ProcessTable.COLUMNS) + list(ProcessTable.DERIVED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"ProcessView(pid={self['pid']}, name={self['name']!r})"
+
+
+class ProcessTable:
+    """
+    Compact columnar process snapshot.
+    Numeric columns live in typed arrays; repeated strings (names, users, paths, cmdlines)
+    are interned so identical values across rows share one object.
+    """
+    # Key exposed by the row view -> attribute holding the column
+    COLUMNS = {
+        'pid': 'pid', 'ppid': 'ppid', 'create_time': 'create_time', 'rss': 'rss',
+        'cpu_percent': 'cpu_percent', 'name': 'name', 'username': 'username', 'exe': 'exe',
+        'cmdline_str': 'cmdline_str', 'custom_type': 'custom_type',
+    }
+    DERIVED = ('memory_mb', 'memory_str', 'uptime_str', 'memory_info', 'cmdline')
+
+    def __init__(self):
+        self.pid = array('q')
+        self.ppid = array('q')
+        self.rss = array('Q')
+        self.create_time = array('d')
+        self.cpu_percent = array('f')
+        self.name: List[Optional[str]] = []
+        self.username: List[Optional[str]] = []
+        self.exe: List[Optional[str]] = []
+        self.cmdline_str: List[str] = []
+        self.custom_type: List[str] = []
+
+    @staticmethod
+    def _intern(value: Optional[str]) -> Optional[str]:
+        return sys.intern(value) if value else value
+
+    def append(self, p_info: Dict[str, Any]) -> None:
+        """Adds one process dict (as produced by ProcessEngine) to the table."""
+        memory_info = p_info.get('memory_info')
+        self.pid.append(p_info['pid'])
+        self.ppid.append(p_info.get('ppid') or 0)
+        self.rss.append(memory_info.rss if memory_info is not None else 0)
+        self.create_time.append(p_info.get('create_time') or 0.0)
+        self.cpu_percent.append(p_info.get('cpu_percent') or 0.0)
+        self.name.append(self._intern(p_info.get('name')))
+        self.username.append(self._intern(p_info.get('username')))
+        self.exe.append(self._intern(p_info.get('exe')))
+        self.cmdline_str.append(self._intern(p_info.get('cmdline_str') or ""))
+        self.custom_type.append(self._intern(p_info.get('custom_type') or "App"))
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[Dict[str, Any]]) -> 'ProcessTable':
+        table = cls()
+        for p_info in processes:
+            table.append(p_info)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def __getitem__(self, index: int) -> ProcessView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ProcessView(self, index)
+
+    def __iter__(self) -> Iterator[ProcessView]:
+        for i in range(len(self)):
+            yield ProcessView(self, i)
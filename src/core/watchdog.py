@@ -0,0 +1,189 @@
+import fnmatch
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.engine import ProcessEngine
+
+
+class Rule:
+    """
+    One compiled watchdog rule. Every condition that is set must hold:
+      process        exact name ("java") or glob ("python3*"), case-insensitive
+      cmdline / exe  regular expressions (searched, case-insensitive)
+      min_memory_mb  RSS threshold
+      min_uptime     seconds since the process started
+      sustained      seconds the conditions must keep holding before acting
+      type           "app" or "service" (Services are only ever matched when asked for explicitly)
+    At least one selector (process, cmdline, exe or min_memory_mb) is required: uptime, sustained
+    and type alone would match every process of that type.
+    """
+    FIELDS = ('name', 'process', 'cmdline', 'exe', 'min_memory_mb', 'min_uptime', 'sustained', 'type')
+
+    def __init__(self, name: str, process: Optional[str] = None, cmdline: Optional[str] = None,
+                 exe: Optional[str] = None, min_memory_mb: float = 0, min_uptime: float = 0,
+                 sustained: float = 0, type: Optional[str] = None):
+        self.name = name
+        self.process = process.lower() if process else None
+        # Exact names go into the name index; globs have to be checked against every process
+        self.is_exact = bool(self.process) and not any(c in self.process for c in "*?[")
+        self.name_re = re.compile(fnmatch.translate(self.process)) if self.process and not self.is_exact else None
+        self.cmdline_re = re.compile(cmdline, re.IGNORECASE) if cmdline else None
+        self.exe_re = re.compile(exe, re.IGNORECASE) if exe else None
+        self.min_memory_mb = float(min_memory_mb)
+        self.min_uptime = float(min_uptime)
+        self.sustained = float(sustained)
+        self.type = {"app": "App", "service": "Service"}.get((type or "app").lower())
+        if self.type is None:
+            raise ValueError(f"Rule '{name}': type must be 'app' or 'service'")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rule':
+        """Builds a rule from its JSON object; unknown or missing fields raise a ValueError naming the rule."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Rule must be a JSON object, got {data!r}")
+        name = data.get('name')
+        unknown = [key for key in data if key not in cls.FIELDS]
+        if unknown:
+            raise ValueError(f"Rule '{name or '?'}': unknown field(s) {', '.join(map(str, unknown))} "
+                             f"(expected: {', '.join(cls.FIELDS)})")
+        if not name:
+            raise ValueError(f"Rule without a 'name': {data!r}")
+        rule = cls(**data)
+        if not (rule.process or rule.cmdline_re or rule.exe_re or rule.min_memory_mb > 0):
+            raise ValueError(f"Rule '{name}': needs at least one of 'process', 'cmdline', 'exe' or 'min_memory_mb'")
+        return rule
+
+    def matches(self, p_info: Dict[str, Any], now: float) -> bool:
+        """Checks the cheap numeric conditions first, regexes last."""
+        if p_info.get('custom_type') != self.type:
+            return False
+        if p_info['memory_mb'] < self.min_memory_mb:
+            return False
+        if self.min_uptime and now - p_info['create_time'] < self.min_uptime:
+            return False
+        if self.name_re is not None and not self.name_re.match((p_info.get('name') or "").lower()):
+            return False
+        if self.exe_re is not None and not self.exe_re.search(p_info.get('exe') or ""):
+            return False
+        if self.cmdline_re is not None and not self.cmdline_re.search(p_info.get('cmdline_str') or ""):
+            return False
+        return True
+
+
+class Watchdog:
+    """
+    Evaluates rules against periodic engine snapshots and terminates the matches.
+    Rules are indexed by exact process name, so each process is only checked against
+    the rules for its own name plus the rules without an exact name.
+    """
+
+    def __init__(self, engine: ProcessEngine, rules: List[Rule], dry_run: bool = False,
+                 audit_log: Optional[str] = None):
+        self.engine = engine
+        self.rules = rules
+        self.dry_run = dry_run
+        self.audit_log = audit_log
+        self.by_name: Dict[str, List[Rule]] = {}
+        self.generic: List[Rule] = []
+        for rule in rules:
+            if rule.is_exact:
+                self.by_name.setdefault(rule.process, []).append(rule)
+            else:
+                self.generic.append(rule)
+        # (rule name, process key) -> time the rule started matching
+        self._since: Dict[Tuple[str, Tuple[int, float]], float] = {}
+        self._reported: set = set()
+
+    @staticmethod
+    def load_rules(path: str) -> List[Rule]:
+        """Reads rules from a JSON file: {"rules": [{...}, ...]} or a bare list."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('rules', [])
+        return [Rule.from_dict(entry) for entry in data]
+
+    def evaluate(self, processes: List[Dict[str, Any]], now: float) -> List[Tuple[Rule, Dict[str, Any]]]:
+        """Returns the (rule, process) pairs whose conditions have held for the sustained duration."""
+        own_pid = os.getpid()
+        since: Dict[Tuple[str, Tuple[int, float]], float] = {}
+        due = []
+        for p_info in processes:
+            if p_info['pid'] == own_pid:
+                continue
+            rules = self.by_name.get((p_info.get('name') or "").lower())
+            candidates = rules + self.generic if rules else self.generic
+            for rule in candidates:
+                if not rule.matches(p_info, now):
+                    continue
+                state_key = (rule.name, self.engine.process_key(p_info))
+                started = self._since.get(state_key, now)
+                since[state_key] = started
+                if now - started >= rule.sustained:
+                    due.append((rule, p_info))
+                    break # One rule is enough to act on a process
+        # Conditions that stopped holding (or processes that exited) reset their timer
+        self._since = since
+        return due
+
+    def _audit(self, entry: Dict[str, Any]) -> None:
+        print(f"[watchdog] {entry['action']}: {entry['name']} (PID: {entry['pid']}) "
+              f"rule={entry['rule']} mem={entry['memory_mb']:.1f} MB - {entry.get('message', '')}")
+        if self.audit_log:
+            with open(self.audit_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def tick(self) -> List[Dict[str, Any]]:
+        """One scan + evaluation + termination pass. Returns the audit entries written."""
+        processes = self.engine.scan_processes(sort=False)
+        now = time.time()
+        due = self.evaluate(processes, now)
+
+        entries = []
+        for rule, p_info in due:
+            entries.append({
+                'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'rule': rule.name,
+                'pid': p_info['pid'],
+                'name': p_info.get('name'),
+                'memory_mb': round(p_info['memory_mb'], 1),
+                'uptime': round(now - p_info['create_time']),
+                'cmdline': p_info.get('cmdline_str'),
+            })
+
+        if self.dry_run:
+            # Report each match once instead of on every tick
+            pending = []
+            for entry, (rule, p_info) in zip(entries, due):
+                key = (rule.name, self.engine.process_key(p_info))
+                if key not in self._reported:
+                    self._reported.add(key)
+                    entry.update(action="dry-run", message="would be terminated")
+                    pending.append(entry)
+            entries = pending
+            self._reported &= self._since.keys() # Forget exited processes and conditions that stopped holding
+        elif entries:
+            results = self.engine.kill_processes([entry['pid'] for entry in entries])
+            for entry, res in zip(entries, results):
+                entry.update(action="kill", success=res['success'], message=res['message'])
+
+        for entry in entries:
+            self._audit(entry)
+        return entries
+
+    def run(self, interval: float = 5.0, stop: Optional[threading.Event] = None) -> None:
+        """Ticks every 'interval' seconds until Ctrl+C or until 'stop' is set."""
+        stop = stop or threading.Event()
+        mode = "DRY-RUN" if self.dry_run else "ACTIVE"
+        print(f"[watchdog] {mode}: {len(self.rules)} rule(s), interval {interval}s")
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                self.tick()
+                stop.wait(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print("[watchdog] Stopped.")
@@ -1,29 +1,31 @@
 import customtkinter as ctk
 import threading
-import unicodedata
 from tkinter import messagebox
 import os
 
+from src.core.daemon import connect_engine
 from src.core.engine import ProcessEngine
-from src.gui.widgets import ProcessRow
-
-# Configuration
-ctk.set_appearance_mode("Dark")
-ctk.set_default_color_theme("blue")
-
-def normalize_text(text):
-    """Removes accents and converts to lowercase for fuzzy matching."""
-    if not text: return ""
-    return ''.join(c for c in unicodedata.normalize('NFD', str(text))
-                   if unicodedata.category(c) != 'Mn').lower()
+from src.core.memory import MemorySampler
+from src.core.query import QueryError
+from src.gui.widgets import VirtualProcessList
 
 class GUIApp(ctk.CTk):
-    def __init__(self):
+    SEARCH_DEBOUNCE_MS = 150
+    CATEGORY_TYPES = {"All": None, "Apps": "App", "Services": "Service"}
+    AUTO_REFRESH_OPTIONS = {"Off": 0, "0.5 s": 500, "1 s": 1000, "2 s": 2000, "5 s": 5000}
+    GROUP_OPTIONS = {"Off": None, "Name": "name", "Executable": "exe", "User": "user"}
+    # Columns of the process list: cmdline/exe are left out of the scan and loaded in the background
+    LIST_FIELDS = ['pid', 'name', 'username', 'custom_type', 'cpu_percent', 'memory_mb']
+
+    def __init__(self, socket_path=None, memory_budget_ms=20.0):
+        # Appearance is configured when the window is created, not as a side effect of importing this module
+        ctk.set_appearance_mode("Dark")
+        ctk.set_default_color_theme("blue")
         super().__init__()
         self.title("Process Manager Elite")
         self.geometry("1000x700")
         
-        self.engine = ProcessEngine()
+        self.engine = connect_engine(path=socket_path) # Shared scan daemon if one is running
         
         # Grid Layout (1x2)
         self.grid_columnconfigure(1, weight=1)
@@ -33,6 +35,24 @@ class GUIApp(ctk.CTk):
         self.all_processes = []
         self.active_category = "All" # All, Apps, Services
         self.is_scanning = False
+        self.scan_status = ""
+
+        # Search pipeline: debounced keystrokes, one worker per query, only the latest result is shown
+        self.search_job = None
+        self.search_generation = 0
+        self.search_cancel = None
+        self.details_thread = None
+        # Rows received so far during the first scan (None once a full list is shown)
+        self.scan_preview = None
+
+        # Group-by view: one aggregate row per name/exe/user, expanded groups also list their processes
+        self.group_by = None
+        self.groups = []
+        self.expanded = set()
+
+        # Auto-refresh: next scan is scheduled when the previous one finishes, so ticks never pile up
+        self.auto_refresh_ms = 0
+        self.auto_refresh_job = None
 
         # Icon
         icon_path = os.path.join("assets", "icon.ico")
@@ -49,9 +69,17 @@ class GUIApp(ctk.CTk):
 
         self.create_sidebar()
         self.create_main_area()
+
+        # PSS of the rows on screen and the largest processes, measured in the background
+        # (a daemon samples on its own side; its rows arrive with PSS already filled in)
+        self.sampler = None
+        if memory_budget_ms > 0 and isinstance(self.engine, ProcessEngine):
+            self.sampler = MemorySampler(self.engine, budget_ms=memory_budget_ms,
+                                         visible=self.process_list.visible_items,
+                                         on_sample=lambda: self.after(0, self.process_list.render)).start()
         
         # Initial Load - Start Thread
-        self.after(500, self.start_scan_thread)
+        self.after_idle(self.start_scan_thread) # As soon as the window is drawn
 
     def create_sidebar(self):
         self.sidebar = ctk.CTkFrame(self, width=200, corner_radius=0)
@@ -79,9 +107,23 @@ class GUIApp(ctk.CTk):
         self.spacer = ctk.CTkLabel(self.sidebar, text="", height=50)
         self.spacer.grid(row=4, column=0)
 
+        self.lbl_group = ctk.CTkLabel(self.sidebar, text="Group by", text_color="gray70")
+        self.lbl_group.grid(row=5, column=0, padx=20, sticky="w")
+
+        self.opt_group = ctk.CTkOptionMenu(self.sidebar, values=list(self.GROUP_OPTIONS),
+                                           command=self.change_group_by)
+        self.opt_group.grid(row=6, column=0, padx=20, pady=(0, 10), sticky="ew")
+
+        self.lbl_auto = ctk.CTkLabel(self.sidebar, text="Auto-refresh", text_color="gray70")
+        self.lbl_auto.grid(row=7, column=0, padx=20, sticky="w")
+
+        self.opt_auto = ctk.CTkOptionMenu(self.sidebar, values=list(self.AUTO_REFRESH_OPTIONS),
+                                          command=self.change_auto_refresh)
+        self.opt_auto.grid(row=8, column=0, padx=20, sticky="ew")
+
         self.btn_refresh = ctk.CTkButton(self.sidebar, text="REFRESH", height=40, fg_color="#27ae60", hover_color="#2ecc71",
                                          command=self.start_scan_thread)
-        self.btn_refresh.grid(row=5, column=0, padx=20, pady=20, sticky="ew")
+        self.btn_refresh.grid(row=9, column=0, padx=20, pady=20, sticky="ew")
 
     def create_main_area(self):
         self.main_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
@@ -94,24 +136,25 @@ class GUIApp(ctk.CTk):
         self.lbl_header = ctk.CTkLabel(self.search_frame, text="All Processes", font=("Roboto", 20, "bold"))
         self.lbl_header.pack(side="left")
 
-        self.entry_search = ctk.CTkEntry(self.search_frame, placeholder_text="Search Process Name or PID...", width=300)
+        self.entry_search = ctk.CTkEntry(self.search_frame, placeholder_text="Search name, PID or filters (mem>500MB user:root)...", width=300)
         self.entry_search.pack(side="right")
-        self.entry_search.bind("<KeyRelease>", self.filter_list)
+        self.entry_search.bind("<KeyRelease>", self.on_search_key)
 
         # Header Row
         self.header_row = ctk.CTkFrame(self.main_frame, height=35, fg_color="gray30")
         self.header_row.pack(fill="x")
         self.header_row.grid_columnconfigure(1, weight=1)
 
-        labels = [("PID", 55), ("NAME", 0), ("TYPE", 80), ("USER", 110), ("MEMORY", 90), ("ACTION", 100)]
+        labels = [("PID", 55), ("NAME", 0), ("TYPE", 80), ("USER", 110), ("CPU", 60), ("MEMORY", 90), ("ACTION", 154)]
         for i, (txt, w) in enumerate(labels):
             lbl = ctk.CTkLabel(self.header_row, text=txt, font=("Roboto", 11, "bold"), text_color="gray90")
             if w > 0: lbl.configure(width=w)
             lbl.grid(row=0, column=i, padx=10, pady=5, sticky="ew" if i==1 else "")
 
-        # List Area
-        self.scroll_frame = ctk.CTkScrollableFrame(self.main_frame)
-        self.scroll_frame.pack(fill="both", expand=True, pady=(10, 0))
+        # List Area (virtualized: a fixed pool of rows is recycled while scrolling)
+        self.process_list = VirtualProcessList(self.main_frame, self.confirm_kill, tree_callback=self.confirm_kill_tree,
+                                               group_callback=self.toggle_group)
+        self.process_list.pack(fill="both", expand=True, pady=(10, 0))
 
         # Status Bar
         self.statusbar = ctk.CTkLabel(self.main_frame, text="Ready", anchor="e", text_color="gray50")
@@ -131,6 +174,34 @@ class GUIApp(ctk.CTk):
 
         self.filter_list()
 
+    def change_group_by(self, choice):
+        self.group_by = self.GROUP_OPTIONS[choice]
+        self.expanded = set()
+        self.filter_list()
+
+    def toggle_group(self, group):
+        if group['group'] in self.expanded:
+            self.expanded.discard(group['group'])
+        else:
+            self.expanded.add(group['group'])
+        self.show_groups()
+
+    def change_auto_refresh(self, choice):
+        self.auto_refresh_ms = self.AUTO_REFRESH_OPTIONS[choice]
+        if self.auto_refresh_job is not None:
+            self.after_cancel(self.auto_refresh_job)
+            self.auto_refresh_job = None
+        if not self.is_scanning:
+            self.schedule_auto_refresh()
+
+    def schedule_auto_refresh(self):
+        if self.auto_refresh_ms and self.auto_refresh_job is None:
+            self.auto_refresh_job = self.after(self.auto_refresh_ms, self.auto_refresh_tick)
+
+    def auto_refresh_tick(self):
+        self.auto_refresh_job = None
+        self.start_scan_thread()
+
     def start_scan_thread(self):
         if self.is_scanning:
             return
@@ -138,64 +209,145 @@ class GUIApp(ctk.CTk):
         self.is_scanning = True
         self.statusbar.configure(text="Scanning in background...")
         self.btn_refresh.configure(state="disabled")
+        # Progressive display only while there is nothing on screen yet; refreshes swap lists at the end
+        self.scan_preview = [] if not self.all_processes else None
         
         thread = threading.Thread(target=self.scan_processes_logic, daemon=True)
         thread.start()
 
     def scan_processes_logic(self):
-        results = self.engine.scan_processes()
+        # Unsorted: the visible page is ranked lazily after filtering (see search_logic).
+        # Batches are handed to the UI thread while the scan is still collecting
+        results = []
+        for batch in self.engine.iter_batches(fields=self.LIST_FIELDS):
+            results.extend(batch)
+            self.after(0, lambda batch=batch: self.add_scan_batch(batch))
         
         # Pass data back to UI thread
         self.after(0, lambda: self.finish_scan(results))
 
+    def add_scan_batch(self, batch):
+        if self.scan_preview is None:
+            return
+        self.scan_preview.extend(batch)
+        if not self.entry_search.get() and self.active_category == "All" and not self.group_by:
+            self.process_list.set_items(self.engine.rank_processes(self.scan_preview))
+        self.statusbar.configure(text=f"Scanning... {len(self.scan_preview)} processes so far")
+
     def finish_scan(self, results):
+        self.scan_preview = None
         self.all_processes = results
         self.is_scanning = False
         self.btn_refresh.configure(state="normal")
-        self.statusbar.configure(text=f"Total: {len(results)}")
+        stats = self.engine.get_stats()
+        self.scan_status = f"Scan: {stats['last_ms']:.0f} ms (avg {stats['avg_ms']:.0f} ms)"
+        counters = stats['counters']
+        if counters['denied'] or counters['vanished'] or counters['zombie']:
+            self.scan_status += (f" · {counters['denied']} denied · {counters['vanished']} vanished"
+                                 f" · {counters['zombie']} zombie")
+        self.statusbar.configure(text=f"Total: {len(results)}  |  {self.scan_status}")
         self.filter_list()
+        self.schedule_auto_refresh()
+
+    def on_search_key(self, event=None):
+        # Debounce: only search once typing pauses
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(self.SEARCH_DEBOUNCE_MS, self.filter_list)
 
     def filter_list(self, event=None):
-        query = normalize_text(self.entry_search.get())
-        
-        matching = []
-        for p in self.all_processes:
-            # Category Filter
-            current_type = p.get('custom_type', 'App')
-            if self.active_category == "Apps" and current_type != "App": continue
-            if self.active_category == "Services" and current_type != "Service": continue
-            
-            # Search Filter (Deep: Name OR Cmdline OR PID)
-            if query:
-                p_name_norm = normalize_text(p['name'])
-                p_cmd_norm = normalize_text(p.get('cmdline_str',''))
-                p_pid_str = str(p['pid'])
-                
-                # Check ALL fields
-                if (query not in p_name_norm and 
-                    query not in p_cmd_norm and 
-                    not p_pid_str.startswith(query)):
-                    continue
-            
-            matching.append(p)
+        self.search_job = None
+        if self.is_scanning:
+            return # finish_scan re-runs the search on the fresh list
 
-        self.update_ui_list(matching)
+        # Supersede any in-flight search
+        if self.search_cancel is not None:
+            self.search_cancel.set()
+        self.search_generation += 1
+        self.search_cancel = threading.Event()
 
-    def update_ui_list(self, processes):
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
+        thread = threading.Thread(target=self.search_logic, daemon=True,
+                                  args=(self.search_generation, self.search_cancel, self.entry_search.get(),
+                                        self.CATEGORY_TYPES[self.active_category], self.all_processes, self.group_by))
+        thread.start()
 
-        # Limit to 60 for performance
-        display = processes[:60]
-        
-        for i, p in enumerate(display):
-            row = ProcessRow(self.scroll_frame, p, self.confirm_kill, is_alternate=(i%2==0))
-            row.pack(fill="x", pady=1, padx=2)
-            
-        if len(processes) > 60:
-            self.statusbar.configure(text=f"Showing top 60 of {len(processes)} results...")
+    def search_logic(self, generation, cancel, query, category, processes, group_by=None):
+        if group_by and not query and category is None:
+            # Whole list grouped: the engine keeps these aggregates up to date scan after scan
+            groups = self.engine.group_processes(group_by)
+            self.after(0, lambda: self.finish_search(generation, None, groups))
+            return
+
+        # Search Filter (Deep: Name OR Cmdline OR Path OR PID, or field filters) via the engine's index.
+        # Free text is fuzzy ("jvaa" finds java), best matches first; the virtual list only pulls the rows it shows.
+        # Groups are killed as a whole ("End Group"), so they only ever hold exact matches
+        try:
+            if group_by:
+                matching = self.engine.find_processes(query, processes, category=category, cancel=cancel)
+            else:
+                matching = self.engine.find_ranked(query, processes, category=category, cancel=cancel)
+        except QueryError as e:
+            self.after(0, lambda: self.finish_search_error(generation, str(e)))
+            return
+        if cancel.is_set():
+            return
+        if group_by:
+            groups = self.engine.group_processes(group_by, matching)
+            self.after(0, lambda: self.finish_search(generation, None, groups))
+            return
+
+        # Pass data back to UI thread
+        self.after(0, lambda: self.finish_search(generation, matching))
+
+    def finish_search(self, generation, matching, groups=None):
+        if generation != self.search_generation:
+            return # A newer query already superseded this one
+        if groups is not None:
+            self.groups = groups
+            self.show_groups()
+        else:
+            self.groups = []
+            self.update_ui_list(matching)
+        self.load_details()
+
+    def load_details(self):
+        # First paint skipped cmdline/exe: fetch them off the UI thread, visible page first
+        if self.details_thread is not None and self.details_thread.is_alive():
+            return
+        rows = list(self.process_list.visible_items()) + list(self.all_processes)
+        self.details_thread = threading.Thread(target=self.load_details_logic, args=(rows,), daemon=True)
+        self.details_thread.start()
+
+    def load_details_logic(self, rows):
+        self.engine.load_deferred(rows)
+        if isinstance(self.engine, ProcessEngine):
+            self.engine.build_index() # Built here so the first keystroke only pays for the search itself
+
+    def finish_search_error(self, generation, message):
+        if generation != self.search_generation:
+            return
+        self.statusbar.configure(text=f"Invalid query: {message}  |  {self.scan_status}")
+
+    def show_groups(self):
+        # Tens of group rows instead of thousands of process rows; members only for expanded groups
+        items = []
+        for group in self.groups:
+            items.append(group)
+            if group['group'] in self.expanded:
+                items.extend(self.engine.sort_processes(group['processes']))
+        self.process_list.set_items(items, self.expanded)
+        members = sum(group['count'] for group in self.groups)
+        self.statusbar.configure(text=f"Showing {len(self.groups)} groups ({members} of {len(self.all_processes)} processes)"
+                                      f"  |  {self.scan_status}")
+
+    def update_ui_list(self, processes):
+        self.process_list.set_items(processes)
+        self.statusbar.configure(text=f"Showing {len(processes)} of {len(self.all_processes)} processes  |  {self.scan_status}")
 
     def confirm_kill(self, proc_data):
+        if 'group' in proc_data:
+            self.confirm_kill_group(proc_data)
+            return
         name = proc_data['name']
         pid = proc_data['pid']
         ptype = proc_data.get('custom_type')
@@ -207,15 +359,58 @@ class GUIApp(ctk.CTk):
             icon = "error"
             
         if messagebox.askyesno("Confirm Action", msg, icon=icon):
-            try:
-                # Use engine to kill
-                result = self.engine.kill_process(pid)
-                if result['success']:
-                     self.after(500, self.start_scan_thread)
-                else:
-                     messagebox.showwarning("Error", result['message'])
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            self.start_kill_thread(lambda: self.engine.kill_processes([pid]))
+
+    def confirm_kill_group(self, group):
+        pids = [p['pid'] for p in group['processes']]
+
+        msg = f"Terminate all {group['count']} processes of '{group['group']}'?"
+        icon = "warning"
+        if group['services']:
+            msg += f"\n\n⚠️ CRITICAL WARNING: {group['services']} of them are System Services.\nTerminating them may crash Windows!"
+            icon = "error"
+
+        if messagebox.askyesno("Confirm Action", msg, icon=icon):
+            self.start_kill_thread(lambda: self.engine.kill_processes(pids))
+
+    def confirm_kill_tree(self, proc_data):
+        name = proc_data['name']
+        pid = proc_data['pid']
+        tree = self.engine.get_process_tree(pid)
+
+        msg = f"Terminate {name} (PID: {pid}) and its {max(0, len(tree) - 1)} descendant(s)?"
+        icon = "warning"
+        if any(p.get('custom_type') == "Service" for p in tree):
+            msg += "\n\n⚠️ CRITICAL WARNING: The tree contains System Services.\nTerminating them may crash Windows!"
+            icon = "error"
+
+        if messagebox.askyesno("Confirm Action", msg, icon=icon):
+            self.start_kill_thread(lambda: self.engine.kill_tree(pid))
+
+    def start_kill_thread(self, kill):
+        # A kill waits for the processes to exit (up to the SIGTERM + SIGKILL timeouts): never on the Tk thread
+        self.statusbar.configure(text="Terminating...")
+        thread = threading.Thread(target=self.kill_logic, args=(kill,), daemon=True)
+        thread.start()
+
+    def kill_logic(self, kill):
+        try:
+            results = kill()
+        except Exception as e:
+            message = str(e)
+            self.after(0, lambda: self.finish_kill(None, message))
+            return
+        # Pass results back to UI thread
+        self.after(0, lambda: self.finish_kill(results))
+
+    def finish_kill(self, results, error=None):
+        if error is not None:
+            messagebox.showerror("Error", error)
+        else:
+            failed = [r['message'] for r in results if not r['success']]
+            if failed:
+                messagebox.showwarning("Error", "\n".join(failed[:10]))
+        self.after(500, self.start_scan_thread) # Also restores the status bar
 
 if __name__ == "__main__":
     app = GUIApp()
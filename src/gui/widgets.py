@@ -1,47 +1,242 @@
+import sys
 import customtkinter as ctk
 
 class ProcessRow(ctk.CTkFrame):
-    def __init__(self, master, proc, kill_callback, is_alternate=False, **kwargs):
-        # Alternating row colors for readability
-        fg_color = "gray20" if is_alternate else "transparent"
-        super().__init__(master, fg_color=fg_color, corner_radius=6, **kwargs)
+    def __init__(self, master, proc, kill_callback, is_alternate=False, tree_callback=None, group_callback=None, **kwargs):
+        super().__init__(master, fg_color="transparent", corner_radius=6, **kwargs)
         self.proc = proc
         self.kill_callback = kill_callback
+        self.tree_callback = tree_callback
+        self.group_callback = group_callback # Expands/collapses a group row
+        self.expanded = False
         self.grid_columnconfigure(1, weight=1)
 
         # PID
-        self.lbl_pid = ctk.CTkLabel(self, text=str(proc['pid']), width=50, anchor="w", font=("Roboto Medium", 12))
+        self.lbl_pid = ctk.CTkLabel(self, text="", width=50, anchor="w", font=("Roboto Medium", 12))
         self.lbl_pid.grid(row=0, column=0, padx=10, pady=8)
 
         # Name
-        self.lbl_name = ctk.CTkLabel(self, text=proc['name'], anchor="w", font=("Roboto Medium", 13))
+        self.lbl_name = ctk.CTkLabel(self, text="", anchor="w", font=("Roboto Medium", 13))
         self.lbl_name.grid(row=0, column=1, padx=10, pady=8, sticky="ew")
 
         # Type Badge
-        is_service = proc.get('custom_type') == "Service"
-        type_text = "SERVICE" if is_service else "APP"
-        type_fg = "#f39c12" if is_service else "#2ecc71"
-        
-        self.lbl_type = ctk.CTkLabel(self, text=type_text, width=70, text_color=type_fg, font=("Roboto", 11, "bold"))
+        self.lbl_type = ctk.CTkLabel(self, text="", width=70, font=("Roboto", 11, "bold"))
         self.lbl_type.grid(row=0, column=2, padx=10, pady=8)
 
         # User
-        user = proc.get('username') or "-"
-        if len(user) > 12: user = user[:10] + "..."
-        self.lbl_user = ctk.CTkLabel(self, text=user, width=100, anchor="w", text_color="gray70")
+        self.lbl_user = ctk.CTkLabel(self, text="", width=100, anchor="w", text_color="gray70")
         self.lbl_user.grid(row=0, column=3, padx=10, pady=8)
 
+        # CPU
+        self.lbl_cpu = ctk.CTkLabel(self, text="", width=50, anchor="e", text_color="gray70")
+        self.lbl_cpu.grid(row=0, column=4, padx=10, pady=8)
+
         # Memory
-        mem_mb = proc.get('memory_mb', 0)
-        self.lbl_mem = ctk.CTkLabel(self, text=f"{mem_mb:.1f} MB", width=80, anchor="e", text_color="gray70")
-        self.lbl_mem.grid(row=0, column=4, padx=10, pady=8)
+        self.lbl_mem = ctk.CTkLabel(self, text="", width=80, anchor="e", text_color="gray70")
+        self.lbl_mem.grid(row=0, column=5, padx=10, pady=8)
 
         # Kill Button
-        self.btn_kill = ctk.CTkButton(self, text="End Task", width=80, height=28, 
-                                      fg_color="#c0392b", hover_color="#e74c3c", 
+        self.btn_kill = ctk.CTkButton(self, text="End Task", width=80, height=28,
+                                      fg_color="#c0392b", hover_color="#e74c3c",
                                       font=("Roboto", 11, "bold"),
                                       command=self.on_kill)
-        self.btn_kill.grid(row=0, column=5, padx=10, pady=8)
+        self.btn_kill.grid(row=0, column=6, padx=(10, 4), pady=8)
+
+        # Kill Tree Button (process + all descendants); Show/Hide on group rows
+        if tree_callback is not None or group_callback is not None:
+            self.btn_tree = ctk.CTkButton(self, text="Tree", width=50, height=28,
+                                          fg_color="#8e44ad", hover_color="#9b59b6",
+                                          font=("Roboto", 11, "bold"),
+                                          command=self.on_kill_tree)
+            self.btn_tree.grid(row=0, column=7, padx=(0, 10), pady=8)
+
+        self._shown = {}
+        self.set_proc(proc, is_alternate)
+
+    def _show(self, widget, **options):
+        """Reconfigures a child widget only when its options actually changed."""
+        if self._shown.get(widget) != options:
+            self._shown[widget] = options
+            widget.configure(**options)
+
+    def set_proc(self, proc, is_alternate=False, expanded=False):
+        """Binds the row to another process or group (rows are recycled by VirtualProcessList)."""
+        self.proc = proc
+        self.expanded = expanded
+        if 'group' in proc:
+            self.set_group(proc, expanded)
+            return
+
+        # Alternating row colors for readability
+        self._show(self, fg_color="gray20" if is_alternate else "transparent")
+        self._show(self.lbl_pid, text=str(proc['pid']))
+        self._show(self.lbl_name, text=proc['name'])
+
+        is_service = proc.get('custom_type') == "Service"
+        self._show(self.lbl_type, text="SERVICE" if is_service else "APP",
+                   text_color="#f39c12" if is_service else "#2ecc71")
+
+        user = proc.get('username') or "-"
+        if len(user) > 12: user = user[:10] + "..."
+        self._show(self.lbl_user, text=user)
+
+        cpu = proc.get('cpu_percent')
+        self._show(self.lbl_cpu, text=f"{cpu:.1f}%" if cpu is not None else "-")
+
+        # PSS once sampled (shared pages split between their users), RSS in grey until then
+        pss = proc.get('pss')
+        if pss is not None:
+            self._show(self.lbl_mem, text=f"{pss / (1024 * 1024):.1f} MB", text_color="gray90")
+        else:
+            self._show(self.lbl_mem, text=f"{proc.get('memory_mb', 0):.1f} MB", text_color="gray70")
+
+        self._show(self.btn_kill, text="End Task")
+        if hasattr(self, 'btn_tree'):
+            self._show(self.btn_tree, text="Tree", state="normal" if self.tree_callback else "disabled")
+
+    def set_group(self, group, expanded):
+        """Aggregate row: process count in the PID column, total memory, kill/expand the whole group."""
+        self._show(self, fg_color="#1c3a57")
+        self._show(self.lbl_pid, text=f"{group['count']}x")
+        self._show(self.lbl_name, text=f"{'▾' if expanded else '▸'} {group['group']}")
+
+        is_service = group['custom_type'] == "Service"
+        self._show(self.lbl_type, text="SERVICES" if is_service else "GROUP",
+                   text_color="#f39c12" if is_service else "#3498db")
+
+        user = group['group'] if group['by'] == 'user' else "-"
+        if len(user) > 12: user = user[:10] + "..."
+        self._show(self.lbl_user, text=user)
+        self._show(self.lbl_cpu, text="-")
+        self._show(self.lbl_mem, text=f"{group['memory_mb']:.1f} MB", text_color="gray70")
+
+        self._show(self.btn_kill, text="End Group")
+        if hasattr(self, 'btn_tree'):
+            self._show(self.btn_tree, text="Hide" if expanded else "Show",
+                       state="normal" if self.group_callback else "disabled")
 
     def on_kill(self):
         self.kill_callback(self.proc)
+
+    def on_kill_tree(self):
+        if 'group' in self.proc:
+            self.group_callback(self.proc)
+        else:
+            self.tree_callback(self.proc)
+
+
+class VirtualProcessList(ctk.CTkFrame):
+    """
+    Scrollable process list backed by a fixed pool of ProcessRow widgets.
+    Only as many rows as fit in the viewport exist; scrolling rebinds them to other data,
+    so widget cost stays constant no matter how many processes are listed.
+    """
+    ROW_HEIGHT = 46 # Fallback until the first row has been measured
+
+    def __init__(self, master, kill_callback, tree_callback=None, group_callback=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.kill_callback = kill_callback
+        self.tree_callback = tree_callback
+        self.group_callback = group_callback
+        self.items = []
+        self.expanded = set() # Keys of the expanded group rows
+        self.first = 0
+        self.rows = []
+        self.visible = 0
+        self.shown = () # Items bound to the rows at the last render
+        self.row_height = self.ROW_HEIGHT
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.body.pack_propagate(False)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
+
+        self.body.bind("<Configure>", self.on_resize)
+        self._bind_wheel(self.body)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_mousewheel)
+        widget.bind("<Button-4>", self.on_mousewheel)
+        widget.bind("<Button-5>", self.on_mousewheel)
+
+    def set_items(self, items, expanded=None):
+        """Shows a new result list, keeping the scroll position when possible."""
+        self.items = items
+        self.expanded = expanded or set()
+        self.render()
+
+    def visible_items(self):
+        """
+        Rows currently on screen, as of the last render. Safe to call from other threads (the
+        memory sampler): it never touches self.items, whose ranked results are popped on the Tk thread.
+        """
+        return self.shown
+
+    def scroll_to(self, index):
+        max_first = max(0, len(self.items) - self.visible + 1)
+        index = min(max(0, int(index)), max_first)
+        if index != self.first:
+            self.first = index
+            self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * len(self.items))
+        elif action == "scroll":
+            self.scroll_to(self.first + int(value))
+
+    def on_mousewheel(self, event):
+        if sys.platform.startswith("win"):
+            delta = -int(event.delta / 40)
+        elif sys.platform == "darwin":
+            delta = -event.delta
+        else:
+            delta = -3 if event.num == 4 else 3
+        self.scroll_to(self.first + delta)
+
+    def on_resize(self, event):
+        visible = max(1, event.height // self.row_height + 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def _grow_pool(self, size):
+        while len(self.rows) < size:
+            row = ProcessRow(self.body, {'pid': '', 'name': ''}, self.kill_callback,
+                             tree_callback=self.tree_callback, group_callback=self.group_callback)
+            for child in [row] + row.winfo_children():
+                self._bind_wheel(child)
+            self.rows.append(row)
+            if len(self.rows) == 1:
+                # Measure real row height once so the pool matches the viewport
+                row.update_idletasks()
+                self.row_height = max(1, row.winfo_reqheight() + 2)
+
+    def render(self):
+        """Rebinds the pooled rows to the slice of items currently in view."""
+        total = len(self.items)
+        self.first = min(self.first, max(0, total - self.visible + 1))
+        self._grow_pool(min(self.visible, total))
+        shown = tuple(self.items[self.first:self.first + self.visible])
+
+        for i, row in enumerate(self.rows):
+            idx = self.first + i
+            if i < len(shown):
+                item = shown[i]
+                row.set_proc(item, is_alternate=(idx % 2 == 0),
+                             expanded='group' in item and item['group'] in self.expanded)
+                if not row.winfo_manager():
+                    row.pack(fill="x", pady=1, padx=2)
+            elif row.winfo_manager():
+                row.pack_forget()
+        self.shown = shown # Swapped in whole: other threads see the old or the new page, never a mix
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
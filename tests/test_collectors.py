@@ -0,0 +1,35 @@
+"""ProcfsCollector against a fake /proc tree: unreadable processes reach the scan counters."""
+import os
+
+from src.core.collectors import ProcfsCollector
+from src.core.engine import ProcessEngine
+
+
+def _stat(pid: int, name: str, state: str) -> str:
+    fields = ['0'] * 40
+    fields[0], fields[1], fields[19] = state, '1', '100' # state, ppid, starttime (ticks)
+    return f"{pid} ({name}) {' '.join(fields)}\n"
+
+
+def _process(root, pid: int, name: str, state: str = 'S') -> None:
+    path = root / str(pid)
+    path.mkdir()
+    (path / 'stat').write_text(_stat(pid, name, state))
+    (path / 'statm').write_text("100 50 10 5 0 20 0\n")
+    (path / 'status').write_text(f"Name:\t{name}\nUid:\t{os.getuid()}\t0\t0\t0\n")
+    (path / 'cmdline').write_bytes(name.encode() + b'\x00')
+
+
+def test_zombie_and_vanished_are_counted(tmp_path):
+    (tmp_path / 'stat').write_text("cpu 0 0 0 0\nbtime 1700000000\n")
+    _process(tmp_path, 10, 'alive')
+    _process(tmp_path, 11, 'defunct', state='Z')
+    (tmp_path / '12').mkdir() # Exited between the listing and the read: no stat left
+
+    engine = ProcessEngine(ProcfsCollector(str(tmp_path)))
+    processes = engine.scan_processes()
+
+    assert [p['pid'] for p in processes] == [10]
+    counters = engine.get_stats()['counters']
+    assert counters['zombie'] == 1
+    assert counters['vanished'] == 1
@@ -0,0 +1,18 @@
+"""SnapshotHistory: a recycled PID must not mix two processes' memory."""
+from src.core.collectors import pmem
+from src.core.history import SnapshotHistory
+
+
+def _process(pid: int, create_time: float, rss: int):
+    return {'pid': pid, 'create_time': create_time, 'name': 'worker', 'memory_info': pmem(rss, rss, 0, 0, 0, 0, 0)}
+
+
+def test_pid_history_follows_one_process(tmp_path):
+    with SnapshotHistory(str(tmp_path / 'history.bin'), size_mb=1) as history:
+        history.append([_process(42, 1000.0, 1024)], timestamp=1.0)
+        history.append([_process(42, 1000.0, 2048)], timestamp=2.0)
+        history.append([_process(42, 5000.0, 4096)], timestamp=3.0) # PID reused by a new process
+
+        assert history.pid_history(42) == [(1.0, 1024), (2.0, 2048)]
+        assert history.pid_history(42, create_time=5000.0) == [(3.0, 4096)]
+        assert history.pid_history(42, start=2.5) == [(3.0, 4096)]
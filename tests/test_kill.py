@@ -0,0 +1,105 @@
+"""
+Bulk termination with dummy children (see benchmarks/bench_kill.py for the timings):
+every child must end up dead, the ones ignoring SIGTERM through the SIGKILL escalation,
+within one wait per phase, and the async path must never stall its event loop.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.core.aio import AsyncProcessEngine
+from src.core.engine import ProcessEngine
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="SIGTERM can only be ignored on POSIX")
+
+CHILDREN = 30
+STUBBORN = 6
+TIMEOUT = 0.5
+# Both phases wait at most TIMEOUT; the rest is signalling and polling overhead
+MAX_ELAPSED = 2 * TIMEOUT + 2.0
+
+POLITE = "import time\nprint('ready', flush=True)\nwhile True: time.sleep(1)"
+IGNORES_TERM = ("import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+                "print('ready', flush=True)\nwhile True: time.sleep(1)")
+
+
+@pytest.fixture
+def children():
+    """CHILDREN sleeping processes, the first STUBBORN of which ignore SIGTERM. Returns (all pids, stubborn pids)."""
+    procs = [subprocess.Popen([sys.executable, "-c", IGNORES_TERM if i < STUBBORN else POLITE],
+                              stdout=subprocess.PIPE, text=True)
+             for i in range(CHILDREN)]
+    for proc in procs:
+        assert proc.stdout.readline().strip() == "ready" # Signal handlers are installed
+    yield [proc.pid for proc in procs], {proc.pid for proc in procs[:STUBBORN]}
+    for proc in procs:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+
+
+def check_results(results, pids, stubborn):
+    assert [r['pid'] for r in results] == pids
+    failed = [r['message'] for r in results if not r['success']]
+    assert not failed
+    for r in results:
+        if r['pid'] in stubborn:
+            assert "killed forcibly" in r['message']
+        else:
+            assert "terminated" in r['message']
+        assert r['elapsed'] < MAX_ELAPSED
+
+
+def test_kill_processes_escalates_stubborn_children(children):
+    pids, stubborn = children
+    start = time.perf_counter()
+    results = ProcessEngine().kill_processes(pids, timeout=TIMEOUT)
+    elapsed = time.perf_counter() - start
+    check_results(results, pids, stubborn)
+    assert elapsed < MAX_ELAPSED
+
+
+def test_kill_processes_reports_missing_pid(children):
+    pids, _ = children
+    gone = pids[-1]
+    ProcessEngine().kill_processes([gone], timeout=TIMEOUT)
+    result = ProcessEngine().kill_process(gone)
+    assert not result['success']
+    assert "no longer exists" in result['message']
+
+
+def test_async_kill_never_stalls_the_loop(children):
+    pids, stubborn = children
+
+    async def run():
+        stop = asyncio.Event()
+        stall = 0.0
+
+        async def heartbeat():
+            nonlocal stall
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                stall = max(stall, now - last)
+                last = now
+
+        async with AsyncProcessEngine() as engine:
+            beat = asyncio.create_task(heartbeat())
+            start = time.perf_counter()
+            results = await asyncio.gather(*(engine.kill(pid, timeout=TIMEOUT) for pid in pids))
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await beat
+        return list(results), elapsed, stall
+
+    results, elapsed, stall = asyncio.run(run())
+    check_results(results, pids, stubborn)
+    assert elapsed < MAX_ELAPSED
+    # The caller's loop keeps running: no wait ever blocks it for a whole polling phase
+    assert stall < TIMEOUT / 2
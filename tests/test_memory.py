@@ -0,0 +1,16 @@
+"""MemorySampler with a grouped GUI list: group summaries on screen must not break sampling."""
+from benchmarks.fake import FakeCollector
+from src.core.engine import ProcessEngine
+from src.core.memory import MemorySampler
+
+
+def test_visible_group_rows_are_skipped():
+    engine = ProcessEngine(FakeCollector(200, vanish_ratio=0.0))
+    engine.scan_processes()
+    groups = engine.group_processes("name")
+    member = groups[0]['processes'][0]
+    sampler = MemorySampler(engine, budget_ms=1000.0, top=0, visible=lambda: groups[:5] + [member])
+
+    assert sampler.tick() > 0 # Raised KeyError: 'pid' while group summaries were visible
+    assert member['pss'] is not None
+    assert all('pss' not in group for group in groups)